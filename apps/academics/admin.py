@@ -1,7 +1,9 @@
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from apps.academics.models import Attendance, Grade
+from apps.academics.summaries import refresh_summaries_for
 
 
 @admin.register(Grade)
@@ -79,12 +81,15 @@ class AttendanceAdmin(admin.ModelAdmin):
     actions = ['mark_as_present', 'mark_as_absent']
 
     def mark_as_present(self, request, queryset):
-        count = queryset.update(status='PRESENT')
+        # update() no aplica auto_now: marcar la fecha a mano (huella de reportes)
+        count = queryset.update(status='PRESENT', updated_at=timezone.now())
+        refresh_summaries_for(queryset)
         self.message_user(
             request, f'{count} registros marcados como presente.')
     mark_as_present.short_description = 'Marcar como presente'
 
     def mark_as_absent(self, request, queryset):
-        count = queryset.update(status='ABSENT')
+        count = queryset.update(status='ABSENT', updated_at=timezone.now())
+        refresh_summaries_for(queryset)
         self.message_user(request, f'{count} registros marcados como ausente.')
     mark_as_absent.short_description = 'Marcar como ausente'
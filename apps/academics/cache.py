@@ -0,0 +1,52 @@
+"""
+Versionado de caché para estadísticas de calificaciones.
+
+Cada entrada cacheada incluye en su clave la versión de los ámbitos de los que
+depende (estudiante, materia, curso o, si no hay filtro, la versión global).
+Al guardar o eliminar una calificación se incrementan las versiones
+afectadas, con lo que las entradas anteriores quedan huérfanas y expiran solas.
+"""
+import time
+
+from django.core.cache import cache
+
+VERSION_KEY_PREFIX = 'grade_stats:v'
+
+
+def _version_key(scope, value=None):
+    return f'{VERSION_KEY_PREFIX}:{scope}:{value}' if value is not None else f'{VERSION_KEY_PREFIX}:{scope}'
+
+
+def _initial_version():
+    # Basado en el reloj para que una versión desalojada de la caché no vuelva
+    # a coincidir con entradas antiguas que aún sigan almacenadas.
+    return time.time_ns()
+
+
+def grade_stats_versions(student_id=None, subject_id=None, course_id=None):
+    """Devolver las versiones de los ámbitos de los que depende una consulta."""
+    keys = [
+        _version_key(scope, value)
+        for scope, value in (('student', student_id), ('subject', subject_id), ('course', course_id))
+        if value is not None
+    ] or [_version_key('all')]
+
+    versions = cache.get_many(keys)
+    missing = {key: _initial_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def invalidate_grade_stats(student_ids=(), subject_ids=(), course_ids=()):
+    """Incrementar la versión global y la de cada estudiante, materia y curso dados."""
+    keys = [_version_key('all')]
+    keys += [_version_key('student', value) for value in set(student_ids)]
+    keys += [_version_key('subject', value) for value in set(subject_ids)]
+    keys += [_version_key('course', value) for value in set(course_ids)]
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _initial_version(), timeout=None)
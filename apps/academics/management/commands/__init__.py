@@ -0,0 +1 @@
+"""Commands package for academics management commands."""
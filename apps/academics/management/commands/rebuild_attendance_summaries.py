@@ -0,0 +1,34 @@
+"""Reconstruye `AttendanceMonthlySummary` desde la tabla de asistencia.
+
+Útil tras cargas masivas que no disparan señales (bulk_create, restauraciones
+de backup) o si se sospecha que el resumen incremental se ha desviado.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.academics.summaries import rebuild_attendance_summaries
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el resumen mensual de asistencia por bloques de cursos.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=200,
+            help='Cursos procesados por transacción (default: 200)'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = max(options.get('chunk_size') or 200, 1)
+        started = time.monotonic()
+
+        def report(courses_done, written):
+            self.stdout.write(f'{courses_done} cursos procesados, {written} resúmenes escritos')
+
+        written = rebuild_attendance_summaries(chunk_size=chunk_size, on_chunk=report)
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Resumen de asistencia reconstruido: {written} filas en {elapsed:.1f}s'))
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-16 22:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0003_initial'),
+        ('courses', '0006_rename_coursesess_course_timeslot_idx_courses_cou_course__5f28f1_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='grade',
+            name='academics_g_graded__2fa195_idx',
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['-date', '-id'], name='attendance_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grade',
+            index=models.Index(fields=['-graded_date', '-id'], name='grade_graded_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.8 on 2026-10-16 22:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import TruncMonth
+
+
+def backfill_summaries(apps, schema_editor):
+    """Poblar el resumen con la asistencia existente."""
+    Attendance = apps.get_model('academics', 'Attendance')
+    Summary = apps.get_model('academics', 'AttendanceMonthlySummary')
+    fields = {
+        'PRESENT': 'present_count',
+        'ABSENT': 'absent_count',
+        'LATE': 'late_count',
+        'EXCUSED': 'excused_count',
+    }
+    rows = Attendance.objects.order_by().annotate(month=TruncMonth('date')).values(
+        'student_id', 'course_id', 'month'
+    ).annotate(**{field: Count('id', filter=Q(status=status)) for status, field in fields.items()})
+    Summary.objects.bulk_create(
+        (Summary(
+            student_id=row['student_id'],
+            course_id=row['course_id'],
+            month=row['month'],
+            **{field: row[field] for field in fields.values()},
+        ) for row in rows.iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0004_keyset_pagination_indexes'),
+        ('courses', '0006_rename_coursesess_course_timeslot_idx_courses_cou_course__5f28f1_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceMonthlySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Fecha y hora de creación del registro', verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Fecha y hora de última actualización', verbose_name='Fecha de actualización')),
+                ('is_active', models.BooleanField(default=True, help_text='Indica si el registro está activo', verbose_name='Activo')),
+                ('month', models.DateField(help_text='Primer día del mes resumido', verbose_name='Mes')),
+                ('present_count', models.PositiveIntegerField(default=0, verbose_name='Presentes')),
+                ('absent_count', models.PositiveIntegerField(default=0, verbose_name='Ausentes')),
+                ('late_count', models.PositiveIntegerField(default=0, verbose_name='Tardanzas')),
+                ('excused_count', models.PositiveIntegerField(default=0, verbose_name='Excusados')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_summaries', to='courses.course', verbose_name='Curso')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_summaries', to=settings.AUTH_USER_MODEL, verbose_name='Estudiante')),
+            ],
+            options={
+                'verbose_name': 'Resumen mensual de asistencia',
+                'verbose_name_plural': 'Resúmenes mensuales de asistencia',
+                'ordering': ['month'],
+                'indexes': [models.Index(fields=['course', 'month'], name='academics_a_course__8b57ee_idx')],
+                'unique_together': {('student', 'course', 'month')},
+            },
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
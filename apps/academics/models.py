@@ -10,6 +10,26 @@ from apps.core.validators import validate_text_field
 from apps.courses.models import Course, Subject
 from apps.users.models import User
 
+PASSING_GRADE = Decimal('3.0')
+
+
+def letter_grade_for(value):
+    """Calificación en formato letra para un valor de 0.0 a 5.0."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return ''
+    if value >= 4.5:
+        return 'A'
+    elif value >= 4.0:
+        return 'B'
+    elif value >= 3.0:
+        return 'C'
+    elif value >= 2.0:
+        return 'D'
+    else:
+        return 'F'
+
 
 class Grade(AbstractBaseModel):
     """
@@ -92,7 +112,8 @@ class Grade(AbstractBaseModel):
         ordering = ['-graded_date']
         indexes = [
             models.Index(fields=['student', 'subject']),
-            models.Index(fields=['graded_date']),
+            # Orden del listado + id para paginación keyset
+            models.Index(fields=['-graded_date', '-id'], name='grade_graded_date_id_idx'),
         ]
 
     def __str__(self):
@@ -117,25 +138,12 @@ class Grade(AbstractBaseModel):
     @property
     def is_passing(self):
         """Verifica si la calificación es aprobatoria (>= 3.0)."""
-        return self.value >= Decimal('3.0')
+        return self.value >= PASSING_GRADE
 
     @property
     def letter_grade(self):
         """Retorna la calificación en formato letra."""
-        try:
-            value = float(self.value)
-        except (TypeError, ValueError):
-            return ''
-        if value >= 4.5:
-            return 'A'
-        elif value >= 4.0:
-            return 'B'
-        elif value >= 3.0:
-            return 'C'
-        elif value >= 2.0:
-            return 'D'
-        else:
-            return 'F'
+        return letter_grade_for(self.value)
 
 
 class Attendance(AbstractBaseModel):
@@ -197,6 +205,8 @@ class Attendance(AbstractBaseModel):
         indexes = [
             models.Index(fields=['student', 'date']),
             models.Index(fields=['course', 'date']),
+            # Orden del listado + id para paginación keyset
+            models.Index(fields=['-date', '-id'], name='attendance_date_id_idx'),
         ]
 
     def __str__(self):
@@ -220,4 +230,48 @@ class Attendance(AbstractBaseModel):
                 )
 
 
-__all__ = ['Grade', 'Attendance']
+class AttendanceMonthlySummary(AbstractBaseModel):
+    """
+    Resumen mensual de asistencia por estudiante y curso.
+    Se mantiene de forma incremental desde las señales de Attendance y se
+    puede reconstruir con `rebuild_attendance_summaries`.
+    """
+    student = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='attendance_summaries',
+        verbose_name=_('Estudiante')
+    )
+    course = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name='attendance_summaries',
+        verbose_name=_('Curso')
+    )
+    month = models.DateField(
+        _('Mes'),
+        help_text=_('Primer día del mes resumido')
+    )
+    present_count = models.PositiveIntegerField(_('Presentes'), default=0)
+    absent_count = models.PositiveIntegerField(_('Ausentes'), default=0)
+    late_count = models.PositiveIntegerField(_('Tardanzas'), default=0)
+    excused_count = models.PositiveIntegerField(_('Excusados'), default=0)
+
+    class Meta:
+        verbose_name = _('Resumen mensual de asistencia')
+        verbose_name_plural = _('Resúmenes mensuales de asistencia')
+        unique_together = [['student', 'course', 'month']]
+        ordering = ['month']
+        indexes = [
+            models.Index(fields=['course', 'month']),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id} - {self.course_id} ({self.month:%Y-%m})"
+
+    @property
+    def total_count(self):
+        return self.present_count + self.absent_count + self.late_count + self.excused_count
+
+
+__all__ = ['Grade', 'Attendance', 'AttendanceMonthlySummary']
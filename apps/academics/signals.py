@@ -1,19 +1,20 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from apps.academics.models import Grade
+from apps.academics.models import Attendance, Grade
 
 
 @receiver(post_save, sender=Grade)
 def notify_student_on_grade_creation(sender, instance, created, **kwargs):
-    """Notificar al estudiante cuando se crea una calificación (asíncrono si hay Celery)."""
+    """Notificar al estudiante cuando se crea una calificación.
+
+    La notificación se encola al confirmar la transacción, junto con las demás
+    calificaciones de la misma transacción (una tarea, agrupadas por estudiante).
+    """
     if created:
-        try:
-            from apps.notifications.tasks import send_grade_notification_email
-            send_grade_notification_email.delay(instance.id)
-        except Exception:
-            # Si no hay Celery o falla, continuar sin interrumpir
-            pass
+        from apps.notifications.batching import queue_grade_notifications
+        queue_grade_notifications([instance])
 
 
 @receiver(post_save, sender=Grade)
@@ -31,3 +32,74 @@ def log_grade_change(sender, instance, created, **kwargs):
     except Exception:
         # No morir por un fallo en logging de una señal
         logger.exception('Error al loggear cambio de calificación')
+
+
+@receiver(pre_save, sender=Grade)
+def remember_previous_grade_scope(sender, instance, raw=False, **kwargs):
+    """Guardar estudiante y materia previos para invalidar también sus estadísticas."""
+    instance._stats_previous = None
+    if instance.pk and not raw:
+        instance._stats_previous = Grade.objects.filter(pk=instance.pk).values_list(
+            'student_id', 'subject_id').first()
+
+
+@receiver(post_save, sender=Grade)
+@receiver(post_delete, sender=Grade)
+def invalidate_grade_statistics(sender, instance, **kwargs):
+    """Invalidar las estadísticas cacheadas del estudiante, materia y curso afectados.
+
+    Si la calificación cambió de estudiante o de materia se invalidan también
+    los anteriores.
+    """
+    from apps.academics.cache import invalidate_grade_stats
+    from apps.courses.models import Subject
+
+    student_ids = {instance.student_id}
+    subject_ids = {instance.subject_id}
+    previous = getattr(instance, '_stats_previous', None)
+    if previous:
+        student_ids.add(previous[0])
+        subject_ids.add(previous[1])
+    course_ids = set(Subject.objects.filter(id__in=subject_ids).values_list('course_id', flat=True))
+    # Tras el commit, para que ninguna petición concurrente vuelva a cachear
+    # datos previos a la transacción con la versión nueva.
+    transaction.on_commit(lambda: invalidate_grade_stats(
+        student_ids=list(student_ids),
+        subject_ids=list(subject_ids),
+        course_ids=list(course_ids),
+    ))
+
+
+@receiver(pre_save, sender=Attendance)
+def remember_previous_attendance(sender, instance, raw=False, **kwargs):
+    """Guardar el estado previo para ajustar el resumen mensual en post_save."""
+    instance._summary_previous = None
+    if instance.pk and not raw:
+        instance._summary_previous = Attendance.objects.filter(pk=instance.pk).values(
+            'student_id', 'course_id', 'date', 'status').first()
+
+
+@receiver(post_save, sender=Attendance)
+def update_attendance_summary_on_save(sender, instance, created, raw=False, **kwargs):
+    """Mantener `AttendanceMonthlySummary` al crear o modificar asistencia."""
+    from apps.academics.summaries import apply_attendance_delta, month_start
+
+    if raw:
+        return
+    current = (instance.student_id, instance.course_id, month_start(instance.date), instance.status)
+    previous = getattr(instance, '_summary_previous', None)
+    if previous:
+        before = (previous['student_id'], previous['course_id'],
+                  month_start(previous['date']), previous['status'])
+        if before == current:
+            return
+        apply_attendance_delta(*before, -1)
+    apply_attendance_delta(*current, 1)
+
+
+@receiver(post_delete, sender=Attendance)
+def update_attendance_summary_on_delete(sender, instance, **kwargs):
+    """Descontar del resumen mensual la asistencia eliminada."""
+    from apps.academics.summaries import apply_attendance_delta
+
+    apply_attendance_delta(instance.student_id, instance.course_id, instance.date, instance.status, -1)
@@ -0,0 +1,116 @@
+"""
+Mantenimiento del resumen mensual de asistencia (`AttendanceMonthlySummary`).
+
+- `apply_attendance_delta`: ajuste incremental de un registro (señales).
+- `refresh_attendance_summaries` / `refresh_summaries_for`: recalculan en
+  bloque los resúmenes de un subconjunto de asistencias (p.ej. tras un pase
+  de lista masivo o un update() que no dispara señales).
+- `rebuild_attendance_summaries`: reconstrucción completa por bloques de cursos.
+"""
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Q
+from django.db.models.functions import TruncMonth
+
+from apps.academics.models import Attendance, AttendanceMonthlySummary
+from apps.courses.models import Course
+
+STATUS_COUNT_FIELDS = {
+    Attendance.AttendanceStatus.PRESENT: 'present_count',
+    Attendance.AttendanceStatus.ABSENT: 'absent_count',
+    Attendance.AttendanceStatus.LATE: 'late_count',
+    Attendance.AttendanceStatus.EXCUSED: 'excused_count',
+}
+
+
+def month_start(day):
+    """Primer día del mes de `day` (acepta date o cadena ISO)."""
+    if isinstance(day, str):
+        day = date.fromisoformat(day)
+    return day.replace(day=1)
+
+
+def apply_attendance_delta(student_id, course_id, day, status, delta):
+    """Sumar `delta` al contador de `status` en el mes de `day`."""
+    field = STATUS_COUNT_FIELDS.get(status)
+    if field is None:
+        return
+    lookup = {'student_id': student_id, 'course_id': course_id, 'month': month_start(day)}
+    if delta < 0:
+        # Sin get_or_create: en un borrado en cascada el curso o el
+        # estudiante pueden estar eliminándose en la misma transacción.
+        queryset = AttendanceMonthlySummary.objects.filter(**lookup, **{f'{field}__gte': -delta})
+    else:
+        summary, _ = AttendanceMonthlySummary.objects.get_or_create(**lookup)
+        queryset = AttendanceMonthlySummary.objects.filter(pk=summary.pk)
+    queryset.update(**{field: F(field) + delta})
+
+
+def refresh_attendance_summaries(attendances):
+    """Recalcular desde la tabla de asistencia los resúmenes que cubre `attendances`.
+
+    Una consulta de agregación y un upsert; devuelve el número de resúmenes escritos.
+    """
+    rows = attendances.order_by().annotate(month=TruncMonth('date')).values(
+        'student_id', 'course_id', 'month'
+    ).annotate(**{
+        field: Count('id', filter=Q(status=status))
+        for status, field in STATUS_COUNT_FIELDS.items()
+    })
+    summaries = [
+        AttendanceMonthlySummary(
+            student_id=row['student_id'],
+            course_id=row['course_id'],
+            month=row['month'],
+            **{field: row[field] for field in STATUS_COUNT_FIELDS.values()},
+        )
+        for row in rows
+    ]
+    AttendanceMonthlySummary.objects.bulk_create(
+        summaries,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['student', 'course', 'month'],
+        update_fields=[*STATUS_COUNT_FIELDS.values(), 'updated_at'],
+    )
+    return len(summaries)
+
+
+def refresh_summaries_for(attendances):
+    """Recalcular los resúmenes de los meses, estudiantes y cursos que toca `attendances`.
+
+    Para escrituras que no disparan señales (update(), bulk_create): cubre
+    meses completos, por lo que el resultado es exacto aunque abarque de más.
+    """
+    bounds = attendances.aggregate(first=Min('date'), last=Max('date'))
+    if bounds['first'] is None:
+        return 0
+    last_month = month_start(bounds['last'])
+    next_month = (last_month + timedelta(days=32)).replace(day=1)
+    return refresh_attendance_summaries(Attendance.objects.filter(
+        student_id__in=attendances.values('student_id'),
+        course_id__in=attendances.values('course_id'),
+        date__gte=month_start(bounds['first']),
+        date__lt=next_month,
+    ))
+
+
+def rebuild_attendance_summaries(chunk_size=200, on_chunk=None):
+    """Reconstruir todos los resúmenes, `chunk_size` cursos por transacción.
+
+    Cada bloque borra y recalcula los resúmenes de sus cursos dentro de una
+    transacción corta, así las lecturas nunca ven la tabla vacía.
+    `on_chunk(courses_done, summaries_written)` permite reportar progreso.
+    """
+    course_ids = list(Course.objects.order_by('id').values_list('id', flat=True))
+    written = 0
+    for start in range(0, len(course_ids), chunk_size):
+        chunk = course_ids[start:start + chunk_size]
+        with transaction.atomic():
+            AttendanceMonthlySummary.objects.filter(course_id__in=chunk).delete()
+            written += refresh_attendance_summaries(
+                Attendance.objects.filter(course_id__in=chunk))
+        if on_chunk:
+            on_chunk(start + len(chunk), written)
+    return written
@@ -0,0 +1,93 @@
+"""
+Contexto de acceso por petición.
+
+Reúne lo que permisos, ViewSets y serializers necesitan saber del usuario
+(rol admin, cursos inscritos, cursos y materias que dicta). Cada conjunto se
+calcula con una consulta la primera vez que se usa y se reutiliza durante el
+resto de la petición. Para filtrar listados, `ids_filter` evita esa consulta
+si el conjunto aún no se calculó y usa en su lugar una subconsulta.
+"""
+from django.utils.functional import cached_property
+
+from apps.courses.models import Course, CourseEnrollment, Subject
+
+REQUEST_ATTRIBUTE = '_access_context'
+
+
+class AccessContext:
+    """Datos de acceso de `user`, calculados de forma perezosa."""
+
+    def __init__(self, user):
+        self.user = user
+        self._enrollment_checks = {}
+
+    @cached_property
+    def is_admin(self):
+        return bool(
+            getattr(self.user, 'is_staff', False)
+            or getattr(self.user, 'is_admin_role', False)
+        )
+
+    def _enrolled_course_ids_query(self):
+        return CourseEnrollment.objects.filter(
+            student=self.user, is_active=True
+        ).values_list('course_id', flat=True)
+
+    def _taught_course_ids_query(self):
+        return Course.objects.filter(teacher=self.user).values_list('id', flat=True)
+
+    def _taught_subject_ids_query(self):
+        return Subject.objects.filter(teacher=self.user).values_list('id', flat=True)
+
+    @cached_property
+    def enrolled_course_ids(self):
+        """Cursos con inscripción activa del usuario."""
+        return frozenset(self._enrolled_course_ids_query())
+
+    @cached_property
+    def taught_course_ids(self):
+        return frozenset(self._taught_course_ids_query())
+
+    @cached_property
+    def taught_subject_ids(self):
+        return frozenset(self._taught_subject_ids_query())
+
+    def ids_filter(self, name, subquery=True):
+        """Valor para un filtro `__in` con el conjunto `name`.
+
+        Si el conjunto ya se calculó en esta petición (o `subquery` es False,
+        p.ej. en rutas de detalle cuyos permisos lo van a usar) se usa el
+        conjunto; si no, la subconsulta perezosa, que viaja dentro de la
+        consulta principal en lugar de añadir una.
+        """
+        if name in self.__dict__ or not subquery:
+            return getattr(self, name)
+        return getattr(self, f'_{name}_query')()
+
+    def is_enrolled(self, student_id, course_id):
+        """¿Tiene `student_id` inscripción activa en `course_id`? (memorizado)."""
+        if student_id == self.user.pk:
+            return course_id in self.enrolled_course_ids
+        key = (student_id, course_id)
+        if key not in self._enrollment_checks:
+            self._enrollment_checks[key] = CourseEnrollment.objects.filter(
+                student_id=student_id, course_id=course_id, is_active=True
+            ).exists()
+        return self._enrollment_checks[key]
+
+
+def get_access_context(request):
+    """Devolver el contexto de la petición, creándolo si hace falta.
+
+    Se guarda en el HttpRequest subyacente para que vistas de Django y DRF
+    compartan el mismo contexto; se recalcula si cambia el usuario.
+    """
+    target = getattr(request, '_request', request)
+    context = getattr(target, REQUEST_ATTRIBUTE, None)
+    if context is None or context.user is not request.user:
+        context = AccessContext(request.user)
+        setattr(target, REQUEST_ATTRIBUTE, context)
+    return context
+
+
+__all__ = ['AccessContext', 'get_access_context']
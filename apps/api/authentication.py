@@ -0,0 +1,61 @@
+"""
+Autenticación por token para la API REST de Estudify.
+
+Cabecera: `Authorization: Token <clave>`. La clave se compara por su SHA-256
+y el token resuelto se cachea, de modo que el coste por petición es un
+digest, una lectura de caché y la lectura del usuario por clave primaria en
+lugar de un hash PBKDF2 (BasicAuthentication).
+"""
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+
+from apps.users.models import ApiToken
+from apps.users.tokens import (cache_token_user, get_cached_token_user, hash_token_key,
+                               invalidate_tokens)
+
+
+class HashedTokenAuthentication(BaseAuthentication):
+    keyword = 'Token'
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed('Cabecera de token inválida.')
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed('Cabecera de token inválida.')
+        return self.authenticate_credentials(key)
+
+    def authenticate_credentials(self, key):
+        key_hash = hash_token_key(key)
+        cached = get_cached_token_user(key_hash)
+        user = None
+        if cached is None:
+            token = ApiToken.objects.select_related('user').filter(
+                key_hash=key_hash, is_active=True).first()
+            if token is None:
+                raise exceptions.AuthenticationFailed('Token inválido.')
+            user = token.user
+            cached = (token.user_id, token.expires_at)
+            cache_token_user(key_hash, *cached)
+
+        user_id, expires_at = cached
+        if expires_at is not None and expires_at <= timezone.now():
+            raise exceptions.AuthenticationFailed('Token expirado.')
+        if user is None:
+            # Siempre fresco: rol, permisos y borrado se aplican al instante
+            user = get_user_model().objects.filter(pk=user_id).first()
+        if user is None:
+            invalidate_tokens([key_hash])
+            raise exceptions.AuthenticationFailed('Token inválido.')
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed('Usuario inactivo.')
+        return user, None
+
+    def authenticate_header(self, request):
+        return self.keyword
@@ -0,0 +1,81 @@
+"""
+Exportación en streaming (NDJSON o CSV) para los ViewSets de la API.
+
+Las filas se leen con `values()` + `.iterator(chunk_size=...)` (cursor del
+lado del servidor en PostgreSQL) y se escriben a medida que se generan, así la
+memoria del worker no depende del número de filas exportadas.
+"""
+import csv
+from datetime import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+EXPORT_CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+class _Echo:
+    """Pseudo-buffer para csv.writer: devuelve la línea en lugar de guardarla."""
+
+    def write(self, value):
+        return value
+
+
+def iter_ndjson(rows):
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(row) + '\n'
+
+
+def iter_csv(rows, fields):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([row[field] for field in fields])
+
+
+class StreamingExportMixin:
+    """
+    Añade la acción `GET <recurso>/export/?export_format=ndjson|csv`.
+
+    Respeta el ámbito por rol (`get_queryset`) y los filtros de la vista
+    (`filter_queryset`). La vista define `export_fields` (campos para
+    `values()`, se admiten relaciones con `__`) y `export_filename`.
+    """
+    export_fields = ()
+    export_filename = 'export'
+    export_chunk_size = 2000
+
+    @action(detail=False, methods=['get'], pagination_class=None)
+    def export(self, request):
+        """Exportar todos los registros visibles como NDJSON (por defecto) o CSV."""
+        export_format = request.query_params.get('export_format', 'ndjson').lower()
+        if export_format not in EXPORT_CONTENT_TYPES:
+            return Response(
+                {'error': f'Formato no soportado: {export_format}. Use ndjson o csv.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = self.filter_queryset(self.get_queryset())
+        ordering = list(queryset.query.order_by) or ['pk']
+        rows = queryset.order_by(*ordering, 'pk').values(*self.export_fields).iterator(
+            chunk_size=self.export_chunk_size)
+
+        if export_format == 'csv':
+            content = iter_csv(rows, self.export_fields)
+        else:
+            content = iter_ndjson(rows)
+
+        response = StreamingHttpResponse(content, content_type=EXPORT_CONTENT_TYPES[export_format])
+        filename = f'{self.export_filename}_{datetime.now():%Y%m%d}.{export_format}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+__all__ = ['StreamingExportMixin', 'iter_csv', 'iter_ndjson']
@@ -0,0 +1,142 @@
+"""
+Paginación para la API REST de Estudify.
+
+`KeysetPagination` pagina por clave compuesta (campo de orden + id), de modo
+que una página profunda cuesta lo mismo que la primera: no hay COUNT(*) ni
+OFFSET. `CursorOptInPagination` mantiene la paginación por número de página
+por defecto y cambia a keyset cuando la petición incluye `?cursor=`.
+"""
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación keyset hacia adelante sobre `ordering` (p.ej. ('-date', '-id')).
+
+    El último campo debe ser único (normalmente `id`) para desempatar. El
+    cursor es opaco: base64 de los valores de la última fila de la página.
+    """
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Cursor inválido'
+
+    def __init__(self, ordering, page_size=None):
+        self.ordering = tuple(ordering)
+        self.page_size = page_size or api_settings.PAGE_SIZE
+        self.base_url = None
+        self.next_position = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        queryset = queryset.order_by(*self.ordering)
+
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self._after(position))
+
+        rows = list(queryset[:self.page_size + 1])
+        page = rows[:self.page_size]
+        self.next_position = None
+        if len(rows) > self.page_size:
+            self.next_position = [
+                getattr(page[-1], name.lstrip('-')) for name in self.ordering
+            ]
+        return page
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        values = [
+            value.isoformat() if hasattr(value, 'isoformat') else value
+            for value in self.next_position
+        ]
+        encoded = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                model._meta.get_field(name.lstrip('-')).to_python(value)
+                for name, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, UnicodeDecodeError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _after(self, position):
+        """Construir el filtro (a, b, c) > / < (x, y, z) respetando el signo de cada campo."""
+        condition = Q()
+        equal = Q()
+        for name, value in zip(self.ordering, position):
+            field = name.lstrip('-')
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{field}__{lookup}': value})
+            equal &= Q(**{field: value})
+        return condition
+
+
+class CursorOptInPagination(PageNumberPagination):
+    """
+    Paginación por página por defecto; keyset cuando se envía `?cursor=`.
+
+    La vista declara `cursor_ordering`, p.ej. ('-graded_date', '-id'), que debe
+    estar respaldado por un índice compuesto con el mismo orden.
+    """
+    cursor_query_param = 'cursor'
+
+    def __init__(self):
+        self.keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        ordering = getattr(view, 'cursor_ordering', None)
+        if ordering and self.cursor_query_param in request.query_params:
+            self.keyset = KeysetPagination(ordering, page_size=self.page_size)
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append({
+            'name': self.cursor_query_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Activa la paginación por cursor; vacío para la primera página.',
+            'schema': {'type': 'string'},
+        })
+        return parameters
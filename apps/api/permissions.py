@@ -1,9 +1,15 @@
 """
 Permisos personalizados para la API REST de Estudify.
 Define qué acciones puede realizar cada rol (admin, teacher, student).
+
+Las comprobaciones por objeto comparan ids de clave foránea y usan el
+contexto de acceso de la petición (`apps.api.access`), de modo que no
+consultan la base de datos por cada objeto evaluado.
 """
 from rest_framework import permissions
 
+from apps.api.access import get_access_context
+
 
 # Helper predicates to reduce duplicated role checks
 def _is_authenticated(request):
@@ -30,6 +36,31 @@ def _has_full_access(user):
     return _is_admin(user) or _is_teacher(user)
 
 
+def _pk(instance):
+    pk = getattr(instance, "pk", None)
+    return pk if pk is not None else getattr(instance, "id", None)
+
+
+def _related_id(obj, name):
+    """Id de la relación `name` de `obj`, sin cargar el objeto relacionado."""
+    related_id = getattr(obj, f"{name}_id", None)
+    if related_id is not None:
+        return related_id
+    return _pk(getattr(obj, name, None))
+
+
+def _is_owner(obj, name, user):
+    return _related_id(obj, name) == _pk(user)
+
+
+def _is_enrolled_in(request, course):
+    """¿Está el usuario inscrito en `course`? Usa el contexto de la petición."""
+    course_id = _pk(course)
+    if course_id is None:
+        return course.enrollments.filter(student=request.user, is_active=True).exists()
+    return course_id in get_access_context(request).enrolled_course_ids
+
+
 class IsAdminUser(permissions.BasePermission):
     """Solo usuarios con rol admin o staff pueden acceder."""
 
@@ -67,7 +98,7 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
         if hasattr(obj, 'user'):
             return obj.user == request.user
         if hasattr(obj, 'student'):
-            return obj.student == request.user
+            return _is_owner(obj, "student", request.user)
 
         return False
 
@@ -100,7 +131,7 @@ class GradePermission(permissions.BasePermission):
 
         # Estudiantes solo pueden VER sus propias calificaciones
         if _is_student(request.user) and request.method in permissions.SAFE_METHODS:
-            return obj.student == request.user
+            return _is_owner(obj, "student", request.user)
 
         return False
 
@@ -133,7 +164,7 @@ class AttendancePermission(permissions.BasePermission):
 
         # Estudiantes solo pueden VER su propia asistencia
         if _is_student(request.user) and request.method in permissions.SAFE_METHODS:
-            return obj.student == request.user
+            return _is_owner(obj, "student", request.user)
 
         return False
 
@@ -171,11 +202,11 @@ class CourseEnrollmentPermission(permissions.BasePermission):
 
         # Profesores pueden gestionar inscripciones de sus cursos
         if _is_teacher(request.user):
-            return obj.course.teacher == request.user
+            return obj.course_id in get_access_context(request).taught_course_ids
 
         # Estudiantes solo pueden ver sus propias inscripciones
         if _is_student(request.user) and request.method in permissions.SAFE_METHODS:
-            return obj.student == request.user
+            return _is_owner(obj, "student", request.user)
 
         return False
 
@@ -215,13 +246,11 @@ class CoursePermission(permissions.BasePermission):
         if _is_teacher(request.user):
             if request.method in permissions.SAFE_METHODS:
                 return True
-            return obj.teacher == request.user
+            return _is_owner(obj, "teacher", request.user)
 
         # Estudiantes solo pueden ver cursos donde están inscritos
         if _is_student(request.user) and request.method in permissions.SAFE_METHODS:
-            return obj.enrollments.filter(
-                student=request.user, is_active=True
-            ).exists()
+            return _is_enrolled_in(request, obj)
 
         return False
 
@@ -261,13 +290,13 @@ class SubjectPermission(permissions.BasePermission):
         if _is_teacher(request.user):
             if request.method in permissions.SAFE_METHODS:
                 return True
-            return obj.teacher == request.user
+            return _is_owner(obj, "teacher", request.user)
 
         # Estudiantes solo pueden ver materias de cursos inscritos
         if _is_student(request.user) and request.method in permissions.SAFE_METHODS:
-            return obj.course.enrollments.filter(
-                student=request.user,
-                is_active=True,
-            ).exists()
+            course_id = _related_id(obj, "course")
+            if course_id is None:
+                return _is_enrolled_in(request, obj.course)
+            return course_id in get_access_context(request).enrolled_course_ids
 
         return False
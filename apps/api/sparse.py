@@ -0,0 +1,155 @@
+"""
+Campos dispersos (`?fields=` / `?omit=`) para los ViewSets de la API.
+
+`SparseFieldsetMixin` recorta el serializer a los campos pedidos y lleva la
+misma proyección a la consulta: `.only()` con las columnas necesarias,
+`select_related` solo de las relaciones que algún campo usa y
+`prefetch_related` solo de las colecciones anidadas que se devuelven.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+
+PROJECTED_ACTIONS = ('list', 'retrieve')
+
+
+def parse_field_list(value):
+    """Convertir 'a, b,,c' en ['a', 'b', 'c']."""
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+
+def resolve_dependencies(model, paths):
+    """
+    Clasificar rutas tipo ORM ('student__first_name') según cómo deben cargarse.
+
+    Devuelve (columns, relations, prefetches); `columns` es None si alguna ruta
+    no corresponde a un campo del modelo y por tanto no se puede proyectar.
+    """
+    columns, relations, prefetches = set(), set(), set()
+    whole_relations = set()
+    projectable = True
+    for path in paths:
+        parts = path.split('__')
+        current, walked = model, []
+        for position, part in enumerate(parts):
+            try:
+                field = current._meta.get_field(part)
+            except FieldDoesNotExist:
+                if walked:
+                    # Método o propiedad de un modelo relacionado: cargarlo completo.
+                    whole_relations.add('__'.join(walked))
+                else:
+                    projectable = False
+                break
+            if field.many_to_many or field.one_to_many:
+                prefetches.add(path)
+                break
+            walked.append(part)
+            if position == len(parts) - 1 or not field.is_relation:
+                columns.add('__'.join(walked))
+                break
+            relations.add('__'.join(walked))
+            current = field.related_model
+
+    relations |= whole_relations
+    if not projectable:
+        return None, relations, prefetches
+    # Una relación cargada completa hace innecesarias sus columnas sueltas.
+    columns = {
+        column for column in columns
+        if not any(column.startswith(f'{relation}__') for relation in whole_relations)
+    } | whole_relations
+    return columns, relations, prefetches
+
+
+def full_name_paths(relation=None):
+    """Columnas que usa `User.get_full_name`, opcionalmente a través de `relation`."""
+    prefix = f'{relation}__' if relation else ''
+    return tuple(f'{prefix}{name}' for name in ('first_name', 'last_name', 'username'))
+
+
+class SparseFieldsetMixin:
+    """
+    Añade `?fields=id,value` (lista blanca) y `?omit=comments` (lista negra).
+
+    `field_dependencies` indica qué rutas del modelo necesita cada campo del
+    serializer cuando no basta con su `source` (propiedades, métodos como
+    `get_full_name` o serializers anidados). El `get_queryset` de la vista no
+    debe aplicar `select_related`/`prefetch_related`: el mixin los decide.
+    """
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+    field_dependencies = {}
+
+    def get_sparse_field_names(self):
+        """Campos a devolver, o None si la petición no restringe ninguno."""
+        if hasattr(self, '_sparse_field_names'):
+            return self._sparse_field_names
+
+        params = self.request.query_params if self.request else {}
+        requested = parse_field_list(params.get(self.fields_query_param))
+        omitted = parse_field_list(params.get(self.omit_query_param))
+        names = None
+        if requested or omitted:
+            available = list(self.get_serializer_class()().fields)
+            unknown = [name for name in requested + omitted if name not in available]
+            if unknown:
+                raise ValidationError({
+                    'fields': [f'Campos desconocidos: {", ".join(unknown)}']
+                })
+            names = [
+                name for name in available
+                if (not requested or name in requested) and name not in omitted
+            ]
+        self._sparse_field_names = names
+        return names
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        # Solo en lectura: recortar al crear o actualizar validaría contra un
+        # subconjunto e ignoraría en silencio el resto de los datos enviados
+        if getattr(self, 'action', None) not in PROJECTED_ACTIONS:
+            return serializer
+        names = self.get_sparse_field_names()
+        if names is not None:
+            target = getattr(serializer, 'child', serializer)
+            for name in list(target.fields):
+                if name not in names:
+                    target.fields.pop(name)
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if getattr(self, 'action', None) in PROJECTED_ACTIONS:
+            queryset = self.project_queryset(queryset)
+        return queryset
+
+    def get_field_paths(self, name, field):
+        """Rutas del modelo que necesita el campo `name` del serializer."""
+        if name in self.field_dependencies:
+            return self.field_dependencies[name]
+        if field.source == '*':
+            return ()
+        return (field.source.replace('.', '__'),)
+
+    def project_queryset(self, queryset):
+        """Aplicar joins, prefetches y `.only()` según los campos devueltos."""
+        fields = self.get_serializer_class()().fields
+        names = self.get_sparse_field_names()
+        if names is None:
+            names = list(fields)
+        paths = [
+            path for name in names for path in self.get_field_paths(name, fields[name])
+        ]
+        columns, relations, prefetches = resolve_dependencies(queryset.model, paths)
+
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if relations:
+            queryset = queryset.select_related(*sorted(relations))
+        if prefetches:
+            queryset = queryset.prefetch_related(*sorted(prefetches))
+        if columns is not None:
+            queryset = queryset.only(queryset.model._meta.pk.name, *sorted(columns))
+        return queryset
+
+
+__all__ = ['SparseFieldsetMixin', 'full_name_paths', 'parse_field_list', 'resolve_dependencies']
@@ -14,6 +14,8 @@ router.register(
     basename='enrollment')
 router.register(r'grades', views.GradeViewSet, basename='grade')
 router.register(r'attendance', views.AttendanceViewSet, basename='attendance')
+router.register(r'tokens', views.ApiTokenViewSet, basename='api-token')
+router.register(r'report-jobs', views.ReportJobViewSet, basename='report-job')
 
 app_name = 'api'
 
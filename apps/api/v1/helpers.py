@@ -1,4 +1,6 @@
-from typing import Iterable, List
+import csv
+import io
+from typing import Dict, Iterable, List, Tuple
 
 
 def normalize_student_ids(raw_student_ids) -> List[int]:
@@ -33,3 +35,71 @@ def normalize_student_ids(raw_student_ids) -> List[int]:
             continue
 
     return normalized
+
+
+def partition_enrollment_candidates(student_ids, valid_ids, already_enrolled, remaining=None):
+    """Split requested student ids into ids to enroll and per-id errors.
+
+    - valid_ids: ids that exist and have the STUDENT role
+    - already_enrolled: ids with an existing enrollment in the course
+    - remaining: free seats in the course, or None when there is no limit
+
+    Returns (enrolled, errors) preserving the order of `student_ids`.
+    """
+    enrolled: List[int] = []
+    errors: List[dict] = []
+    for student_id in student_ids:
+        if student_id not in valid_ids:
+            error = 'Estudiante no encontrado'
+        elif student_id in already_enrolled:
+            error = 'Ya inscrito'
+        elif remaining is not None and len(enrolled) >= remaining:
+            error = 'El curso ha alcanzado su capacidad máxima.'
+        else:
+            enrolled.append(student_id)
+            continue
+        errors.append({'student_id': student_id, 'error': error})
+    return enrolled, errors
+
+
+def parse_csv_rows(text: str) -> List[dict]:
+    """Parse CSV text with a header row into a list of dicts.
+
+    Blank values are dropped so serializer defaults apply to them.
+    """
+    reader = csv.DictReader(io.StringIO(text))
+    rows: List[dict] = []
+    for raw in reader:
+        rows.append({
+            (key or '').strip(): value.strip()
+            for key, value in raw.items()
+            if key and value is not None and value.strip() != ''
+        })
+    return rows
+
+
+def normalize_roll_call(raw_statuses, valid_statuses) -> Tuple[Dict[int, str], List[dict]]:
+    """Normalize a {student_id: status} mapping from a roll-call payload.
+
+    JSON object keys arrive as strings; they are converted to ints and the
+    statuses upper-cased. Returns (statuses, errors) where errors lists the
+    entries with a non-integer id or an unknown status.
+    """
+    statuses: Dict[int, str] = {}
+    errors: List[dict] = []
+    if not isinstance(raw_statuses, dict):
+        return statuses, errors
+
+    for raw_id, raw_status in raw_statuses.items():
+        try:
+            student_id = int(raw_id)
+        except (TypeError, ValueError):
+            errors.append({'student_id': raw_id, 'error': 'Id de estudiante inválido'})
+            continue
+        value = str(raw_status or '').upper()
+        if value not in valid_statuses:
+            errors.append({'student_id': student_id, 'error': f'Estado inválido: {raw_status}'})
+            continue
+        statuses[student_id] = value
+
+    return statuses, errors
@@ -1,16 +1,29 @@
 from decimal import Decimal
 
 from django.contrib.auth import get_user_model
+from django.urls import reverse
 from rest_framework import serializers
 
 from apps.academics.models import Attendance, Grade
+from apps.api.access import get_access_context
 from apps.courses.models import Course, CourseEnrollment, Subject
 from apps.courses.models import TimeSlot, Classroom, CourseSession
-from apps.users.models import Profile
+from apps.reports.models import ReportJob
+from apps.users.models import ApiToken, Profile
 
 User = get_user_model()
 
 
+def is_actively_enrolled(serializer, student, course_id):
+    """Comprobar inscripción activa reutilizando el contexto de la petición si existe."""
+    request = serializer.context.get('request')
+    if request is not None:
+        return get_access_context(request).is_enrolled(student.pk, course_id)
+    return CourseEnrollment.objects.filter(
+        student=student, course_id=course_id, is_active=True
+    ).exists()
+
+
 class UserSerializer(serializers.ModelSerializer):
     """
     Serializer para el modelo User.
@@ -26,6 +39,96 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'date_joined']
 
 
+class ApiTokenSerializer(serializers.ModelSerializer):
+    """
+    Serializer para el modelo ApiToken (nunca expone la clave ni su hash).
+    """
+
+    class Meta:
+        model = ApiToken
+        fields = ['id', 'name', 'key_prefix', 'expires_at', 'created_at']
+        read_only_fields = ['id', 'key_prefix', 'created_at']
+
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    """
+    Serializer para el modelo ReportJob.
+    Valida los parámetros que exige cada tipo de reporte y que el usuario
+    solo pida reportes dentro de su ámbito.
+    """
+    REQUIRED_PARAMETERS = {
+        ReportJob.ReportType.GRADES_PDF: ('student',),
+        ReportJob.ReportType.ATTENDANCE_PDF: ('student', 'course'),
+        ReportJob.ReportType.REPORT_CARDS_ZIP: ('course',),
+        ReportJob.ReportType.REPORT_CARDS_PDF: ('course',),
+        ReportJob.ReportType.COURSE_ATTENDANCE_PDF: ('course',),
+    }
+    STAFF_ONLY_TYPES = (
+        ReportJob.ReportType.REPORT_CARDS_ZIP,
+        ReportJob.ReportType.REPORT_CARDS_PDF,
+        ReportJob.ReportType.COURSE_ATTENDANCE_PDF,
+    )
+
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportJob
+        fields = [
+            'id', 'report_type', 'student', 'course', 'subject', 'status',
+            'size', 'error', 'download_url', 'created_at', 'started_at',
+            'finished_at'
+        ]
+        read_only_fields = [
+            'id', 'status', 'size', 'error', 'created_at', 'started_at',
+            'finished_at'
+        ]
+
+    def get_download_url(self, obj):
+        if obj.status != ReportJob.Status.SUCCESS:
+            return None
+        request = self.context.get('request')
+        url = reverse('api:report-job-download', kwargs={'pk': obj.pk})
+        return request.build_absolute_uri(url) if request else url
+
+    def validate(self, data):
+        """
+        Validar parámetros requeridos y el ámbito del solicitante.
+        """
+        user = self.context['request'].user
+        if user.is_student:
+            if data['report_type'] in self.STAFF_ONLY_TYPES:
+                raise serializers.ValidationError(
+                    {'report_type': 'Tipo de reporte no disponible para estudiantes.'})
+            # Un estudiante solo puede pedir sus propios reportes
+            if data.get('student') not in (None, user):
+                raise serializers.ValidationError(
+                    {'student': 'Solo puedes solicitar tus propios reportes.'})
+            data['student'] = user
+
+        missing = [
+            name for name in self.REQUIRED_PARAMETERS.get(data['report_type'], ())
+            if not data.get(name)
+        ]
+        if missing:
+            raise serializers.ValidationError(
+                {name: 'Requerido para este tipo de reporte.' for name in missing})
+
+        course, subject = data.get('course'), data.get('subject')
+        if course and subject and subject.course_id != course.pk:
+            raise serializers.ValidationError(
+                {'subject': 'La materia no pertenece al curso indicado.'})
+
+        access = get_access_context(self.context['request'])
+        if user.is_teacher and not access.is_admin:
+            if course and course.pk not in access.taught_course_ids:
+                raise serializers.ValidationError(
+                    {'course': 'Solo puedes solicitar reportes de tus cursos.'})
+            if subject and subject.pk not in access.taught_subject_ids:
+                raise serializers.ValidationError(
+                    {'subject': 'Solo puedes solicitar reportes de tus materias.'})
+        return data
+
+
 class ProfileSerializer(serializers.ModelSerializer):
     """
     Serializer para el modelo Profile.
@@ -134,11 +237,7 @@ class CourseEnrollmentSerializer(serializers.ModelSerializer):
         course = data.get('course')
 
         # Verificar si ya existe inscripción activa
-        if CourseEnrollment.objects.filter(
-            student=student,
-            course=course,
-            is_active=True
-        ).exists():
+        if is_actively_enrolled(self, student, course.pk):
             raise serializers.ValidationError(
                 'El estudiante ya está inscrito en este curso.'
             )
@@ -195,11 +294,7 @@ class GradeSerializer(serializers.ModelSerializer):
         student = data.get('student')
         subject = data.get('subject')
 
-        if not CourseEnrollment.objects.filter(
-            student=student,
-            course=subject.course,
-            is_active=True
-        ).exists():
+        if not is_actively_enrolled(self, student, subject.course_id):
             raise serializers.ValidationError(
                 'El estudiante no está inscrito en el curso de esta materia.'
             )
@@ -207,6 +302,35 @@ class GradeSerializer(serializers.ModelSerializer):
         return data
 
 
+class GradeBulkRowSerializer(serializers.Serializer):
+    """
+    Fila de carga masiva de calificaciones.
+    Usa ids planos para no consultar la base de datos por fila; la
+    existencia de materias y la inscripción se validan en bloque en la vista.
+    """
+    student = serializers.IntegerField(min_value=1)
+    subject = serializers.IntegerField(min_value=1)
+    value = serializers.DecimalField(
+        max_digits=3,
+        decimal_places=1,
+        min_value=Decimal('0.0'),
+        max_value=Decimal('5.0')
+    )
+    grade_type = serializers.ChoiceField(
+        choices=Grade._meta.get_field('grade_type').choices,
+        default='EXAM'
+    )
+    weight = serializers.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        min_value=Decimal('0.0'),
+        max_value=Decimal('100.0'),
+        default=Decimal('100.00')
+    )
+    comments = serializers.CharField(
+        required=False, allow_blank=True, default='')
+
+
 class AttendanceSerializer(serializers.ModelSerializer):
     """
     Serializer para el modelo Attendance.
@@ -235,11 +359,7 @@ class AttendanceSerializer(serializers.ModelSerializer):
         student = data.get('student')
         course = data.get('course')
 
-        if not CourseEnrollment.objects.filter(
-            student=student,
-            course=course,
-            is_active=True
-        ).exists():
+        if not is_actively_enrolled(self, student, course.pk):
             raise serializers.ValidationError(
                 'El estudiante no está inscrito en este curso.'
             )
@@ -1,30 +1,60 @@
+import hashlib
+import json
 import logging
+import os
+from collections import Counter
+
+from django.conf import settings
 
 from django.contrib.auth import get_user_model
-from django.db.models import Avg, Count, Max, Min, Q
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, F, Max, Min, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.http import FileResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, status, viewsets
+from rest_framework import filters, mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from apps.academics.models import Attendance, Grade
+from apps.academics.cache import grade_stats_versions, invalidate_grade_stats
+from apps.academics.forms import BulkAttendanceForm
+from apps.academics.models import Attendance, AttendanceMonthlySummary, Grade
+from apps.academics.summaries import refresh_summaries_for
+from apps.api.access import get_access_context
+from apps.api.exports import StreamingExportMixin
+from apps.api.pagination import CursorOptInPagination
 from apps.api.permissions import (AttendancePermission,
                                   CourseEnrollmentPermission, CoursePermission,
                                   GradePermission, IsAdminUser,
                                   SubjectPermission)
-from apps.api.serializers import (AttendanceSerializer,
+from apps.api.serializers import (ApiTokenSerializer, AttendanceSerializer,
                                   AttendanceStatisticsSerializer,
                                   CourseEnrollmentSerializer, CourseSerializer,
-                                  GradeSerializer, GradeStatisticsSerializer,
-                                  SubjectSerializer, UserSerializer)
+                                  GradeBulkRowSerializer, GradeSerializer,
+                                  GradeStatisticsSerializer,
+                                  ReportJobSerializer, SubjectSerializer,
+                                  UserSerializer)
+from apps.api.sparse import SparseFieldsetMixin, full_name_paths
+from apps.core.instrumentation import QueryBudgetMixin
 from apps.courses.models import Course, CourseEnrollment, Subject
-from .helpers import normalize_student_ids
+from apps.notifications.batching import queue_grade_notifications
+from apps.reports.models import ReportJob
+from apps.reports.tasks import enqueue_report_job
+from apps.users.tokens import issue_token, revoke_token
+from .helpers import (normalize_roll_call, normalize_student_ids,
+                      parse_csv_rows, partition_enrollment_candidates)
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(QueryBudgetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestión de usuarios.
     CRUD completo + acciones personalizadas.
@@ -41,6 +71,8 @@ class UserViewSet(viewsets.ModelViewSet):
     search_fields = ['username', 'email', 'first_name', 'last_name']
     ordering_fields = ['date_joined', 'last_name']
     ordering = ['-date_joined']
+    field_dependencies = {'full_name': full_name_paths()}
+    query_budgets = {'list': 5, 'retrieve': 4, 'me': 3, 'default': 12}
 
     @action(detail=False, methods=['get'],
             permission_classes=[IsAuthenticated])
@@ -61,7 +93,91 @@ class UserViewSet(viewsets.ModelViewSet):
         })
 
 
-class CourseViewSet(viewsets.ModelViewSet):
+class ApiTokenViewSet(QueryBudgetMixin,
+                      mixins.ListModelMixin,
+                      mixins.CreateModelMixin,
+                      mixins.DestroyModelMixin,
+                      viewsets.GenericViewSet):
+    """
+    Tokens de API del usuario autenticado.
+    - POST: emite un token; la clave solo aparece en esta respuesta
+    - GET: lista los tokens propios (sin clave)
+    - DELETE: revoca el token
+    """
+    serializer_class = ApiTokenSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+    query_budgets = {'default': 5}
+
+    def get_queryset(self):
+        return self.request.user.api_tokens.filter(is_active=True)
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        token, key = issue_token(request.user, **serializer.validated_data)
+        data = self.get_serializer(token).data
+        data['key'] = key
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    def perform_destroy(self, instance):
+        revoke_token(instance)
+
+
+class ReportJobViewSet(QueryBudgetMixin,
+                       mixins.ListModelMixin,
+                       mixins.CreateModelMixin,
+                       mixins.RetrieveModelMixin,
+                       viewsets.GenericViewSet):
+    """
+    Reportes generados en segundo plano.
+    - POST: encola un reporte y responde 202 sin esperar a que se genere
+    - GET: lista o consulta el estado de los reportes propios
+    - GET download/: descarga el archivo de un reporte terminado
+    """
+    serializer_class = ReportJobSerializer
+    permission_classes = [IsAuthenticated]
+    query_budgets = {'create': 6, 'default': 4}
+
+    def get_queryset(self):
+        return self.request.user.report_jobs.filter(is_active=True)
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            job = serializer.save(requested_by=request.user)
+            # Encolar tras el commit para que el worker encuentre el registro
+            transaction.on_commit(lambda: enqueue_report_job(job.pk))
+        headers = {'Location': reverse('api:report-job-detail', kwargs={'pk': job.pk})}
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED, headers=headers)
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """Descargar el archivo del reporte (409 si aún no está listo, 304 si no cambió)."""
+        job = self.get_object()
+        if job.status != ReportJob.Status.SUCCESS or not job.file:
+            return Response(
+                {'error': 'El reporte no está disponible', 'status': job.status},
+                status=status.HTTP_409_CONFLICT
+            )
+        etag = quote_etag(job.fingerprint) if job.fingerprint else None
+        if etag:
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                not_modified['ETag'] = etag
+                return not_modified
+        response = FileResponse(
+            job.file.open('rb'), as_attachment=True,
+            filename=os.path.basename(job.file.name), content_type=job.content_type,
+        )
+        if etag:
+            response['ETag'] = etag
+            response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+class CourseViewSet(QueryBudgetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestión de cursos.
     - Admins: acceso completo
@@ -79,19 +195,35 @@ class CourseViewSet(viewsets.ModelViewSet):
     search_fields = ['name', 'code']
     ordering_fields = ['name', 'academic_year', 'created_at']
     ordering = ['-academic_year', 'semester', 'name']
+    field_dependencies = {
+        'teacher_name': full_name_paths('teacher'),
+        'enrolled_count': (),
+        'is_full': ('max_students',),
+        'sessions': ('sessions__timeslot', 'sessions__classroom_fk'),
+    }
+    # Sesión + contexto de acceso + COUNT + listado + 3 prefetches
+    query_budgets = {'list': 8, 'retrieve': 7, 'students': 5, 'subjects': 5, 'default': 12}
 
     def get_queryset(self):
-        """Filtrar cursos según el rol del usuario."""
+        """Filtrar cursos según el rol del usuario.
+
+        Anota el conteo de inscripciones activas (salvo que `?fields=` lo
+        excluya); docente y sesiones se precargan en `project_queryset`, así
+        el listado usa un número fijo de consultas.
+        """
         queryset = super().get_queryset()
+        names = self.get_sparse_field_names()
+        if names is None or {'enrolled_count', 'is_full'} & set(names):
+            queryset = queryset.annotate(
+                active_enrollments=Count(
+                    'enrollments', filter=Q(enrollments__is_active=True))
+            )
         user = self.request.user
 
         # Estudiantes solo ven cursos donde están inscritos
         if user.is_student:
-            enrolled_course_ids = CourseEnrollment.objects.filter(
-                student=user,
-                is_active=True
-            ).values_list('course_id', flat=True)
-            return queryset.filter(id__in=enrolled_course_ids)
+            return queryset.filter(
+                id__in=get_access_context(self.request).ids_filter('enrolled_course_ids', subquery=not self.detail))
 
         # Profesores y admins ven todos
         return queryset
@@ -116,7 +248,7 @@ class CourseViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class SubjectViewSet(viewsets.ModelViewSet):
+class SubjectViewSet(QueryBudgetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestión de materias.
     - Admins: acceso completo
@@ -134,6 +266,8 @@ class SubjectViewSet(viewsets.ModelViewSet):
     search_fields = ['name', 'code']
     ordering_fields = ['name', 'credits', 'created_at']
     ordering = ['course', 'name']
+    field_dependencies = {'teacher_name': full_name_paths('teacher')}
+    query_budgets = {'list': 6, 'retrieve': 5, 'default': 10}
 
     def get_queryset(self):
         """Filtrar materias según el rol del usuario."""
@@ -142,17 +276,14 @@ class SubjectViewSet(viewsets.ModelViewSet):
 
         # Estudiantes solo ven materias de cursos inscritos
         if user.is_student:
-            enrolled_course_ids = CourseEnrollment.objects.filter(
-                student=user,
-                is_active=True
-            ).values_list('course_id', flat=True)
-            return queryset.filter(course_id__in=enrolled_course_ids)
+            return queryset.filter(
+                course_id__in=get_access_context(self.request).ids_filter('enrolled_course_ids', subquery=not self.detail))
 
         # Profesores y admins ven todas
         return queryset
 
 
-class CourseEnrollmentViewSet(viewsets.ModelViewSet):
+class CourseEnrollmentViewSet(QueryBudgetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestión de inscripciones.
     - Admins: acceso completo
@@ -166,6 +297,8 @@ class CourseEnrollmentViewSet(viewsets.ModelViewSet):
     filterset_fields = ['student', 'course', 'is_active']
     ordering_fields = ['enrollment_date']
     ordering = ['-enrollment_date']
+    field_dependencies = {'student_name': full_name_paths('student')}
+    query_budgets = {'list': 6, 'retrieve': 5, 'bulk_enroll': 10, 'default': 10}
 
     def get_queryset(self):
         """Filtrar inscripciones según el rol del usuario."""
@@ -177,8 +310,9 @@ class CourseEnrollmentViewSet(viewsets.ModelViewSet):
             return queryset.filter(student=user)
 
         # Profesores ven inscripciones de sus cursos
-        if user.is_teacher and not user.is_staff and not user.is_admin_role:
-            return queryset.filter(course__teacher=user)
+        access = get_access_context(self.request)
+        if user.is_teacher and not access.is_admin:
+            return queryset.filter(course_id__in=access.ids_filter('taught_course_ids', subquery=not self.detail))
 
         # Admins ven todas
         return queryset
@@ -207,46 +341,42 @@ class CourseEnrollmentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        try:
-            course = Course.objects.get(id=course_id)
-        except Course.DoesNotExist:
-            return Response(
-                {'error': 'Curso no encontrado'},
-                status=status.HTTP_404_NOT_FOUND
-            )
-
-        logger = logging.getLogger(__name__)
-        enrolled = []
-        errors = []
-
-        for student_id in student_ids:
-            logger.warning(f"bulk_enroll: processing student_id={student_id}")
-            try:
-                student = User.objects.get(
-                    id=student_id, role=User.UserRole.STUDENT)
-            except User.DoesNotExist:
-                logger.warning(
-                    f"bulk_enroll: student not found or not a STUDENT: {student_id}")
-                errors.append({
-                    'student_id': student_id,
-                    'error': 'Estudiante no encontrado'
-                })
-                continue
-
-            enrollment, created = CourseEnrollment.objects.get_or_create(
-                student=student,
-                course=course,
-                defaults={'is_active': True}
-            )
-            if created:
-                enrolled.append(student_id)
-            else:
-                logger.warning(
-                    f"bulk_enroll: already enrolled student_id={student_id}")
-                errors.append({
-                    'student_id': student_id,
-                    'error': 'Ya inscrito'
-                })
+        # Eliminar duplicados conservando el orden recibido
+        student_ids = list(dict.fromkeys(student_ids))
+
+        valid_ids = set(User.objects.filter(
+            id__in=student_ids, role=User.UserRole.STUDENT
+        ).values_list('id', flat=True))
+
+        with transaction.atomic():
+            # Bloquear el curso serializa inscripciones concurrentes y hace
+            # atómica la verificación de capacidad.
+            course = Course.objects.select_for_update().filter(id=course_id).first()
+            if course is None:
+                return Response(
+                    {'error': 'Curso no encontrado'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            already_enrolled = set(CourseEnrollment.objects.filter(
+                course=course, student_id__in=valid_ids
+            ).values_list('student_id', flat=True))
+
+            remaining = None
+            if course.max_students:
+                active = course.enrollments.filter(is_active=True).count()
+                remaining = max(course.max_students - active, 0)
+
+            enrolled, errors = partition_enrollment_candidates(
+                student_ids, valid_ids, already_enrolled, remaining)
+
+            CourseEnrollment.objects.bulk_create([
+                CourseEnrollment(student_id=student_id, course=course, is_active=True)
+                for student_id in enrolled
+            ])
+
+        logger.info(
+            'bulk_enroll: course_id=%s enrolled=%s errors=%s',
+            course_id, len(enrolled), len(errors))
 
         return Response({
             'enrolled_count': len(enrolled),
@@ -255,7 +385,7 @@ class CourseEnrollmentViewSet(viewsets.ModelViewSet):
         })
 
 
-class GradeViewSet(viewsets.ModelViewSet):
+class GradeViewSet(QueryBudgetMixin, SparseFieldsetMixin, StreamingExportMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestión de calificaciones.
     - Admins y profesores: pueden crear/editar/eliminar
@@ -275,6 +405,24 @@ class GradeViewSet(viewsets.ModelViewSet):
         'subject__name']
     ordering_fields = ['graded_date', 'value']
     ordering = ['-graded_date']
+    pagination_class = CursorOptInPagination
+    cursor_ordering = ('-graded_date', '-id')
+    export_filename = 'calificaciones'
+    export_fields = (
+        'id', 'student_id', 'student__username', 'student__first_name',
+        'student__last_name', 'subject_id', 'subject__name', 'subject__course_id',
+        'value', 'grade_type', 'weight', 'comments', 'graded_by_id',
+        'graded_date', 'created_at',
+    )
+    field_dependencies = {
+        'student_name': full_name_paths('student'),
+        'graded_by_name': full_name_paths('graded_by'),
+        'is_passing': ('value',),
+        'letter_grade': ('value',),
+    }
+    query_budgets = {
+        'list': 6, 'retrieve': 5, 'export': 5, 'statistics': 6, 'bulk': 10, 'default': 14,
+    }
 
     def get_queryset(self):
         """Filtrar calificaciones según el rol del usuario."""
@@ -286,8 +434,9 @@ class GradeViewSet(viewsets.ModelViewSet):
             return queryset.filter(student=user)
 
         # Profesores ven calificaciones de sus materias
-        if user.is_teacher and not user.is_staff and not user.is_admin_role:
-            return queryset.filter(subject__teacher=user)
+        access = get_access_context(self.request)
+        if user.is_teacher and not access.is_admin:
+            return queryset.filter(subject_id__in=access.ids_filter('taught_subject_ids', subquery=not self.detail))
 
         # Admins ven todas
         return queryset
@@ -296,12 +445,112 @@ class GradeViewSet(viewsets.ModelViewSet):
         """Asignar automáticamente el docente que califica."""
         serializer.save(graded_by=self.request.user)
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Carga masiva de calificaciones.
+        Acepta una lista JSON (o {"grades": [...]}) o un CSV con encabezado
+        student,subject,value,grade_type,weight,comments, ya sea como cuerpo
+        `text/csv` o como archivo `file` en multipart.
+
+        Las filas válidas se insertan con un único bulk_create; las inválidas
+        se devuelven con su índice. Al no pasar por save(), no se disparan
+        las señales post_save por calificación: las notificaciones se encolan
+        aquí, en lote, al confirmar la transacción.
+        """
+        rows = self._read_bulk_rows(request)
+        if rows is None:
+            return Response(
+                {'error': 'Se requiere una lista de calificaciones o un CSV'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        row_serializer = GradeBulkRowSerializer()
+        candidates = []
+        errors = []
+        for index, row in enumerate(rows):
+            try:
+                candidates.append((index, row_serializer.run_validation(row)))
+            except ValidationError as exc:
+                errors.append({'row': index, 'errors': exc.detail})
+
+        subject_courses = dict(Subject.objects.filter(
+            id__in={data['subject'] for _, data in candidates}
+        ).values_list('id', 'course_id'))
+        enrolled_pairs = set(CourseEnrollment.objects.filter(
+            is_active=True,
+            student_id__in={data['student'] for _, data in candidates},
+            course_id__in=set(subject_courses.values()),
+        ).values_list('student_id', 'course_id'))
+
+        grades = []
+        for index, data in candidates:
+            course_id = subject_courses.get(data['subject'])
+            if course_id is None:
+                errors.append({'row': index, 'errors': {
+                    'subject': ['Materia no encontrada.']}})
+            elif (data['student'], course_id) not in enrolled_pairs:
+                errors.append({'row': index, 'errors': {'non_field_errors': [
+                    'El estudiante no está inscrito en el curso de esta materia.']}})
+            else:
+                grades.append(Grade(
+                    student_id=data['student'],
+                    subject_id=data['subject'],
+                    value=data['value'],
+                    grade_type=data['grade_type'],
+                    weight=data['weight'],
+                    comments=data['comments'],
+                    graded_by=request.user,
+                ))
+
+        with transaction.atomic():
+            created = Grade.objects.bulk_create(grades, batch_size=1000)
+            queue_grade_notifications(created)
+            transaction.on_commit(lambda: invalidate_grade_stats(
+                student_ids=[grade.student_id for grade in created],
+                subject_ids=[grade.subject_id for grade in created],
+                course_ids=[subject_courses[grade.subject_id] for grade in created],
+            ))
+
+        errors.sort(key=lambda e: e['row'])
+        return Response({
+            'created_count': len(created),
+            'created_ids': [grade.id for grade in created],
+            'errors': errors
+        })
+
+    def _read_bulk_rows(self, request):
+        """Extraer las filas de la petición (JSON o CSV) o None si no hay."""
+        if request.content_type.startswith('text/csv'):
+            return parse_csv_rows(request.body.decode('utf-8-sig'))
+
+        upload = request.FILES.get('file') if request.FILES else None
+        if upload is not None:
+            return parse_csv_rows(upload.read().decode('utf-8-sig'))
+
+        data = request.data
+        if isinstance(data, dict):
+            data = data.get('grades')
+        if isinstance(data, list) and data:
+            return data
+        return None
+
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         """
         Obtener estadísticas de calificaciones.
         Filtros opcionales: student_id, course_id, subject_id
+
+        El resultado se cachea por ámbito de rol y filtros; la cabecera
+        `X-Cache` indica HIT o MISS.
         """
+        cache_key = self._statistics_cache_key(request)
+        data = cache.get(cache_key)
+        if data is not None:
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
         queryset = self.filter_queryset(self.get_queryset())
 
         # Aplicar filtros adicionales
@@ -331,11 +580,33 @@ class GradeViewSet(viewsets.ModelViewSet):
         for s in stats:
             s['subject_name'] = s.pop('subject__name', None)
 
-        serializer = GradeStatisticsSerializer(stats, many=True)
-        return Response(serializer.data)
+        data = GradeStatisticsSerializer(stats, many=True).data
+        cache.set(cache_key, data, settings.GRADE_STATS_CACHE_TIMEOUT)
+        response = Response(data)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def _statistics_cache_key(self, request):
+        """Clave de caché: ámbito del rol + parámetros + versiones de los datos."""
+        user = request.user
+        params = request.query_params
+        if user.is_student:
+            scope = ('student', user.id)
+            student_id = user.id
+        else:
+            is_teacher = user.is_teacher and not get_access_context(request).is_admin
+            scope = ('teacher', user.id) if is_teacher else ('all',)
+            student_id = params.get('student_id') or params.get('student')
+        versions = grade_stats_versions(
+            student_id=student_id or None,
+            subject_id=params.get('subject_id') or params.get('subject') or None,
+            course_id=params.get('course_id') or None,
+        )
+        raw = json.dumps([scope, sorted(params.lists()), versions], default=str)
+        return 'grade_stats:' + hashlib.md5(raw.encode()).hexdigest()
 
 
-class AttendanceViewSet(viewsets.ModelViewSet):
+class AttendanceViewSet(QueryBudgetMixin, SparseFieldsetMixin, StreamingExportMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestión de asistencia.
     - Admins y profesores: pueden crear/editar/eliminar
@@ -348,10 +619,31 @@ class AttendanceViewSet(viewsets.ModelViewSet):
     filterset_fields = ['student', 'course', 'status', 'date']
     ordering_fields = ['date']
     ordering = ['-date']
+    pagination_class = CursorOptInPagination
+    cursor_ordering = ('-date', '-id')
+    export_filename = 'asistencias'
+    export_fields = (
+        'id', 'student_id', 'student__username', 'student__first_name',
+        'student__last_name', 'course_id', 'course__name', 'date', 'status',
+        'notes', 'recorded_by_id', 'created_at',
+    )
+    field_dependencies = {
+        'student_name': full_name_paths('student'),
+        'recorded_by_name': full_name_paths('recorded_by'),
+        'status_display': ('status',),
+    }
+    query_budgets = {
+        'list': 6, 'retrieve': 5, 'export': 5, 'statistics': 6, 'roll_call': 12, 'default': 14,
+    }
+    # Parámetros por id que `statistics` puede resolver desde el resumen mensual
+    SUMMARY_ID_PARAMS = ('student_id', 'course_id', 'student', 'course')
 
     def get_queryset(self):
         """Filtrar asistencia según el rol del usuario."""
-        queryset = super().get_queryset()
+        return self._filter_by_role(super().get_queryset())
+
+    def _filter_by_role(self, queryset):
+        """Aplicar el ámbito del rol; sirve para Attendance y su resumen mensual."""
         user = self.request.user
 
         # Estudiantes solo ven su propia asistencia
@@ -359,8 +651,9 @@ class AttendanceViewSet(viewsets.ModelViewSet):
             return queryset.filter(student=user)
 
         # Profesores ven asistencia de sus cursos
-        if user.is_teacher and not user.is_staff and not user.is_admin_role:
-            return queryset.filter(course__teacher=user)
+        access = get_access_context(self.request)
+        if user.is_teacher and not access.is_admin:
+            return queryset.filter(course_id__in=access.ids_filter('taught_course_ids', subquery=not self.detail))
 
         # Admins ven todas
         return queryset
@@ -369,12 +662,124 @@ class AttendanceViewSet(viewsets.ModelViewSet):
         """Asignar automáticamente el docente que registra."""
         serializer.save(recorded_by=self.request.user)
 
+    @action(detail=False, methods=['post'])
+    def roll_call(self, request):
+        """
+        Registrar la asistencia de todo un curso en una sola operación.
+        Espera: {"course": 1, "date": "2025-03-01",
+                 "statuses": {"12": "ABSENT", "15": "LATE"}}
+
+        Los estudiantes inscritos que no aparecen en `statuses` quedan como
+        PRESENT. Los registros existentes para (estudiante, curso, fecha) se
+        actualizan en la misma sentencia (upsert).
+        """
+        form = BulkAttendanceForm(
+            data={'course': request.data.get('course'), 'date': request.data.get('date')},
+            teacher=request.user,
+        )
+        if not form.is_valid():
+            return Response(form.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        statuses, errors = normalize_roll_call(
+            request.data.get('statuses', {}), Attendance.AttendanceStatus.values)
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        course = form.cleaned_data['course']
+        day = form.cleaned_data['date']
+        roster = list(course.enrollments.filter(
+            is_active=True).values_list('student_id', flat=True))
+        roster_ids = set(roster)
+        errors = [
+            {'student_id': student_id, 'error': 'El estudiante no está inscrito en este curso.'}
+            for student_id in statuses if student_id not in roster_ids
+        ]
+
+        records = [
+            Attendance(
+                student_id=student_id,
+                course=course,
+                date=day,
+                status=statuses.get(student_id, Attendance.AttendanceStatus.PRESENT),
+                recorded_by=request.user,
+            )
+            for student_id in roster
+        ]
+        with transaction.atomic():
+            Attendance.objects.bulk_create(
+                records,
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=['student', 'course', 'date'],
+                update_fields=['status', 'recorded_by', 'updated_at'],
+            )
+            # El upsert no dispara señales: recalcular el resumen mensual
+            refresh_summaries_for(Attendance.objects.filter(course=course, date=day))
+
+        summary = Counter(record.status for record in records)
+        return Response({
+            'course': course.id,
+            'date': day.isoformat(),
+            'recorded_count': len(records),
+            'summary': {value: summary.get(value, 0) for value in Attendance.AttendanceStatus.values},
+            'errors': errors
+        })
+
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         """
         Obtener estadísticas de asistencia.
         Filtros: student_id, course_id
+
+        Sin filtros por estado o fecha se responde desde el resumen mensual
+        (`AttendanceMonthlySummary`) en lugar de recorrer toda la asistencia.
         """
+        if self._can_use_monthly_summary(request.query_params):
+            stats = self._statistics_from_summary(request.query_params)
+        else:
+            stats = self._statistics_from_attendance(request)
+
+        # Calcular tasa de asistencia
+        for stat in stats:
+            total = stat.get('total_count', 0) or 0
+            present = (stat.get('present_count', 0) or 0) + \
+                (stat.get('late_count', 0) or 0)
+            stat['attendance_rate'] = (
+                present / total * 100) if total > 0 else 0
+            # Normalizar month a string ISO para serializar fácilmente
+            month_val = stat.get('month')
+            stat['month'] = month_val.isoformat() if hasattr(
+                month_val, 'isoformat') else str(month_val)
+
+        serializer = AttendanceStatisticsSerializer(stats, many=True)
+        return Response(serializer.data)
+
+    def _can_use_monthly_summary(self, params):
+        """El resumen solo admite filtros por estudiante/curso con ids válidos."""
+        if 'status' in params or 'date' in params:
+            return False
+        return all(
+            params.get(name, '').isdigit()
+            for name in self.SUMMARY_ID_PARAMS if params.get(name)
+        )
+
+    def _statistics_from_summary(self, params):
+        queryset = self._filter_by_role(AttendanceMonthlySummary.objects.all())
+        for name in self.SUMMARY_ID_PARAMS:
+            if params.get(name):
+                field = name if name.endswith('_id') else f'{name}_id'
+                queryset = queryset.filter(**{field: params[name]})
+
+        return list(queryset.values('month').annotate(
+            present_count=Sum('present_count'),
+            absent_count=Sum('absent_count'),
+            late_count=Sum('late_count'),
+            excused_count=Sum('excused_count'),
+        ).annotate(
+            total_count=F('present_count') + F('absent_count') + F('late_count') + F('excused_count')
+        ).filter(total_count__gt=0).order_by('month'))
+
+    def _statistics_from_attendance(self, request):
         queryset = self.filter_queryset(self.get_queryset())
 
         student_id = request.query_params.get('student_id')
@@ -386,8 +791,7 @@ class AttendanceViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(course_id=course_id)
 
         # Estadísticas por mes
-        from django.db.models.functions import TruncMonth
-        stats_qs = queryset.annotate(
+        return list(queryset.annotate(
             month=TruncMonth('date')
         ).values('month').annotate(
             present_count=Count('id', filter=Q(status='PRESENT')),
@@ -395,20 +799,4 @@ class AttendanceViewSet(viewsets.ModelViewSet):
             late_count=Count('id', filter=Q(status='LATE')),
             excused_count=Count('id', filter=Q(status='EXCUSED')),
             total_count=Count('id')
-        ).order_by('month')
-
-        stats = list(stats_qs)
-        # Calcular tasa de asistencia
-        for stat in stats:
-            total = stat.get('total_count', 0) or 0
-            present = (stat.get('present_count', 0) or 0) + \
-                (stat.get('late_count', 0) or 0)
-            stat['attendance_rate'] = (
-                present / total * 100) if total > 0 else 0
-            # Normalizar month a string ISO para serializar fácilmente
-            month_val = stat.get('month')
-            stat['month'] = month_val.isoformat() if hasattr(
-                month_val, 'isoformat') else str(month_val)
-
-        serializer = AttendanceStatisticsSerializer(stats, many=True)
-        return Response(serializer.data)
+        ).order_by('month'))
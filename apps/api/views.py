@@ -4,9 +4,10 @@ Some places import from `apps.api.views`, while the real implementations
 live under `apps.api.v1.viewsets`. This module re-exports the common
 ViewSet classes so both import styles work.
 """
-from apps.api.v1.viewsets import (AttendanceViewSet, CourseEnrollmentViewSet,
-                                  CourseViewSet, GradeViewSet, SubjectViewSet,
-                                  UserViewSet)
+from apps.api.v1.viewsets import (ApiTokenViewSet, AttendanceViewSet,
+                                  CourseEnrollmentViewSet, CourseViewSet,
+                                  GradeViewSet, ReportJobViewSet,
+                                  SubjectViewSet, UserViewSet)
 
 __all__ = [
     'UserViewSet',
@@ -15,4 +16,6 @@ __all__ = [
     'CourseEnrollmentViewSet',
     'GradeViewSet',
     'AttendanceViewSet',
+    'ApiTokenViewSet',
+    'ReportJobViewSet',
 ]
@@ -0,0 +1,235 @@
+"""
+Instrumentación SQL por petición.
+
+`QueryInstrumentationMiddleware` registra, para cada petición, el número de
+consultas, el tiempo total en base de datos, la consulta más lenta y las
+consultas repetidas (misma SQL con distintos parámetros: el patrón típico de
+un N+1). Los datos se publican en la cabecera `Server-Timing` y en un log
+estructurado (logger `estudify.sql`).
+
+Cada vista puede declarar un presupuesto de consultas: `QueryBudgetMixin`
+para vistas DRF (`query_budgets` por acción o método) y el decorador
+`query_budget` para vistas de función. Superarlo registra un warning o, con
+`QUERY_BUDGET_STRICT` (activado en los tests), lanza `QueryBudgetExceeded`.
+
+En las respuestas en streaming (exportaciones CSV, stream SSE) las consultas
+se siguen midiendo mientras se envía el cuerpo, y el log y el presupuesto se
+aplican al terminar de enviarlo. Estas respuestas no llevan `Server-Timing`,
+porque las cabeceras salen antes que el cuerpo y el valor sería engañoso.
+El middleware admite WSGI y ASGI. Bajo ASGI el registro se instala en el
+hilo síncrono de la petición, que es donde se ejecuta el ORM, también el
+de las vistas async.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import FileResponse
+
+logger = logging.getLogger('estudify.sql')
+
+REQUEST_BUDGET_ATTRIBUTE = 'query_budget'
+_WHITESPACE = re.compile(r'\s+')
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Una vista ejecutó más consultas que su presupuesto."""
+
+
+def fingerprint(sql):
+    """Normalizar una sentencia para agrupar las que solo cambian en parámetros."""
+    return _IN_LIST.sub('IN (...)', _WHITESPACE.sub(' ', sql).strip())
+
+
+class QueryRecorder:
+    """`execute_wrapper` que acumula duración y huella de cada sentencia."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest = (0.0, '')
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            if elapsed >= self.slowest[0]:
+                self.slowest = (elapsed, sql)
+            self.fingerprints[fingerprint(sql)] += 1
+
+    def duplicates(self, limit=3):
+        """Las `limit` sentencias más repetidas (huella, veces)."""
+        return [(sql, n) for sql, n in self.fingerprints.most_common(limit) if n > 1]
+
+    def as_dict(self):
+        return {
+            'queries': self.count,
+            'db_ms': round(self.duration * 1000, 2),
+            'slowest_ms': round(self.slowest[0] * 1000, 2),
+            'slowest_sql': self.slowest[1][:500],
+            'duplicates': [
+                {'sql': sql[:200], 'count': n} for sql, n in self.duplicates()
+            ],
+        }
+
+
+def set_query_budget(request, budget):
+    """Asignar el presupuesto de consultas de la petición en curso."""
+    setattr(getattr(request, '_request', request), REQUEST_BUDGET_ATTRIBUTE, budget)
+
+
+def query_budget(budget):
+    """Decorador para vistas de función: máximo de consultas por petición."""
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            set_query_budget(request, budget)
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class QueryBudgetMixin:
+    """
+    Presupuesto de consultas para vistas DRF.
+
+    `query_budgets` admite claves de acción ('list', 'retrieve', acciones
+    propias) o de método HTTP en minúsculas, y 'default' como respaldo.
+    """
+    query_budgets = {}
+
+    def get_query_budget(self, request):
+        for key in (getattr(self, 'action', None), request.method.lower(), 'default'):
+            if key in self.query_budgets:
+                return self.query_budgets[key]
+        return None
+
+    def initial(self, request, *args, **kwargs):
+        budget = self.get_query_budget(request)
+        if budget is not None:
+            set_query_budget(request, budget)
+        super().initial(request, *args, **kwargs)
+
+
+class QueryInstrumentationMiddleware:
+    """Medir las consultas de cada petición y aplicar el presupuesto de la vista."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not getattr(settings, 'SQL_INSTRUMENTATION_ENABLED', True):
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        with self.recording(recorder):
+            response = self.get_response(request)
+        return self.finish(request, response, recorder)
+
+    async def __acall__(self, request):
+        if not getattr(settings, 'SQL_INSTRUMENTATION_ENABLED', True):
+            return await self.get_response(request)
+
+        recorder = QueryRecorder()
+        stack = await sync_to_async(self.recording)(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.finish(request, response, recorder)
+
+    @staticmethod
+    def recording(recorder):
+        """Instalar `recorder` en las conexiones del hilo actual."""
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        return stack
+
+    def finish(self, request, response, recorder):
+        # Un archivo no consulta la base de datos al enviarse
+        if not response.streaming or isinstance(response, FileResponse):
+            self.report(request, response, recorder)
+        elif response.is_async:
+            response.streaming_content = self.measure_async_stream(
+                request, response, recorder, response.streaming_content)
+        else:
+            response.streaming_content = self.measure_stream(
+                request, response, recorder, response.streaming_content)
+        return response
+
+    def measure_stream(self, request, response, recorder, content):
+        try:
+            with self.recording(recorder):
+                yield from content
+        finally:
+            self.report(request, response, recorder)
+
+    async def measure_async_stream(self, request, response, recorder, content):
+        # El ORM async corre en el hilo síncrono de la petición: registrar allí
+        stack = await sync_to_async(self.recording)(recorder)
+        try:
+            async for chunk in content:
+                yield chunk
+        finally:
+            await sync_to_async(stack.close)()
+            self.report(request, response, recorder)
+
+    def report(self, request, response, recorder):
+        stats = recorder.as_dict()
+        if not response.streaming or isinstance(response, FileResponse):
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={stats["db_ms"]};desc="{stats["queries"]} queries"',
+                f'db-slowest;dur={stats["slowest_ms"]}',
+            ])
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else ''
+        budget = getattr(request, REQUEST_BUDGET_ATTRIBUTE, None)
+        logger.info(
+            'sql view=%s path=%s queries=%s db_ms=%s duplicates=%s',
+            view_name, request.path, stats['queries'], stats['db_ms'],
+            sum(item['count'] for item in stats['duplicates']),
+            extra={'sql_stats': {**stats, 'view': view_name, 'method': request.method,
+                                 'path': request.path, 'budget': budget}},
+        )
+
+        if budget is not None and recorder.count > budget:
+            message = (
+                f'{view_name or request.path}: {recorder.count} consultas '
+                f'(presupuesto {budget}). Repetidas: {stats["duplicates"]}'
+            )
+            if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning('sql budget exceeded %s', message)
+
+
+__all__ = [
+    'QueryBudgetExceeded',
+    'QueryBudgetMixin',
+    'QueryInstrumentationMiddleware',
+    'QueryRecorder',
+    'fingerprint',
+    'query_budget',
+    'set_query_budget',
+]
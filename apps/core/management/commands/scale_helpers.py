@@ -0,0 +1,226 @@
+"""Generación de un conjunto de datos sintético a gran escala (`seed_initial_data --scale`).
+
+Todo se inserta con `bulk_create` por bloques y con un único hash de
+contraseña precalculado, así el coste crece con el número de filas y no con
+el número de consultas. Con la misma semilla se generan los mismos datos.
+"""
+import math
+import random
+from datetime import date, time, timedelta
+from decimal import Decimal
+from itertools import islice
+from typing import Dict, Iterable, List
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from apps.academics.cache import invalidate_grade_stats
+from apps.academics.models import Attendance, Grade
+from apps.academics.summaries import refresh_attendance_summaries
+from apps.courses.models import (Classroom, Course, CourseEnrollment,
+                                 CourseSession, Subject, TimeSlot)
+from apps.users.models import Profile
+
+User = get_user_model()
+
+USERNAME_PREFIX = 'scale_'
+COURSE_CODE_PREFIX = 'SC'
+GRADE_TYPES = ['QUIZ', 'EXAM', 'HOMEWORK', 'PROJECT', 'PARTICIPATION']
+# Distribución de estados de asistencia (aprox. la de un curso real)
+ATTENDANCE_WEIGHTS = [
+    (Attendance.AttendanceStatus.PRESENT, 85),
+    (Attendance.AttendanceStatus.LATE, 7),
+    (Attendance.AttendanceStatus.ABSENT, 6),
+    (Attendance.AttendanceStatus.EXCUSED, 2),
+]
+SLOT_STARTS = [time(7, 0), time(9, 0), time(11, 0), time(14, 0), time(16, 0)]
+# Último día de asistencia: fijo (no `date.today()`) para que la misma
+# semilla genere el mismo conjunto cualquier día que se ejecute
+ATTENDANCE_END = date(2025, 5, 30)
+
+
+def chunked(iterable: Iterable, size: int):
+    """Agrupar `iterable` en listas de hasta `size` elementos."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def bulk_insert(model, objects: Iterable, chunk_size: int, on_chunk=None) -> int:
+    """Insertar `objects` en bloques de `chunk_size`, una transacción por bloque."""
+    total = 0
+    for chunk in chunked(objects, chunk_size):
+        with transaction.atomic():
+            model.objects.bulk_create(chunk, batch_size=chunk_size)
+        total += len(chunk)
+        if on_chunk:
+            on_chunk(model, total)
+    return total
+
+
+def school_days(count: int, end: date) -> List[date]:
+    """Los últimos `count` días hábiles (lunes a viernes) hasta `end`."""
+    days = []
+    day = end
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day)
+        day -= timedelta(days=1)
+    return days
+
+
+def scale_data_exists() -> bool:
+    return User.objects.filter(username__startswith=USERNAME_PREFIX).exists()
+
+
+def seed_scale_dataset(
+    students: int,
+    *,
+    seed: int = 42,
+    chunk_size: int = 5000,
+    courses_per_student: int = 4,
+    course_size: int = 30,
+    subjects_per_course: int = 2,
+    grades_per_subject: int = 12,
+    attendance_days: int = 20,
+    attendance_end: date = ATTENDANCE_END,
+    password: str = 'scalepass',
+    on_chunk=None,
+) -> Dict[str, int]:
+    """Crear `students` estudiantes con cursos, sesiones, inscripciones, notas y asistencia.
+
+    Devuelve el número de filas creadas por modelo.
+    """
+    rng = random.Random(seed)
+    counts = {}
+    password_hash = make_password(password)
+
+    course_count = max(1, math.ceil(students * courses_per_student / course_size))
+    teacher_count = max(1, math.ceil(course_count / 3))
+    per_student = min(courses_per_student, course_count)
+
+    # Usuarios: un solo hash PBKDF2 para todos. Los docentes no son staff:
+    # con is_staff verían todo como administradores y no su propio ámbito
+    teachers = [
+        User(username=f'{USERNAME_PREFIX}t{i}', email=f'{USERNAME_PREFIX}t{i}@example.com',
+             first_name='Docente', last_name=f'{i}', role=User.UserRole.TEACHER,
+             password=password_hash)
+        for i in range(1, teacher_count + 1)
+    ]
+    student_users = [
+        User(username=f'{USERNAME_PREFIX}s{i}', email=f'{USERNAME_PREFIX}s{i}@example.com',
+             first_name='Estudiante', last_name=f'{i}', role=User.UserRole.STUDENT,
+             password=password_hash)
+        for i in range(1, students + 1)
+    ]
+    counts['users'] = bulk_insert(User, teachers + student_users, chunk_size, on_chunk)
+    # bulk_create no dispara la señal que crea el perfil
+    counts['profiles'] = bulk_insert(
+        Profile, (Profile(user_id=user.pk) for user in teachers + student_users),
+        chunk_size, on_chunk)
+
+    courses = [
+        Course(name=f'Curso {i}', code=f'{COURSE_CODE_PREFIX}{i:05d}', academic_year=2025,
+               semester=1 + i % 2, teacher=teachers[i % teacher_count],
+               max_students=course_size + 5)
+        for i in range(course_count)
+    ]
+    counts['courses'] = bulk_insert(Course, courses, chunk_size, on_chunk)
+
+    # Sesiones: dos por curso sobre una rejilla fija de franjas
+    timeslots = [
+        TimeSlot.objects.get_or_create(
+            day_of_week=day, start_time=start,
+            end_time=time(start.hour + 2, start.minute))[0]
+        for day in range(5) for start in SLOT_STARTS
+    ]
+    classrooms = [
+        Classroom(name=f'Aula {USERNAME_PREFIX}{i}', location='Sede sintética', capacity=course_size + 10)
+        for i in range(max(1, math.ceil(course_count / 10)))
+    ]
+    bulk_insert(Classroom, classrooms, chunk_size)
+    counts['sessions'] = bulk_insert(CourseSession, (
+        CourseSession(course=course, timeslot=rng.choice(timeslots),
+                      classroom_fk=rng.choice(classrooms), recurrence='weekly')
+        for course in courses for _ in range(2)
+    ), chunk_size, on_chunk)
+
+    subjects_by_course = {
+        course.pk: [
+            Subject(name=f'{course.name} - Materia {j}', code=f'{course.code}-S{j}',
+                    credits=2 + j % 3, course=course, teacher=course.teacher)
+            for j in range(1, subjects_per_course + 1)
+        ]
+        for course in courses
+    }
+    counts['subjects'] = bulk_insert(
+        Subject, (s for subjects in subjects_by_course.values() for s in subjects),
+        chunk_size, on_chunk)
+
+    # Inscripciones repartidas de forma uniforme: cada curso recibe ~course_size
+    stride = max(1, course_count // per_student)
+    roster = {course.pk: [] for course in courses}
+    for index, student in enumerate(student_users):
+        for j in range(per_student):
+            roster[courses[(index + j * stride) % course_count].pk].append(student.pk)
+    counts['enrollments'] = bulk_insert(CourseEnrollment, (
+        CourseEnrollment(student_id=student_id, course_id=course_id)
+        for course_id, student_ids in roster.items() for student_id in student_ids
+    ), chunk_size, on_chunk)
+
+    teacher_by_course = {course.pk: course.teacher_id for course in courses}
+    counts['grades'] = bulk_insert(Grade, _grade_rows(
+        rng, roster, subjects_by_course, teacher_by_course, grades_per_subject,
+    ), chunk_size, on_chunk)
+    counts['attendance'] = bulk_insert(Attendance, _attendance_rows(
+        rng, roster, teacher_by_course, school_days(attendance_days, attendance_end),
+    ), chunk_size, on_chunk)
+
+    # bulk_create no dispara señales: reconstruir resúmenes e invalidar la caché
+    courses_per_chunk = max(1, chunk_size // max(1, course_size * attendance_days))
+    counts['attendance_summaries'] = _refresh_summaries(roster, courses_per_chunk)
+    invalidate_grade_stats()
+    return counts
+
+
+def _grade_rows(rng, roster, subjects_by_course, teacher_by_course, grades_per_subject):
+    for course_id, student_ids in roster.items():
+        for subject in subjects_by_course[course_id]:
+            for student_id in student_ids:
+                for _ in range(grades_per_subject):
+                    yield Grade(
+                        student_id=student_id, subject_id=subject.pk,
+                        value=Decimal(rng.randint(10, 50)) / 10,
+                        grade_type=rng.choice(GRADE_TYPES),
+                        weight=Decimal('100.00'),
+                        graded_by_id=teacher_by_course[course_id],
+                    )
+
+
+def _attendance_rows(rng, roster, teacher_by_course, days):
+    statuses = [status for status, _ in ATTENDANCE_WEIGHTS]
+    weights = [weight for _, weight in ATTENDANCE_WEIGHTS]
+    for course_id, student_ids in roster.items():
+        for day in days:
+            picked = rng.choices(statuses, weights, k=len(student_ids))
+            for student_id, status in zip(student_ids, picked):
+                yield Attendance(
+                    student_id=student_id, course_id=course_id, date=day,
+                    status=status, recorded_by_id=teacher_by_course[course_id],
+                )
+
+
+def _refresh_summaries(roster, courses_per_chunk):
+    written = 0
+    for chunk in chunked(roster, courses_per_chunk):
+        with transaction.atomic():
+            written += refresh_attendance_summaries(
+                Attendance.objects.filter(course_id__in=chunk))
+    return written
+
+
+__all__ = ['bulk_insert', 'chunked', 'scale_data_exists', 'school_days', 'seed_scale_dataset']
@@ -1,4 +1,6 @@
-from django.core.management.base import BaseCommand
+import time as timer
+
+from django.core.management.base import BaseCommand, CommandError
 
 from .command_helpers import (
     create_superuser_if_missing,
@@ -13,6 +15,10 @@ from apps.core.management.commands.command_helpers import (
     create_grades_for_subjects,
     create_attendance_for_course,
 )
+from apps.core.management.commands.scale_helpers import (
+    scale_data_exists,
+    seed_scale_dataset,
+)
 from datetime import time
 
 
@@ -26,8 +32,50 @@ class Command(BaseCommand):
             default='auto',
             help='Choose preset data: "auto" (default) or "curated" (more detailed dataset)'
         )
+        parser.add_argument(
+            '--scale',
+            type=int,
+            metavar='STUDENTS',
+            help='Generate a large synthetic dataset with this many students using bulk inserts'
+        )
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for --scale (deterministic data)')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Rows per bulk insert for --scale')
+        parser.add_argument('--grades-per-subject', type=int, default=12, help='Grades per student and subject for --scale')
+        parser.add_argument('--attendance-days', type=int, default=20, help='School days of attendance for --scale')
+
+    def handle_scale(self, options):
+        """Build the --scale dataset and report rows and throughput per model."""
+        if options['scale'] < 1:
+            raise CommandError('--scale must be a positive number of students')
+        if scale_data_exists():
+            raise CommandError('Scale data already exists (users prefixed "scale_"); use a fresh database.')
+
+        started = timer.monotonic()
+
+        def report(model, total):
+            self.stdout.write(f'  {model.__name__}: {total} rows ({timer.monotonic() - started:.1f}s)')
+
+        counts = seed_scale_dataset(
+            options['scale'],
+            seed=options['seed'],
+            chunk_size=options['chunk_size'],
+            grades_per_subject=options['grades_per_subject'],
+            attendance_days=options['attendance_days'],
+            password=env_or_default('SEED_SCALE_PASSWORD', 'scalepass'),
+            on_chunk=report,
+        )
+        elapsed = timer.monotonic() - started
+        rows = sum(counts.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Scale seed completed: {rows} rows in {elapsed:.1f}s ({rows / max(elapsed, 1e-6):.0f} rows/s)'))
+        for name, count in counts.items():
+            self.stdout.write(f'  {name}: {count}')
 
     def handle(self, *args, **options):  # noqa: C901 - command builds many demo objects
+        if options.get('scale') is not None:
+            self.handle_scale(options)
+            return
+
         created = []
 
         # Admin (prefer environment variables)
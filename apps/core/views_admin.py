@@ -9,6 +9,7 @@ from django.core.paginator import Paginator
 from django.db.models import Count, Q
 from django.shortcuts import get_object_or_404, redirect, render
 
+from apps.core.instrumentation import query_budget
 from apps.courses.forms import CourseEnrollmentForm, CourseForm, SubjectForm
 from apps.courses.models import Course, CourseEnrollment, Subject
 from apps.users.forms import UserRegistrationForm
@@ -20,6 +21,7 @@ def is_admin(user):
     return user.is_authenticated and (user.is_staff or user.is_admin_role)
 
 
+@query_budget(12)
 @login_required
 @user_passes_test(is_admin)
 def admin_dashboard(request):
@@ -42,6 +44,7 @@ def admin_dashboard(request):
 
 # ==================== GESTIÓN DE USUARIOS ====================
 
+@query_budget(8)
 @login_required
 @user_passes_test(is_admin)
 def user_list(request):
@@ -79,6 +82,7 @@ def user_list(request):
     return render(request, 'admin_panel/user_list.html', context)
 
 
+@query_budget(15)
 @login_required
 @user_passes_test(is_admin)
 def user_create(request):
@@ -100,6 +104,7 @@ def user_create(request):
                   {'form': form, 'action': 'Crear'})
 
 
+@query_budget(15)
 @login_required
 @user_passes_test(is_admin)
 def user_edit(request, pk):
@@ -123,6 +128,7 @@ def user_edit(request, pk):
     return render(request, 'admin_panel/user_edit.html', {'user_obj': user})
 
 
+@query_budget(15)
 @login_required
 @user_passes_test(is_admin)
 def user_delete(request, pk):
@@ -142,6 +148,7 @@ def user_delete(request, pk):
 
 # ==================== GESTIÓN DE CURSOS ====================
 
+@query_budget(10)
 @login_required
 @user_passes_test(is_admin)
 def course_list(request):
@@ -180,6 +187,7 @@ def course_list(request):
     return render(request, 'admin_panel/course_list.html', context)
 
 
+@query_budget(15)
 @login_required
 @user_passes_test(is_admin)
 def course_create(request):
@@ -199,6 +207,7 @@ def course_create(request):
                   {'form': form, 'action': 'Crear'})
 
 
+@query_budget(15)
 @login_required
 @user_passes_test(is_admin)
 def course_edit(request, pk):
@@ -220,6 +229,7 @@ def course_edit(request, pk):
                   {'form': form, 'action': 'Editar', 'course': course})
 
 
+@query_budget(15)
 @login_required
 @user_passes_test(is_admin)
 def course_delete(request, pk):
@@ -237,6 +247,7 @@ def course_delete(request, pk):
                   {'course': course})
 
 
+@query_budget(8)
 @login_required
 @user_passes_test(is_admin)
 def course_detail(request, pk):
@@ -256,6 +267,7 @@ def course_detail(request, pk):
 
 # ==================== GESTIÓN DE MATERIAS ====================
 
+@query_budget(10)
 @login_required
 @user_passes_test(is_admin)
 def subject_list(request):
@@ -291,6 +303,7 @@ def subject_list(request):
     return render(request, 'admin_panel/subject_list.html', context)
 
 
+@query_budget(15)
 @login_required
 @user_passes_test(is_admin)
 def subject_create(request):
@@ -310,6 +323,7 @@ def subject_create(request):
                   {'form': form, 'action': 'Crear'})
 
 
+@query_budget(15)
 @login_required
 @user_passes_test(is_admin)
 def subject_edit(request, pk):
@@ -331,6 +345,7 @@ def subject_edit(request, pk):
                   {'form': form, 'action': 'Editar', 'subject': subject})
 
 
+@query_budget(15)
 @login_required
 @user_passes_test(is_admin)
 def subject_delete(request, pk):
@@ -350,6 +365,7 @@ def subject_delete(request, pk):
 
 # ==================== GESTIÓN DE INSCRIPCIONES ====================
 
+@query_budget(10)
 @login_required
 @user_passes_test(is_admin)
 def enrollment_list(request):
@@ -380,6 +396,7 @@ def enrollment_list(request):
     return render(request, 'admin_panel/enrollment_list.html', context)
 
 
+@query_budget(15)
 @login_required
 @user_passes_test(is_admin)
 def enrollment_create(request):
@@ -397,6 +414,7 @@ def enrollment_create(request):
                   {'form': form, 'action': 'Crear'})
 
 
+@query_budget(15)
 @login_required
 @user_passes_test(is_admin)
 def enrollment_delete(request, pk):
@@ -35,6 +35,11 @@ class Course(AbstractBaseModel):
 
     @property
     def enrolled_count(self):
+        # Los listados de la API anotan `active_enrollments` para evitar un
+        # COUNT por fila; si no está presente se consulta la base de datos.
+        annotated = getattr(self, 'active_enrollments', None)
+        if annotated is not None:
+            return annotated
         return self.enrollments.filter(is_active=True).count()
 
     @property
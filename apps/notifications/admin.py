@@ -1,11 +1,24 @@
 from django.contrib import admin
-from .models import Notification
+from .models import ArchivedNotification, Notification
 
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
     list_display = ('user', 'title', 'is_read', 'created_at')
-    list_filter = ('is_read', 'notification_type')
+    list_filter = ('is_read', 'notification_type', 'email_pending')
     search_fields = ('user__username', 'title', 'message')
 
+
+@admin.register(ArchivedNotification)
+class ArchivedNotificationAdmin(admin.ModelAdmin):
+    list_display = ('original_id', 'user_id', 'title', 'notified_at', 'created_at')
+    list_filter = ('notification_type',)
+    search_fields = ('title', 'message')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
 # Register your models here.
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class NotificationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.notifications'
+
+    def ready(self):
+        # Importar signals para registrarlos cuando la app esté lista
+        import apps.notifications.signals  # noqa: F401
@@ -0,0 +1,72 @@
+"""
+Agrupación de notificaciones de calificaciones por transacción.
+
+Las calificaciones creadas dentro de una transacción se acumulan en un buffer
+de la conexión y se encolan al confirmar (`transaction.on_commit`), agrupadas
+por estudiante: publicar 40 notas para 30 estudiantes genera una sola tarea
+(o unas pocas, en bloques de `STUDENTS_PER_TASK`) en lugar de 1.200. Si la
+transacción se revierte, el buffer se descarta sin encolar nada.
+"""
+import logging
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+logger = logging.getLogger(__name__)
+
+# Estudiantes por tarea; los correos de una tarea comparten conexión SMTP
+STUDENTS_PER_TASK = 200
+
+_BUFFER_ATTR = '_grade_notification_buffer'
+
+
+def _flush(connection, buffer):
+    if getattr(connection, _BUFFER_ATTR, None) is buffer:
+        delattr(connection, _BUFFER_ATTR)
+    if not buffer:
+        return
+    from apps.notifications.tasks import send_grade_notifications
+
+    students = sorted(buffer)
+    for start in range(0, len(students), STUDENTS_PER_TASK):
+        grade_ids = [grade_id for student_id in students[start:start + STUDENTS_PER_TASK]
+                     for grade_id in buffer[student_id]]
+        try:
+            send_grade_notifications.delay(grade_ids)
+        except Exception:
+            # Si no hay Celery o falla, continuar sin interrumpir
+            logger.exception('No se pudieron encolar las notificaciones de %s calificaciones', len(grade_ids))
+
+
+def _live_buffer(connection):
+    """Buffer {student_id: [grade_id, ...]} de la transacción en curso, si lo hay."""
+    buffer = getattr(connection, _BUFFER_ATTR, None)
+    # Tras un rollback Django descarta el callback y el buffer queda huérfano
+    if buffer is not None and any(
+            getattr(func, 'grade_notification_buffer', None) is buffer
+            for _, func, _ in connection.run_on_commit):
+        return buffer
+    return None
+
+
+def queue_grade_notifications(grades, using=DEFAULT_DB_ALIAS):
+    """Notificar las calificaciones `grades` cuando la transacción se confirme.
+
+    Fuera de una transacción se encolan de inmediato (como `on_commit`).
+    """
+    connection = transaction.get_connection(using)
+    buffer = _live_buffer(connection)
+    registered = buffer is not None
+    if not registered:
+        buffer = {}
+    for grade in grades:
+        buffer.setdefault(grade.student_id, []).append(grade.id)
+    if not registered and buffer:
+        setattr(connection, _BUFFER_ATTR, buffer)
+
+        def flush():
+            _flush(connection, buffer)
+        flush.grade_notification_buffer = buffer
+        transaction.on_commit(flush, using=using)
+
+
+__all__ = ['STUDENTS_PER_TASK', 'queue_grade_notifications']
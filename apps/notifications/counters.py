@@ -0,0 +1,89 @@
+"""
+Contador de notificaciones sin leer por usuario, en caché.
+
+El badge del frontend consulta `unread_count` con frecuencia; con el contador
+en caché un acierto no toca la base de datos. El contador se ajusta cuando
+se crean notificaciones (tareas de `apps.notifications.tasks`, tras el
+commit) y cuando se marcan como leídas. Si la clave no está en caché no se
+ajusta: la siguiente lectura la recalcula con un COUNT. Cualquier desvío
+(carreras entre el COUNT y un ajuste, escrituras que no pasan por aquí) se
+corrige con `reconcile_unread_counts`, programada en Celery beat, y con la
+expiración de la clave.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.notifications.models import Notification
+
+KEY_PREFIX = 'notifications:unread'
+
+
+def _key(user_id):
+    return f'{KEY_PREFIX}:{user_id}'
+
+
+def _timeout():
+    return getattr(settings, 'NOTIFICATION_UNREAD_CACHE_TIMEOUT', 86400)
+
+
+def unread_count(user_id):
+    """Notificaciones sin leer de `user_id`: de la caché o con un COUNT."""
+    count = cache.get(_key(user_id))
+    if count is None:
+        count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+        cache.add(_key(user_id), count, timeout=_timeout())
+    return count
+
+
+def increment_unread(counts):
+    """Sumar {user_id: nuevas} a los contadores que estén en caché."""
+    for user_id, amount in counts.items():
+        try:
+            cache.incr(_key(user_id), amount)
+        except ValueError:
+            pass  # sin contador: se calculará en la próxima lectura
+
+
+def decrement_unread(user_id, amount=1):
+    try:
+        if cache.decr(_key(user_id), amount) < 0:
+            cache.delete(_key(user_id))
+    except ValueError:
+        pass
+
+
+def reset_unread(user_id):
+    cache.set(_key(user_id), 0, timeout=_timeout())
+
+
+def reconcile_unread_counts(since=None):
+    """Recalcular los contadores de los usuarios con notificaciones recientes.
+
+    Solo pueden estar desviados los contadores de usuarios cuyas
+    notificaciones cambiaron desde `since`: dos consultas en total.
+    """
+    since = since or timezone.now() - timedelta(seconds=2 * getattr(
+        settings, 'NOTIFICATION_UNREAD_RECONCILE_INTERVAL', 900))
+    user_ids = set(Notification.objects.filter(updated_at__gte=since).values_list('user_id', flat=True))
+    if not user_ids:
+        return 0
+    counts = dict.fromkeys(user_ids, 0)
+    counts.update(
+        Notification.objects.filter(user_id__in=user_ids, is_read=False)
+        .values_list('user_id').annotate(unread=Count('id')).order_by()
+    )
+    cache.set_many({_key(user_id): count for user_id, count in counts.items()}, timeout=_timeout())
+    return len(counts)
+
+
+__all__ = [
+    'decrement_unread',
+    'increment_unread',
+    'reconcile_unread_counts',
+    'reset_unread',
+    'unread_count',
+]
@@ -0,0 +1,59 @@
+"""Borra o archiva las notificaciones leídas más antiguas que la retención.
+
+Procesa rangos de clave primaria en transacciones cortas con una pausa entre
+ellos (ver `apps.notifications.retention`) e informa filas por segundo.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.notifications.retention import purge_notifications, retention_setting
+
+
+class Command(BaseCommand):
+    help = 'Borra o archiva las notificaciones leídas más antiguas que la retención configurada.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help='Antigüedad mínima en días (default: NOTIFICATION_RETENTION_DAYS)'
+        )
+        mode = parser.add_mutually_exclusive_group()
+        mode.add_argument('--archive', dest='archive', action='store_true', default=None,
+                          help='Copiar a ArchivedNotification antes de borrar')
+        mode.add_argument('--delete', dest='archive', action='store_false',
+                          help='Borrar sin archivar')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=None,
+            help='Filas por rango/transacción (default: NOTIFICATION_RETENTION_CHUNK_SIZE)'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=None,
+            help='Segundos de pausa entre rangos (default: NOTIFICATION_RETENTION_SLEEP)'
+        )
+
+    def handle(self, *args, **options):
+        days = options['days'] if options['days'] is not None else retention_setting('DAYS', 180)
+        if days < 0:
+            raise CommandError('--days no puede ser negativo.')
+        if options['chunk_size'] is not None and options['chunk_size'] < 1:
+            raise CommandError('--chunk-size debe ser mayor que cero.')
+
+        def progress(stats):
+            if options['verbosity'] >= 2:
+                self.stdout.write(
+                    f'  rango {stats["chunks"]}: {stats["processed"]} filas '
+                    f'({stats["rows_per_second"]:.0f}/s)')
+
+        stats = purge_notifications(
+            days=days, archive=options['archive'], chunk_size=options['chunk_size'],
+            sleep=options['sleep'], progress=progress,
+        )
+        action = 'archivadas' if 'archived' in stats else 'eliminadas'
+        self.stdout.write(self.style.SUCCESS(
+            f'{stats["processed"]} notificaciones {action} en {stats["chunks"]} rangos '
+            f'({stats["seconds"]:.1f}s, {stats["rows_per_second"]:.0f} filas/s)'))
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('notifications', '0004_add_keyset_pagination_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='email_pending',
+            field=models.BooleanField(default=False, verbose_name='Email pending'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('email_pending', True)), fields=['user', 'id'], name='notif_email_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:24
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicates(apps, schema_editor):
+    """Conservar la primera notificación de cada (usuario, tipo, objeto) repetido."""
+    Notification = apps.get_model('notifications', 'Notification')
+    duplicated = Notification.objects.filter(object_id__isnull=False).order_by().values(
+        'user_id', 'notification_type', 'object_id'
+    ).annotate(first_id=Min('id'), total=models.Count('id')).filter(total__gt=1)
+    for row in duplicated.iterator():
+        Notification.objects.filter(
+            user_id=row['user_id'], notification_type=row['notification_type'], object_id=row['object_id'],
+        ).exclude(id=row['first_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('notifications', '0005_notification_email_pending'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['user'], name='notif_user_unread_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(fields=('user', 'notification_type', 'object_id'), name='notif_unique_user_type_object'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0006_notification_unread_index_unique_object'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Fecha y hora de creación del registro', verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Fecha y hora de última actualización', verbose_name='Fecha de actualización')),
+                ('is_active', models.BooleanField(default=True, help_text='Indica si el registro está activo', verbose_name='Activo')),
+                ('original_id', models.BigIntegerField(unique=True, verbose_name='Original id')),
+                ('user_id', models.BigIntegerField(db_index=True, verbose_name='User id')),
+                ('title', models.CharField(max_length=255, verbose_name='Title')),
+                ('message', models.TextField(verbose_name='Message')),
+                ('notification_type', models.CharField(blank=True, default='generic', max_length=50, verbose_name='Type')),
+                ('content_type_id', models.IntegerField(blank=True, null=True)),
+                ('object_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('target_url', models.CharField(blank=True, default=None, max_length=512, null=True, verbose_name='Target URL')),
+                ('notified_at', models.DateTimeField(verbose_name='Notified at')),
+                ('read_at', models.DateTimeField(blank=True, null=True, verbose_name='Read at')),
+            ],
+            options={
+                'verbose_name': 'Archived notification',
+                'verbose_name_plural': 'Archived notifications',
+            },
+        ),
+    ]
@@ -39,9 +39,57 @@ class Notification(AbstractBaseModel):
         "Target URL", max_length=512, null=True, blank=True, default=None
     )
 
+    # Waiting for the user's next email digest (see Profile.notification_delivery)
+    email_pending = models.BooleanField(_("Email pending"), default=False)
+
     class Meta:
         verbose_name = _("Notification")
         verbose_name_plural = _("Notifications")
+        indexes = [
+            # Listado por usuario ordenado por fecha; id desempata el cursor
+            models.Index(fields=["user", "-created_at", "-id"], name="notif_user_created_id_idx"),
+            # Unread badge and mark-all-read: only unread rows are indexed
+            # (partial index, supported by both Postgres and SQLite)
+            models.Index(fields=["user"], name="notif_user_unread_idx",
+                         condition=models.Q(is_read=False)),
+            # Only the few rows waiting for a digest are indexed
+            models.Index(fields=["user", "id"], name="notif_email_pending_idx",
+                         condition=models.Q(email_pending=True)),
+        ]
+        constraints = [
+            # One notification per user and linked object; rows without
+            # object_id (NULL) are never considered duplicates
+            models.UniqueConstraint(
+                fields=["user", "notification_type", "object_id"],
+                name="notif_unique_user_type_object",
+            ),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover - trivial
         return f"Notification for {self.user}: {self.title}"
+
+
+class ArchivedNotification(AbstractBaseModel):
+    """Read notification moved out of the live table by the retention job.
+
+    Keeps plain ids instead of foreign keys so archiving never touches (or
+    locks) the user and content type tables; `created_at` is the archive
+    time and `notified_at` the original creation time.
+    """
+    original_id = models.BigIntegerField(_("Original id"), unique=True)
+    user_id = models.BigIntegerField(_("User id"), db_index=True)
+    title = models.CharField(_("Title"), max_length=255)
+    message = models.TextField(_("Message"))
+    notification_type = models.CharField(_("Type"), max_length=50, blank=True, default="generic")
+    content_type_id = models.IntegerField(null=True, blank=True)
+    object_id = models.PositiveIntegerField(null=True, blank=True)
+    target_url = models.CharField("Target URL", max_length=512, null=True, blank=True, default=None)
+    notified_at = models.DateTimeField(_("Notified at"))
+    read_at = models.DateTimeField(_("Read at"), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("Archived notification")
+        verbose_name_plural = _("Archived notifications")
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"Archived notification {self.original_id} for user {self.user_id}"
@@ -0,0 +1,96 @@
+"""
+Retención de notificaciones: borrado o archivo de las leídas antiguas.
+
+Se recorre la tabla por rangos de clave primaria de a lo sumo `chunk_size`
+filas. Cada rango se borra (o se copia a `ArchivedNotification` y se borra)
+en su propia transacción corta, con una pausa entre rangos para no
+acaparar la base de datos mientras hay tráfico. Las notificaciones sin leer
+o pendientes de resumen por correo nunca se tocan.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.notifications.models import ArchivedNotification, Notification
+
+ARCHIVE_FIELDS = (
+    'id', 'user_id', 'title', 'message', 'notification_type', 'content_type_id',
+    'object_id', 'target_url', 'created_at', 'read_at',
+)
+
+
+def retention_setting(name, default):
+    return getattr(settings, f'NOTIFICATION_RETENTION_{name}', default)
+
+
+def expired_notifications(days):
+    """Notificaciones leídas creadas hace más de `days` días."""
+    cutoff = timezone.now() - timedelta(days=days)
+    return Notification.objects.filter(is_read=True, email_pending=False, created_at__lt=cutoff)
+
+
+def _archive(chunk):
+    ArchivedNotification.objects.bulk_create(
+        [
+            ArchivedNotification(
+                original_id=row['id'], user_id=row['user_id'], title=row['title'],
+                message=row['message'], notification_type=row['notification_type'],
+                content_type_id=row['content_type_id'], object_id=row['object_id'],
+                target_url=row['target_url'], notified_at=row['created_at'], read_at=row['read_at'],
+            )
+            for row in chunk.values(*ARCHIVE_FIELDS)
+        ],
+        # Un rango ya archivado en una ejecución interrumpida no falla
+        ignore_conflicts=True,
+    )
+
+
+def purge_notifications(days=None, archive=None, chunk_size=None, sleep=None, progress=None):
+    """Borrar (o archivar) las notificaciones leídas más antiguas que `days`.
+
+    Los valores omitidos se leen de `NOTIFICATION_RETENTION_*`. `progress`,
+    si se indica, recibe las estadísticas acumuladas tras cada rango.
+    Devuelve un dict con filas procesadas, rangos, segundos y filas/s.
+    """
+    days = retention_setting('DAYS', 180) if days is None else days
+    archive = retention_setting('ARCHIVE', False) if archive is None else archive
+    chunk_size = chunk_size or retention_setting('CHUNK_SIZE', 1000)
+    sleep = retention_setting('SLEEP', 0.05) if sleep is None else sleep
+
+    expired = expired_notifications(days)
+    stats = {'archived' if archive else 'deleted': 0, 'processed': 0, 'chunks': 0,
+             'seconds': 0.0, 'rows_per_second': 0.0}
+    started = time.monotonic()
+    last_id = 0
+    while True:
+        ids = list(expired.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:chunk_size])
+        if not ids:
+            break
+        chunk = expired.filter(id__gte=ids[0], id__lte=ids[-1])
+        with transaction.atomic():
+            if archive:
+                _archive(chunk)
+            deleted, _ = chunk.delete()
+        last_id = ids[-1]
+
+        stats['processed'] += deleted
+        stats['archived' if archive else 'deleted'] += deleted
+        stats['chunks'] += 1
+        stats['seconds'] = time.monotonic() - started
+        stats['rows_per_second'] = stats['processed'] / stats['seconds'] if stats['seconds'] else 0.0
+        if progress is not None:
+            progress(stats)
+        if len(ids) < chunk_size:
+            break
+        if sleep:
+            time.sleep(sleep)
+
+    stats['seconds'] = time.monotonic() - started
+    stats['rows_per_second'] = stats['processed'] / stats['seconds'] if stats['seconds'] else 0.0
+    return stats
+
+
+__all__ = ['expired_notifications', 'purge_notifications']
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from apps.notifications.models import Notification
+from apps.users.models import Profile
 
 
 class NotificationSerializer(serializers.ModelSerializer):
@@ -17,3 +18,9 @@ class NotificationSerializer(serializers.ModelSerializer):
             'created_at',
         )
         read_only_fields = ('id', 'user', 'created_at')
+
+
+class NotificationPreferenceSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Profile
+        fields = ('notification_delivery',)
@@ -0,0 +1,18 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.notifications.models import Notification
+
+
+@receiver(post_save, sender=Notification)
+def publish_created_notification(sender, instance, created, raw=False, **kwargs):
+    """Avisar a los streams SSE del usuario al confirmar una notificación nueva.
+
+    Cubre cualquier `Notification.objects.create`; los `bulk_create` no emiten
+    señales y publican por su cuenta (`apps.notifications.tasks`).
+    """
+    if created and not raw:
+        from apps.notifications.streams import publish_notifications
+
+        transaction.on_commit(lambda: publish_notifications([instance.user_id]))
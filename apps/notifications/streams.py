@@ -0,0 +1,254 @@
+"""
+Notificaciones en vivo por Server-Sent Events.
+
+Cada cliente abierto en `/api/notifications/stream/` mantiene una conexión
+ASGI ligera: una corrutina que duerme hasta recibir un aviso del broker y
+entonces lee de la base de datos las notificaciones con id mayor que la
+última enviada. El aviso no lleva la fila (los `bulk_create` con
+`ignore_conflicts` no devuelven ids), solo despierta al usuario. Publican la
+señal post_save de `Notification` y, para los `bulk_create`, las tareas. La lectura
+por id es la misma que atiende `Last-Event-ID` al reconectar, así que no se
+pierde nada entre una conexión y la siguiente.
+
+Brokers:
+- `LocalBroker`: en memoria del proceso. Los avisos solo llegan si las
+  notificaciones se crean en el mismo proceso que atiende los streams (y en
+  los tests). Las creadas por los workers de Celery se entregan igualmente,
+  pero al releer en cada heartbeat, no al instante.
+- `RedisBroker`: pub/sub de Redis (`NOTIFICATION_STREAM_REDIS_URL`), para
+  que los avisos publicados por los workers de Celery lleguen a todos los
+  procesos web. Cada proceso abre una sola suscripción por patrón y reparte
+  los avisos entre sus clientes locales.
+
+Coste: cada stream abierto hace una consulta por heartbeat aunque no haya
+avisos y ocupa el hilo de su request mientras dura; la conexión a la base de
+datos se cierra después de cada lectura en vez de retenerse.
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
+import redis
+import redis.asyncio
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection
+
+from apps.notifications.models import Notification
+from apps.notifications.serializers import NotificationSerializer
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = 'notifications:stream'
+# Filas leídas por consulta al ponerse al día
+BATCH_SIZE = 100
+
+
+def stream_setting(name, default):
+    return getattr(settings, f'NOTIFICATION_STREAM_{name}', default)
+
+
+class Subscription:
+    """Aviso pendiente para un cliente; varios avisos seguidos se funden en uno."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self._event = asyncio.Event()
+
+    def wake(self):
+        """Despertar al cliente; se puede llamar desde cualquier hilo."""
+        try:
+            self.loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            pass  # el bucle del cliente ya terminó
+
+    async def wait(self, timeout):
+        """Esperar un aviso; False si pasan `timeout` segundos sin ninguno."""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._event.clear()
+        return True
+
+
+class LocalBroker:
+    """Pub/sub en memoria del proceso: {user_id: suscripciones abiertas}."""
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, user_ids):
+        for user_id in user_ids:
+            self._wake(user_id)
+
+    def _wake(self, user_id):
+        with self._lock:
+            subscriptions = list(self._subscribers.get(user_id, ()))
+        for subscription in subscriptions:
+            subscription.wake()
+
+    def _wake_all(self):
+        with self._lock:
+            subscriptions = [s for group in self._subscribers.values() for s in group]
+        for subscription in subscriptions:
+            subscription.wake()
+
+    @asynccontextmanager
+    async def subscribe(self, user_id):
+        subscription = Subscription(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers[user_id].add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                self._subscribers[user_id].discard(subscription)
+                if not self._subscribers[user_id]:
+                    del self._subscribers[user_id]
+
+
+class RedisBroker(LocalBroker):
+    """Avisos por pub/sub de Redis, repartidos localmente por `LocalBroker`."""
+
+    reconnect_delay = 1.0
+
+    def __init__(self, url):
+        super().__init__()
+        self.url = url
+        self._client = None
+        self._listener = None
+
+    def publish(self, user_ids):
+        if self._client is None:
+            self._client = redis.Redis.from_url(self.url)
+        for user_id in user_ids:
+            self._client.publish(f'{CHANNEL_PREFIX}:{user_id}', '')
+
+    @asynccontextmanager
+    async def subscribe(self, user_id):
+        self._ensure_listener()
+        async with super().subscribe(user_id) as subscription:
+            yield subscription
+
+    def _ensure_listener(self):
+        loop = asyncio.get_running_loop()
+        if self._listener is None or self._listener.done() or self._listener.get_loop() is not loop:
+            self._listener = loop.create_task(self._listen())
+
+    async def _listen(self):
+        client = redis.asyncio.Redis.from_url(self.url)
+        while True:
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.psubscribe(f'{CHANNEL_PREFIX}:*')
+                    # Lo publicado mientras no había suscripción se recupera por id
+                    self._wake_all()
+                    async for message in pubsub.listen():
+                        if message['type'] == 'pmessage':
+                            self._wake(int(message['channel'].rsplit(b':', 1)[1]))
+            except redis.RedisError:
+                logger.warning('Notification stream lost its Redis subscription, reconnecting',
+                               exc_info=True)
+                await asyncio.sleep(self.reconnect_delay)
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    url = stream_setting('REDIS_URL', '')
+    return RedisBroker(url) if url else LocalBroker()
+
+
+def publish_notifications(user_ids):
+    """Avisar a los streams abiertos de `user_ids` que hay notificaciones nuevas.
+
+    Se llama tras el commit; un fallo de Redis no afecta a quien crea las
+    notificaciones (los clientes las recibirán al reconectar).
+    """
+    try:
+        get_broker().publish(set(user_ids))
+    except redis.RedisError:
+        logger.warning('Could not publish notification stream wake-up', exc_info=True)
+
+
+def format_event(notification):
+    data = json.dumps(NotificationSerializer(notification).data, ensure_ascii=False)
+    return f'id: {notification.id}\nevent: notification\ndata: {data}\n\n'
+
+
+def released_connection(function):
+    """Ejecutar la lectura en el hilo del request y soltar luego la conexión.
+
+    Un stream vive minutos u horas y solo lee de vez en cuando; sin cerrarla
+    retendría una conexión a la base de datos durante toda su vida. Dentro de
+    una transacción (los tests) no se cierra.
+    """
+    def read(*args):
+        try:
+            return function(*args)
+        finally:
+            if not connection.in_atomic_block:
+                connection.close()
+    return sync_to_async(read)
+
+
+@released_connection
+def latest_notification_id(user_id):
+    last_id = (Notification.objects.filter(user_id=user_id).order_by('-id')
+               .values_list('id', flat=True).first())
+    return last_id or 0
+
+
+@released_connection
+def notifications_after(user_id, last_id, limit=BATCH_SIZE):
+    return list(Notification.objects.filter(user_id=user_id, id__gt=last_id).order_by('id')[:limit])
+
+
+async def event_stream(user_id, last_event_id=None, broker=None, heartbeat=None):
+    """Generar los eventos SSE de `user_id`.
+
+    Con `last_event_id` se reenvía primero lo creado después de ese id; sin
+    él solo se envía lo nuevo. Si pasan `heartbeat` segundos sin avisos se
+    relee la base de datos (así el stream entrega aunque el aviso no llegue,
+    con una demora de a lo sumo `heartbeat`) y, si no hay nada, se envía un
+    comentario para que proxies y navegador no cierren la conexión.
+    """
+    broker = broker or get_broker()
+    heartbeat = heartbeat or stream_setting('HEARTBEAT', 15)
+    # Suscribirse antes de leer: un aviso que llegue durante la lectura no se pierde
+    async with broker.subscribe(user_id) as subscription:
+        # Fijar el punto de partida antes del primer evento: lo creado
+        # después de enviar `retry:` no puede quedar dentro de la base
+        last_id = await latest_notification_id(user_id) if last_event_id is None else last_event_id
+        yield f'retry: {stream_setting("RETRY_MS", 3000)}\n\n'
+        pending = last_event_id is not None
+        idle = False
+        while True:
+            while pending:
+                batch = await notifications_after(user_id, last_id)
+                for notification in batch:
+                    yield format_event(notification)
+                    last_id = notification.id
+                idle = idle and not batch
+                pending = len(batch) == BATCH_SIZE
+            if idle:
+                yield ': keepalive\n\n'
+            # Un heartbeat sin avisos también relee: quien creó la notificación
+            # pudo publicar en otro proceso sin broker compartido (LocalBroker)
+            idle = not await subscription.wait(heartbeat)
+            pending = True
+
+
+__all__ = [
+    'LocalBroker',
+    'RedisBroker',
+    'event_stream',
+    'format_event',
+    'get_broker',
+    'publish_notifications',
+]
@@ -1,17 +1,44 @@
+from collections import Counter
+from itertools import groupby
+from operator import attrgetter
+
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
+from django.core.mail import EmailMultiAlternatives, get_connection, send_mail
 from django.template.loader import render_to_string
 from django.conf import settings
 from celery import shared_task
 from django.db import OperationalError, transaction
 from celery.utils.log import get_task_logger
 
+from apps.notifications.counters import increment_unread, reconcile_unread_counts
 from apps.notifications.models import Notification
+from apps.notifications.retention import purge_notifications
+from apps.notifications.streams import publish_notifications
 from apps.academics.models import Grade
+from apps.users.models import Profile
 
 logger = get_task_logger(__name__)
 User = get_user_model()
 
+# Preferencias que atiende cada resumen. La ejecución horaria también envía lo
+# pendiente de quienes volvieron al envío inmediato.
+DIGEST_DELIVERIES = {
+    Profile.NotificationDelivery.HOURLY: [Profile.NotificationDelivery.HOURLY,
+                                          Profile.NotificationDelivery.IMMEDIATE],
+    Profile.NotificationDelivery.DAILY: [Profile.NotificationDelivery.DAILY],
+}
+# Ids por UPDATE al marcar un resumen como enviado
+DIGEST_CLEAR_BATCH = 5000
+
+
+def notifications_created(counts):
+    """Tras un bulk_create confirmado: sumar {user_id: nuevas} al badge y avisar a los streams SSE.
+
+    `bulk_create` no emite post_save, así que aquí se publica a mano.
+    """
+    increment_unread(counts)
+    publish_notifications(counts)
+
 
 # Retry on OperationalError (e.g., SQLite locked) with exponential backoff
 @shared_task(bind=True, autoretry_for=(OperationalError,), retry_backoff=True, retry_kwargs={'max_retries': 5})
@@ -43,6 +70,8 @@ def send_welcome_email(self, user_id: int):
                 title='Bienvenido a Estudify',
                 message='Tu cuenta ha sido creada correctamente. ¡Bienvenido!'
             )
+            # El aviso a los streams lo publica la señal post_save
+            transaction.on_commit(lambda: increment_unread({user.id: 1}))
     except OperationalError:
         logger.exception('OperationalError when creating welcome notification, will retry')
         raise
@@ -50,45 +79,199 @@ def send_welcome_email(self, user_id: int):
     return True
 
 
-@shared_task(bind=True, autoretry_for=(OperationalError,), retry_backoff=True, retry_kwargs={'max_retries': 5})
-def send_grade_notification_email(self, grade_id: int):
-    """Notify student and create notification when a grade is created/updated.
+def delivery_mode(user):
+    """Preferencia de envío de `user` (inmediato si no tiene perfil)."""
+    try:
+        return user.profile.notification_delivery
+    except Profile.DoesNotExist:
+        return Profile.NotificationDelivery.IMMEDIATE
+
+
+def grade_notification_message(student, grades):
+    """Un correo con todas las calificaciones nuevas de `student`."""
+    if len(grades) == 1:
+        subject = f'Nueva calificación en {grades[0].subject.name}'
+    else:
+        subject = f'{len(grades)} nuevas calificaciones'
+    context = {'student': student, 'grade': grades[0], 'grades': grades}
+    message = EmailMultiAlternatives(
+        subject,
+        render_to_string('emails/grade_notification.txt', context),
+        settings.DEFAULT_FROM_EMAIL,
+        [student.email],
+    )
+    message.attach_alternative(render_to_string('emails/grade_notification.html', context), 'text/html')
+    return message
 
-    Protects against transient SQLite locking errors by retrying. Prefer Postgres
-    in CI/production when running Celery workers concurrently.
+
+def inserted_rows(notifications):
+    """(user_id, object_id) de las filas que insertó de verdad un `bulk_create(ignore_conflicts=True)`.
+
+    Las filas que descartó la restricción única no se distinguen en el
+    resultado: se releen por (usuario, objeto) y solo cuentan las que tienen
+    el `created_at` que se escribió aquí.
     """
-    try:
-        grade = Grade.objects.select_related('student', 'graded_by', 'subject').get(id=grade_id)
-    except Grade.DoesNotExist:
-        return False
+    written = {(n.user_id, n.object_id): n.created_at for n in notifications}
+    rows = Notification.objects.filter(
+        user_id__in={n.user_id for n in notifications}, notification_type='grade',
+        object_id__in=[n.object_id for n in notifications],
+    ).values_list('user_id', 'object_id', 'created_at')
+    return {(user_id, object_id) for user_id, object_id, created_at in rows
+            if written.get((user_id, object_id)) == created_at}
 
-    student = grade.student
-    subject = f'Nueva calificación en {grade.subject.name}'
-    context = {'student': student, 'grade': grade}
-    message = render_to_string('emails/grade_notification.txt', context)
-    html_message = render_to_string('emails/grade_notification.html', context)
-    send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [student.email], html_message=html_message)
 
-    # Create notification safely with transaction and avoid duplicates
-    try:
-        with transaction.atomic():
-            exists = Notification.objects.filter(
+def deliver_grade_notifications(grade_ids):
+    """Notificar las calificaciones `grade_ids`: un correo por estudiante.
+
+    Omite las calificaciones que ya no existen (transacción revertida) o que
+    ya tienen notificación (tarea entregada dos veces). Las notificaciones se
+    insertan con un único bulk_create y solo después salen los correos, por
+    una sola conexión con `send_messages` y únicamente por las filas que esta
+    entrega insertó de verdad: si dos entregas coinciden (reintento de Celery
+    o tareas solapadas), la restricción única deja una fila y un solo correo.
+    El badge y los streams cuentan lo mismo. Los estudiantes con resumen
+    periódico no reciben correo ahora sino en `send_notification_digests`.
+    Devuelve cuántas calificaciones existían.
+    """
+    grades = list(Grade.objects.filter(id__in=grade_ids).select_related('student__profile', 'subject')
+                  .order_by('student_id', 'subject__name', 'id'))
+    # Filtro barato por el índice único (user, notification_type, object_id);
+    # no bloquea: de las entregas concurrentes se encarga la restricción
+    notified = set(Notification.objects.filter(
+        user_id__in={grade.student_id for grade in grades},
+        notification_type='grade', object_id__in=[grade.id for grade in grades],
+    ).values_list('user_id', 'object_id'))
+
+    notifications, recipients = [], []
+    for _, student_grades in groupby(grades, key=attrgetter('student_id')):
+        pending = [grade for grade in student_grades if (grade.student_id, grade.id) not in notified]
+        if not pending:
+            continue
+        student = pending[0].student
+        digest = delivery_mode(student) != Profile.NotificationDelivery.IMMEDIATE
+        notifications.extend(
+            Notification(
                 user=student,
-                notification_type='grade',
+                title=f'Nueva calificación en {grade.subject.name}',
+                message=f'Tu calificación en {grade.subject.name} es {grade.value}',
+                content_type=None,
                 object_id=grade.id,
-            ).exists()
-
-            if not exists:
-                Notification.objects.create(
-                    user=student,
-                    title=subject,
-                    message=f'Tu calificación en {grade.subject.name} es {grade.value}',
-                    content_type=None,
-                    object_id=grade.id,
-                    notification_type='grade',
-                )
+                notification_type='grade',
+                email_pending=digest,
+            )
+            for grade in pending
+        )
+        if student.email and not digest:
+            recipients.append((student, pending))
+
+    if not notifications:
+        return len(grades)
+    try:
+        with transaction.atomic():
+            # Una entrega concurrente que ya insertó la misma fila no falla ni duplica
+            Notification.objects.bulk_create(notifications, ignore_conflicts=True)
+            inserted = inserted_rows(notifications)
+            created = Counter(user_id for user_id, _ in inserted)
+            transaction.on_commit(lambda: notifications_created(created))
     except OperationalError:
-        logger.exception('OperationalError when creating grade notification, will retry')
+        logger.exception('OperationalError when creating grade notifications, will retry')
         raise
 
+    # Las filas que ganó otra entrega las notifica esa entrega
+    messages = []
+    for student, pending in recipients:
+        won = [grade for grade in pending if (student.id, grade.id) in inserted]
+        if won:
+            messages.append(grade_notification_message(student, won))
+    if messages:
+        get_connection().send_messages(messages)
+
+    return len(grades)
+
+
+@shared_task(bind=True, autoretry_for=(OperationalError,), retry_backoff=True, retry_kwargs={'max_retries': 5})
+def send_grade_notifications(self, grade_ids):
+    """Notificar un lote de calificaciones agrupadas por estudiante.
+
+    Se encola desde `apps.notifications.batching` al confirmar la transacción
+    en la que se crearon las calificaciones.
+    """
+    deliver_grade_notifications(grade_ids)
     return True
+
+
+@shared_task(bind=True, autoretry_for=(OperationalError,), retry_backoff=True, retry_kwargs={'max_retries': 5})
+def send_grade_notification_email(self, grade_id: int):
+    """Notify student and create notification for a single grade.
+
+    Kept for callers that enqueue one grade; new code should go through
+    `queue_grade_notifications`, which batches per transaction.
+    """
+    return deliver_grade_notifications([grade_id]) > 0
+
+
+def digest_message(user, notifications):
+    """Un correo con todas las notificaciones pendientes de `user`."""
+    context = {'user': user, 'notifications': notifications}
+    message = EmailMultiAlternatives(
+        f'Tienes {len(notifications)} notificaciones nuevas en Estudify',
+        render_to_string('emails/notification_digest.txt', context),
+        settings.DEFAULT_FROM_EMAIL,
+        [user.email],
+    )
+    message.attach_alternative(render_to_string('emails/notification_digest.html', context), 'text/html')
+    return message
+
+
+@shared_task(bind=True, autoretry_for=(OperationalError,), retry_backoff=True, retry_kwargs={'max_retries': 5})
+def send_notification_digests(self, delivery: str):
+    """Enviar un correo resumen por usuario con sus notificaciones pendientes.
+
+    Programada con Celery beat (`CELERY_BEAT_SCHEDULE`) para 'HOURLY' y
+    'DAILY'. Usa dos consultas sin importar cuántos usuarios haya (más una
+    por cada `DIGEST_CLEAR_BATCH` notificaciones): una lee las notificaciones
+    pendientes con su usuario y otra marca como enviadas exactamente las
+    leídas; los correos salen por una sola conexión.
+    """
+    pending = Notification.objects.filter(
+        email_pending=True, user__profile__notification_delivery__in=DIGEST_DELIVERIES[delivery],
+    )
+    rows = pending.select_related('user').order_by('user_id', 'id')
+
+    messages, read_ids = [], []
+    for _, user_notifications in groupby(rows.iterator(chunk_size=2000), key=attrgetter('user_id')):
+        user_notifications = list(user_notifications)
+        read_ids.extend(notification.id for notification in user_notifications)
+        user = user_notifications[0].user
+        if user.email:
+            messages.append(digest_message(user, user_notifications))
+    if not read_ids:
+        return 0
+
+    if messages:
+        get_connection().send_messages(messages)
+    # Solo lo leído, por id: una fila que se confirme después (aunque tenga un
+    # id menor) queda para el próximo resumen
+    for start in range(0, len(read_ids), DIGEST_CLEAR_BATCH):
+        Notification.objects.filter(id__in=read_ids[start:start + DIGEST_CLEAR_BATCH]).update(
+            email_pending=False)
+    return len(messages)
+
+
+@shared_task(bind=True, autoretry_for=(OperationalError,), retry_backoff=True, retry_kwargs={'max_retries': 5})
+def reconcile_unread_notification_counts(self):
+    """Corregir en caché los contadores de no leídas (Celery beat)."""
+    return reconcile_unread_counts()
+
+
+@shared_task(bind=True, autoretry_for=(OperationalError,), retry_backoff=True, retry_kwargs={'max_retries': 5})
+def purge_old_notifications(self):
+    """Aplicar la retención de notificaciones leídas (Celery beat).
+
+    Un reintento retoma donde quedó: los rangos ya procesados no vuelven a
+    coincidir con el filtro.
+    """
+    stats = purge_notifications()
+    logger.info('Notification retention: %(processed)s rows in %(chunks)s chunks '
+                '(%(seconds).1fs, %(rows_per_second).0f rows/s)', stats)
+    return stats
@@ -3,10 +3,16 @@ from .views import (
     NotificationListView,
     NotificationMarkReadView,
     NotificationMarkAllReadView,
+    NotificationPreferenceView,
+    NotificationUnreadCountView,
+    notification_stream,
 )
 
 urlpatterns = [
     path('', NotificationListView.as_view(), name='notifications-list'),
     path('<int:pk>/mark_read/', NotificationMarkReadView.as_view(), name='notification-mark-read'),
     path('mark_all_read/', NotificationMarkAllReadView.as_view(), name='notifications-mark-all-read'),
+    path('unread_count/', NotificationUnreadCountView.as_view(), name='notifications-unread-count'),
+    path('stream/', notification_stream, name='notifications-stream'),
+    path('preferences/', NotificationPreferenceView.as_view(), name='notification-preferences'),
 ]
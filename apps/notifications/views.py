@@ -1,21 +1,36 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
 from django.utils import timezone
-from rest_framework import generics, permissions, status
+from django.views.decorators.http import require_GET
+from rest_framework import exceptions, generics, permissions, status
 from rest_framework.response import Response
 
+from apps.api.authentication import HashedTokenAuthentication
+from apps.api.pagination import CursorOptInPagination
+from apps.core.instrumentation import QueryBudgetMixin
+from apps.notifications.counters import decrement_unread, reset_unread, unread_count
 from apps.notifications.models import Notification
-from .serializers import NotificationSerializer
+from apps.notifications.streams import event_stream
+from apps.users.models import Profile
+from .serializers import NotificationPreferenceSerializer, NotificationSerializer
 
 
-class NotificationListView(generics.ListAPIView):
+class NotificationListView(QueryBudgetMixin, generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    query_budgets = {'get': 5}
     serializer_class = NotificationSerializer
+    pagination_class = CursorOptInPagination
+    cursor_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
         return Notification.objects.filter(user=self.request.user).order_by('-created_at')
 
 
-class NotificationMarkReadView(generics.UpdateAPIView):
+class NotificationMarkReadView(QueryBudgetMixin, generics.UpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    query_budgets = {'default': 5}
     serializer_class = NotificationSerializer
     queryset = Notification.objects.all()
 
@@ -23,24 +38,97 @@ class NotificationMarkReadView(generics.UpdateAPIView):
         notif = self.get_object()
         if notif.user_id != request.user.id:
             return Response(status=status.HTTP_403_FORBIDDEN)
+        was_unread = not notif.is_read
         notif.is_read = True
         notif.read_at = timezone.now()
         notif.save()
+        if was_unread:
+            transaction.on_commit(lambda: decrement_unread(request.user.id))
         return Response(self.get_serializer(notif).data)
 
 
-class NotificationMarkAllReadView(generics.GenericAPIView):
+class NotificationMarkAllReadView(QueryBudgetMixin, generics.GenericAPIView):
     """Mark all unread notifications for the authenticated user as read.
 
     POST /api/notifications/mark_all_read/
     Returns JSON with the number of notifications updated.
     """
     permission_classes = [permissions.IsAuthenticated]
+    query_budgets = {'post': 4}
 
     def post(self, request, *args, **kwargs):
         qs = Notification.objects.filter(user=request.user, is_read=False)
         now = timezone.now()
-        updated = qs.update(is_read=True, read_at=now)
+        updated = qs.update(is_read=True, read_at=now, updated_at=now)
+        transaction.on_commit(lambda: reset_unread(request.user.id))
         return Response({"updated": updated}, status=status.HTTP_200_OK)
 
-# Create your views here.
+
+class NotificationUnreadCountView(QueryBudgetMixin, generics.GenericAPIView):
+    """Number of unread notifications for the badge.
+
+    GET /api/notifications/unread_count/
+    Served from a per-user cached counter: a cache hit runs no queries of its
+    own. The budget also covers session authentication (session + user).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    query_budgets = {'get': 3}
+
+    def get(self, request, *args, **kwargs):
+        return Response({"unread_count": unread_count(request.user.id)})
+
+
+class NotificationPreferenceView(QueryBudgetMixin, generics.RetrieveUpdateAPIView):
+    """Read or change how the authenticated user receives notification emails.
+
+    GET/PATCH /api/notifications/preferences/
+    `notification_delivery`: IMMEDIATE, HOURLY (hourly digest) or DAILY.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    query_budgets = {'default': 4}
+    serializer_class = NotificationPreferenceSerializer
+
+    def get_object(self):
+        profile, _ = Profile.objects.get_or_create(user=self.request.user)
+        return profile
+
+
+async def stream_user(request):
+    """User of a stream request: API token first, then the session."""
+    try:
+        result = await sync_to_async(HashedTokenAuthentication().authenticate)(request)
+    except exceptions.AuthenticationFailed:
+        return None
+    if result is not None:
+        return result[0]
+    user = await request.auser()
+    return user if user.is_authenticated else None
+
+
+def last_event_id(request):
+    """`Last-Event-ID` header (browser reconnect) or `?last_event_id=`."""
+    value = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    return int(value) if value and value.isdigit() else None
+
+
+@require_GET
+async def notification_stream(request):
+    """Server-Sent Events stream of the authenticated user's new notifications.
+
+    GET /api/notifications/stream/
+    Each event carries the serialized notification with its id as the event
+    id, so a reconnecting EventSource resumes from `Last-Event-ID`. Needs an
+    ASGI server: under WSGI every open stream would hold a worker.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'detail': 'El stream requiere un servidor ASGI.'}, status=status.HTTP_501_NOT_IMPLEMENTED)
+    user = await stream_user(request)
+    if user is None:
+        return JsonResponse({'detail': 'No autenticado.'}, status=status.HTTP_401_UNAUTHORIZED)
+
+    response = StreamingHttpResponse(event_stream(user.id, last_event_id(request)),
+                                     content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Nginx would otherwise buffer the events
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -1,2 +1,20 @@
+from django.contrib import admin
 
-# Register your models here.
+from apps.reports.models import ReportJob
+
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    """Admin de los trabajos de reporte (solo consulta)."""
+    list_display = ['id', 'report_type', 'requested_by', 'status', 'size', 'created_at', 'finished_at']
+    list_filter = ['report_type', 'status', 'created_at']
+    search_fields = ['requested_by__username', 'student__username', 'task_id']
+    list_select_related = ['requested_by']
+    readonly_fields = [
+        'requested_by', 'report_type', 'student', 'course', 'subject', 'status',
+        'file', 'content_type', 'size', 'error', 'task_id', 'started_at',
+        'finished_at', 'created_at', 'updated_at',
+    ]
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,154 @@
+"""
+Boletines de calificaciones de todo un curso o semestre.
+
+Las calificaciones se leen en una sola consulta ordenada por estudiante y se
+convierten en boletines planos (`utils.report_cards`) sin instanciar modelos.
+El renderizado se reparte en un pool de procesos, uno por núcleo disponible,
+y los PDFs se escriben en el ZIP a medida que llegan, con una ventana acotada
+de trabajos en vuelo para que la memoria no crezca con el número de alumnos.
+
+Un proceso daemon no puede crear hijos, y los procesos de un worker de Celery
+con el pool por defecto (prefork) lo son. Ahí el renderizado cae a serie. Para
+que los trabajos `REPORT_CARDS_*` usen el pool, encamina `generate_report` a
+una cola propia (`CELERY_TASK_ROUTES`) atendida por un worker `-P solo` o
+`-P threads`, cuyo proceso principal no es daemon. El comando
+`render_report_cards` siempre puede usar el pool.
+"""
+import logging
+import multiprocessing
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from apps.academics.models import Grade
+from apps.courses.models import Course
+from utils.report_cards import (build_report_card, display_name, grade_row,
+                                render_report_card, write_merged_report_cards)
+
+User = get_user_model()
+logger = logging.getLogger(__name__)
+
+REPORT_CARD_FORMATS = ('zip', 'pdf')
+# Trabajos en vuelo por proceso del pool
+POOL_WINDOW = 2
+
+
+def semester_courses(academic_year, semester):
+    return Course.objects.filter(academic_year=academic_year, semester=semester, is_active=True)
+
+
+def report_card_students(courses):
+    """Estudiantes con inscripción activa en `courses`, por id."""
+    return User.objects.filter(
+        enrollments__course__in=courses, enrollments__is_active=True,
+    ).distinct().order_by('id')
+
+
+def iter_report_cards(students, grades, chunk_size=2000):
+    """Generar un boletín por estudiante recorriendo ambas consultas a la vez.
+
+    `students` y `grades` se ordenan por id de estudiante y se cruzan como en
+    un merge join: una consulta para cada uno, sin importar cuántos alumnos haya.
+    """
+    labels = {key: str(label) for key, label in Grade._meta.get_field('grade_type').choices}
+    grade_rows = grades.order_by('student_id', 'subject__name', 'graded_date', 'id').values_list(
+        'student_id', 'subject__name', 'grade_type', 'value', 'weight',
+    ).iterator(chunk_size=chunk_size)
+    by_student = groupby(grade_rows, key=itemgetter(0))
+    current = next(by_student, None)
+
+    student_rows = students.order_by('id').values_list(
+        'id', 'first_name', 'last_name', 'username', 'email',
+    ).iterator(chunk_size=chunk_size)
+    for pk, first_name, last_name, username, email in student_rows:
+        # Calificaciones de estudiantes fuera de la lista (p. ej. inscripción inactiva)
+        while current is not None and current[0] < pk:
+            current = next(by_student, None)
+        rows, values = [], []
+        if current is not None and current[0] == pk:
+            for _, subject_name, grade_type, value, weight in current[1]:
+                rows.append(grade_row(subject_name, labels.get(grade_type, grade_type), value, weight))
+                values.append(value)
+            current = next(by_student, None)
+        yield build_report_card(display_name(first_name, last_name, username), username, email, rows, values)
+
+
+def pool_size(workers=None):
+    """Procesos del pool: `workers`, `REPORT_CARD_WORKERS` o los núcleos disponibles."""
+    workers = workers or getattr(settings, 'REPORT_CARD_WORKERS', 0)
+    if workers:
+        return workers
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - macOS/Windows
+        return os.cpu_count() or 1
+
+
+def render_report_cards(cards, workers=None):
+    """Renderizar `cards` en orden; genera (nombre de archivo, bytes del PDF)."""
+    workers = pool_size(workers)
+    if workers <= 1 or multiprocessing.current_process().daemon:
+        if workers > 1:
+            # Un proceso daemon no puede crear hijos: renderizar en serie
+            logger.info('Daemon process cannot start a process pool; rendering report cards serially')
+        yield from map(render_report_card, cards)
+        return
+
+    # spawn: los hijos no heredan conexiones a la base de datos ni hilos del padre
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        pending = deque()
+        for card in cards:
+            pending.append(pool.submit(render_report_card, card))
+            if len(pending) >= workers * POOL_WINDOW:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def write_report_cards_zip(cards, output, workers=None):
+    """Escribir un ZIP con un PDF por boletín; devuelve cuántos se escribieron."""
+    count = 0
+    with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for filename, content in render_report_cards(cards, workers):
+            archive.writestr(filename, content)
+            count += 1
+    return count
+
+
+def write_report_cards(courses, output, output_format='zip', grades=None, workers=None):
+    """Escribir en `output` los boletines de los estudiantes de `courses`.
+
+    `grades` permite acotar las calificaciones (p. ej. al ámbito de un docente);
+    por defecto son todas las de las materias de `courses`. El formato 'pdf'
+    genera un único documento en este proceso: ReportLab no puede repartir un
+    mismo documento entre procesos.
+    """
+    if output_format not in REPORT_CARD_FORMATS:
+        raise ValueError(f'Formato desconocido: {output_format}')
+    grades = Grade.objects.all() if grades is None else grades
+    cards = iter_report_cards(
+        report_card_students(courses), grades.filter(subject__course__in=courses))
+    if output_format == 'zip':
+        return write_report_cards_zip(cards, output, workers)
+    cards = list(cards)
+    write_merged_report_cards(cards, output)
+    return len(cards)
+
+
+__all__ = [
+    'REPORT_CARD_FORMATS',
+    'iter_report_cards',
+    'pool_size',
+    'render_report_cards',
+    'report_card_students',
+    'semester_courses',
+    'write_report_cards',
+    'write_report_cards_zip',
+]
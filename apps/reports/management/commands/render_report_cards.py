@@ -0,0 +1,62 @@
+"""Genera los boletines de fin de periodo de uno o varios cursos, o de un semestre.
+
+Los PDFs se renderizan en un pool de procesos (`--workers`, por defecto uno
+por núcleo) y se guardan en un ZIP, o en un único PDF con `--format pdf`.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.courses.models import Course
+from apps.reports.batch import (REPORT_CARD_FORMATS, pool_size,
+                                semester_courses, write_report_cards)
+
+
+class Command(BaseCommand):
+    help = 'Genera los boletines de calificaciones de un curso o semestre en un ZIP o PDF.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--course',
+            type=int,
+            action='append',
+            default=[],
+            help='Id del curso (se puede repetir)'
+        )
+        parser.add_argument('--year', type=int, help='Año académico (con --semester)')
+        parser.add_argument('--semester', type=int, help='Semestre (con --year)')
+        parser.add_argument(
+            '--format',
+            choices=REPORT_CARD_FORMATS,
+            default='zip',
+            help='zip: un PDF por estudiante; pdf: un único documento (default: zip)'
+        )
+        parser.add_argument('--output', required=True, help='Ruta del archivo de salida')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=0,
+            help='Procesos de renderizado (default: REPORT_CARD_WORKERS o núcleos disponibles)'
+        )
+
+    def handle(self, *args, **options):
+        courses = self._courses(options)
+        if not courses.exists():
+            raise CommandError('No hay cursos que coincidan con los filtros.')
+
+        workers = pool_size(options['workers'])
+        started = time.monotonic()
+        with open(options['output'], 'wb') as output:
+            count = write_report_cards(courses, output, options['format'], workers=workers)
+        elapsed = time.monotonic() - started
+        rate = count / elapsed if elapsed else count
+        self.stdout.write(self.style.SUCCESS(
+            f'{count} boletines en {options["output"]} ({elapsed:.1f}s, {rate:.0f}/s, '
+            f'{workers} procesos)'))
+
+    def _courses(self, options):
+        if options['course']:
+            return Course.objects.filter(pk__in=options['course'])
+        if options['year'] and options['semester']:
+            return semester_courses(options['year'], options['semester'])
+        raise CommandError('Indica --course o --year y --semester.')
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.8 on 2026-10-16 23:37
+
+import apps.reports.storage
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('courses', '0006_rename_coursesess_course_timeslot_idx_courses_cou_course__5f28f1_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Fecha y hora de creación del registro', verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Fecha y hora de última actualización', verbose_name='Fecha de actualización')),
+                ('is_active', models.BooleanField(default=True, help_text='Indica si el registro está activo', verbose_name='Activo')),
+                ('report_type', models.CharField(choices=[('GRADES_PDF', 'Boletín de calificaciones (PDF)'), ('ATTENDANCE_PDF', 'Reporte de asistencia (PDF)'), ('GRADES_EXCEL', 'Calificaciones (Excel)'), ('ATTENDANCE_EXCEL', 'Asistencias (Excel)')], max_length=20, verbose_name='Tipo de reporte')),
+                ('status', models.CharField(choices=[('PENDING', 'Pendiente'), ('RUNNING', 'En proceso'), ('SUCCESS', 'Completado'), ('FAILED', 'Fallido')], default='PENDING', max_length=10, verbose_name='Estado')),
+                ('file', models.FileField(blank=True, storage=apps.reports.storage.ReportStorage(), upload_to='%Y/%m/', verbose_name='Archivo')),
+                ('content_type', models.CharField(blank=True, max_length=100, verbose_name='Tipo de contenido')),
+                ('size', models.PositiveBigIntegerField(default=0, verbose_name='Tamaño (bytes)')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('task_id', models.CharField(blank=True, max_length=255, verbose_name='Id de tarea')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Inicio')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Fin')),
+                ('course', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='courses.course', verbose_name='Curso')),
+                ('requested_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='report_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Solicitado por')),
+                ('student', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Estudiante')),
+                ('subject', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='courses.subject', verbose_name='Materia')),
+            ],
+            options={
+                'verbose_name': 'Trabajo de reporte',
+                'verbose_name_plural': 'Trabajos de reporte',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['requested_by', '-created_at'], name='reportjob_user_created_idx')],
+            },
+        ),
+    ]
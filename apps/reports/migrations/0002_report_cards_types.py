@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-16 23:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reportjob',
+            name='report_type',
+            field=models.CharField(choices=[('GRADES_PDF', 'Boletín de calificaciones (PDF)'), ('ATTENDANCE_PDF', 'Reporte de asistencia (PDF)'), ('GRADES_EXCEL', 'Calificaciones (Excel)'), ('ATTENDANCE_EXCEL', 'Asistencias (Excel)'), ('REPORT_CARDS_ZIP', 'Boletines del curso (ZIP)'), ('REPORT_CARDS_PDF', 'Boletines del curso (PDF único)')], max_length=20, verbose_name='Tipo de reporte'),
+        ),
+    ]
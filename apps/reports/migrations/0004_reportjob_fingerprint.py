@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0003_course_attendance_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportjob',
+            name='fingerprint',
+            field=models.CharField(blank=True, max_length=64, verbose_name='Huella de datos'),
+        ),
+    ]
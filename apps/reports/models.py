@@ -1,2 +1,106 @@
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+from apps.core.models import AbstractBaseModel
+from apps.reports.storage import report_storage
+
+
+class ReportJob(AbstractBaseModel):
+    """
+    Generación asíncrona de un reporte.
+
+    La petición web solo crea el registro y encola la tarea; el worker de
+    Celery renderiza el documento a disco (`file`) y actualiza `status`.
+    """
+
+    class ReportType(models.TextChoices):
+        GRADES_PDF = 'GRADES_PDF', _('Boletín de calificaciones (PDF)')
+        ATTENDANCE_PDF = 'ATTENDANCE_PDF', _('Reporte de asistencia (PDF)')
+        GRADES_EXCEL = 'GRADES_EXCEL', _('Calificaciones (Excel)')
+        ATTENDANCE_EXCEL = 'ATTENDANCE_EXCEL', _('Asistencias (Excel)')
+        REPORT_CARDS_ZIP = 'REPORT_CARDS_ZIP', _('Boletines del curso (ZIP)')
+        REPORT_CARDS_PDF = 'REPORT_CARDS_PDF', _('Boletines del curso (PDF único)')
+        COURSE_ATTENDANCE_PDF = 'COURSE_ATTENDANCE_PDF', _('Asistencia del curso (PDF)')
+
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', _('Pendiente')
+        RUNNING = 'RUNNING', _('En proceso')
+        SUCCESS = 'SUCCESS', _('Completado')
+        FAILED = 'FAILED', _('Fallido')
+
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='report_jobs',
+        verbose_name=_('Solicitado por')
+    )
+    report_type = models.CharField(
+        _('Tipo de reporte'),
+        max_length=30,
+        choices=ReportType.choices
+    )
+    # Parámetros del reporte
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name=_('Estudiante')
+    )
+    course = models.ForeignKey(
+        'courses.Course',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name=_('Curso')
+    )
+    subject = models.ForeignKey(
+        'courses.Subject',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name=_('Materia')
+    )
+
+    status = models.CharField(
+        _('Estado'),
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING
+    )
+    file = models.FileField(
+        _('Archivo'),
+        upload_to='%Y/%m/',
+        storage=report_storage,
+        blank=True
+    )
+    # Huella de los datos con los que se generó (ETag de la descarga)
+    fingerprint = models.CharField(_('Huella de datos'), max_length=64, blank=True)
+    content_type = models.CharField(_('Tipo de contenido'), max_length=100, blank=True)
+    size = models.PositiveBigIntegerField(_('Tamaño (bytes)'), default=0)
+    error = models.TextField(_('Error'), blank=True)
+    task_id = models.CharField(_('Id de tarea'), max_length=255, blank=True)
+    started_at = models.DateTimeField(_('Inicio'), null=True, blank=True)
+    finished_at = models.DateTimeField(_('Fin'), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _('Trabajo de reporte')
+        verbose_name_plural = _('Trabajos de reporte')
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['requested_by', '-created_at'], name='reportjob_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.get_report_type_display()} #{self.pk} ({self.status})'
+
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.SUCCESS, self.Status.FAILED)
+
+
+__all__ = ['ReportJob']
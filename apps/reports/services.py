@@ -0,0 +1,140 @@
+"""
+Renderizado de los trabajos de reporte.
+
+Cada tipo de reporte se traduce en una consulta (acotada al rol de quien lo
+solicitó, igual que en la API) y en uno de los generadores de
+`utils.reports`, que escriben directamente en el archivo de salida. La misma
+consulta da la huella de datos con la que el documento se guarda en la caché
+de reportes (`utils.report_cache`).
+"""
+from datetime import datetime
+
+from apps.academics.models import Attendance, Grade
+from apps.api.access import AccessContext
+from apps.courses.models import Course, CourseEnrollment
+from apps.reports.batch import write_report_cards
+from apps.reports.models import ReportJob
+from utils.report_cache import report_fingerprint
+from utils.reports import (ATTENDANCE_RELATED, EXCEL_CONTENT_TYPE,
+                           GRADE_RELATED, PDF_CONTENT_TYPE,
+                           ExcelReportGenerator, PDFReportGenerator)
+
+ReportType = ReportJob.ReportType
+
+# Tipo de reporte -> (prefijo del archivo, extensión, content type)
+REPORT_FORMATS = {
+    ReportType.GRADES_PDF: ('boletin', 'pdf', PDF_CONTENT_TYPE),
+    ReportType.ATTENDANCE_PDF: ('asistencia', 'pdf', PDF_CONTENT_TYPE),
+    ReportType.GRADES_EXCEL: ('calificaciones', 'xlsx', EXCEL_CONTENT_TYPE),
+    ReportType.ATTENDANCE_EXCEL: ('asistencias', 'xlsx', EXCEL_CONTENT_TYPE),
+    ReportType.REPORT_CARDS_ZIP: ('boletines', 'zip', 'application/zip'),
+    ReportType.REPORT_CARDS_PDF: ('boletines', 'pdf', PDF_CONTENT_TYPE),
+    ReportType.COURSE_ATTENDANCE_PDF: ('asistencia', 'pdf', PDF_CONTENT_TYPE),
+}
+BATCH_FORMATS = {
+    ReportType.REPORT_CARDS_ZIP: 'zip',
+    ReportType.REPORT_CARDS_PDF: 'pdf',
+}
+
+
+def scope_for_user(queryset, user, teacher_lookup, teacher_ids):
+    """Acotar `queryset` a lo que `user` puede ver según su rol."""
+    if user.is_student:
+        return queryset.filter(student=user)
+    access = AccessContext(user)
+    if user.is_teacher and not access.is_admin:
+        return queryset.filter(**{f'{teacher_lookup}__in': getattr(access, teacher_ids)})
+    return queryset
+
+
+def grade_queryset(job):
+    queryset = scope_for_user(
+        Grade.objects.select_related('student', 'subject__course', 'graded_by'),
+        job.requested_by, 'subject_id', 'taught_subject_ids',
+    )
+    if job.student_id:
+        queryset = queryset.filter(student_id=job.student_id)
+    if job.course_id:
+        queryset = queryset.filter(subject__course_id=job.course_id)
+    if job.subject_id:
+        queryset = queryset.filter(subject_id=job.subject_id)
+    return queryset.order_by('subject__name', 'graded_date', 'id')
+
+
+def attendance_queryset(job):
+    queryset = scope_for_user(
+        Attendance.objects.select_related('student', 'course', 'recorded_by'),
+        job.requested_by, 'course_id', 'taught_course_ids',
+    )
+    if job.student_id:
+        queryset = queryset.filter(student_id=job.student_id)
+    if job.course_id:
+        queryset = queryset.filter(course_id=job.course_id)
+    return queryset.order_by('date', 'id')
+
+
+def render_report(job, output):
+    """Escribir en `output` el documento correspondiente a `job`."""
+    if job.report_type == ReportType.GRADES_PDF:
+        PDFReportGenerator.write_grade_report(job.student, grade_queryset(job), output, course=job.course)
+    elif job.report_type == ReportType.ATTENDANCE_PDF:
+        PDFReportGenerator.write_attendance_report(job.student, attendance_queryset(job), job.course, output)
+    elif job.report_type == ReportType.GRADES_EXCEL:
+        ExcelReportGenerator.write_grades_excel(grade_queryset(job), output)
+    elif job.report_type == ReportType.COURSE_ATTENDANCE_PDF:
+        PDFReportGenerator.write_course_attendance_report(job.course, attendance_queryset(job), output)
+    elif job.report_type == ReportType.ATTENDANCE_EXCEL:
+        ExcelReportGenerator.write_attendance_excel(attendance_queryset(job), output)
+    elif job.report_type in BATCH_FORMATS:
+        write_report_cards(
+            Course.objects.filter(pk=job.course_id), output,
+            BATCH_FORMATS[job.report_type], grades=grade_queryset(job))
+    else:
+        raise ValueError(f'Tipo de reporte desconocido: {job.report_type}')
+
+
+def report_cache_key(job):
+    """Huella de los datos de `job`: dos trabajos con la misma huella dan el mismo archivo."""
+    if job.report_type in (ReportType.ATTENDANCE_PDF, ReportType.ATTENDANCE_EXCEL,
+                           ReportType.COURSE_ATTENDANCE_PDF):
+        queryset, related = attendance_queryset(job), ATTENDANCE_RELATED
+    else:
+        queryset, related = grade_queryset(job), GRADE_RELATED
+    extra = []
+    if job.student_id:
+        extra += [job.student.username, job.student.get_full_name(), job.student.email]
+    if job.course_id:
+        extra.append(job.course.name)
+    if job.report_type in BATCH_FORMATS:
+        # Los boletines del curso incluyen a los inscritos sin calificaciones
+        extra.append(report_fingerprint(
+            'enrollments', CourseEnrollment.objects.filter(course_id=job.course_id, is_active=True),
+            related=('student',)))
+    return report_fingerprint(job.report_type, queryset, *extra, related=related)
+
+
+def report_filename(job):
+    prefix, extension, _ = REPORT_FORMATS[job.report_type]
+    if job.student_id:
+        subject = job.student.username
+    elif job.course_id:
+        subject = job.course.code
+    else:
+        subject = f'job{job.pk}'
+    return f'{prefix}_{subject}_{datetime.now().strftime("%Y%m%d")}.{extension}'
+
+
+def report_content_type(job):
+    return REPORT_FORMATS[job.report_type][2]
+
+
+__all__ = [
+    'REPORT_FORMATS',
+    'attendance_queryset',
+    'grade_queryset',
+    'render_report',
+    'report_cache_key',
+    'report_content_type',
+    'report_filename',
+    'scope_for_user',
+]
@@ -0,0 +1,25 @@
+import os
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+
+
+class ReportStorage(FileSystemStorage):
+    """
+    Almacenamiento de los reportes generados, en `settings.REPORTS_ROOT`.
+
+    La ruta se lee en cada acceso (no al importar) para respetar cambios de
+    configuración, p. ej. en los tests. Sin `base_url`: los archivos no son
+    públicos y se sirven solo desde la API.
+    """
+
+    @property
+    def base_location(self):
+        return self._value_or_setting(self._location, settings.REPORTS_ROOT)
+
+    @property
+    def location(self):
+        return os.path.abspath(self.base_location)
+
+
+report_storage = ReportStorage()
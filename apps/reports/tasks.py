@@ -0,0 +1,60 @@
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.core.files import File
+from django.db import OperationalError
+from django.utils import timezone
+
+from apps.reports.models import ReportJob
+from apps.reports.services import (render_report, report_cache_key,
+                                   report_content_type, report_filename)
+from utils.report_cache import report_cache
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(bind=True, autoretry_for=(OperationalError,), retry_backoff=True, retry_kwargs={'max_retries': 5})
+def generate_report(self, job_id: int):
+    """Renderizar el reporte de `job_id` a disco.
+
+    Solo un worker puede tomar el trabajo (PENDING -> RUNNING con un UPDATE
+    condicional), así que entregar la tarea dos veces no genera dos archivos.
+    Un error de renderizado deja el trabajo en FAILED; un OperationalError lo
+    devuelve a PENDING para que el reintento pueda tomarlo de nuevo.
+
+    Si otro trabajo ya generó el documento con los mismos datos (misma huella),
+    se copia desde la caché de reportes en lugar de renderizarlo de nuevo.
+    """
+    claimed = ReportJob.objects.filter(pk=job_id, status=ReportJob.Status.PENDING).update(
+        status=ReportJob.Status.RUNNING, started_at=timezone.now())
+    if not claimed:
+        return False
+
+    job = ReportJob.objects.select_related('requested_by', 'student', 'course').get(pk=job_id)
+    try:
+        job.fingerprint = report_cache_key(job)
+        # El storage copia por bloques el archivo de la caché (o el temporal)
+        with report_cache().open_or_render(job.fingerprint, lambda output: render_report(job, output)) as output:
+            job.file.save(report_filename(job), File(output), save=False)
+    except OperationalError:
+        logger.exception('OperationalError rendering report job %s, will retry', job_id)
+        ReportJob.objects.filter(pk=job_id).update(status=ReportJob.Status.PENDING)
+        raise
+    except Exception as exc:
+        logger.exception('Report job %s failed', job_id)
+        ReportJob.objects.filter(pk=job_id).update(
+            status=ReportJob.Status.FAILED, error=str(exc)[:2000], finished_at=timezone.now())
+        return False
+
+    job.status = ReportJob.Status.SUCCESS
+    job.content_type = report_content_type(job)
+    job.size = job.file.size
+    job.finished_at = timezone.now()
+    job.save(update_fields=['file', 'fingerprint', 'status', 'content_type', 'size', 'finished_at', 'updated_at'])
+    return True
+
+
+def enqueue_report_job(job_id: int):
+    """Encolar la generación de `job_id` y guardar el id de la tarea."""
+    result = generate_report.delay(job_id)
+    ReportJob.objects.filter(pk=job_id).update(task_id=result.id or '')
+    return result
@@ -3,7 +3,9 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
 
-from apps.users.models import Profile
+from apps.users.models import ApiToken, Profile
+from apps.users.tokens import (invalidate_tokens, invalidate_user_tokens,
+                               revoke_token)
 
 User = get_user_model()
 
@@ -48,20 +50,42 @@ class UserAdmin(BaseUserAdmin):
 
     def deactivate_users(self, request, queryset):
         count = queryset.update(is_active=False)
+        # update() no dispara señales: invalidar aquí los tokens cacheados
+        invalidate_user_tokens(queryset.values_list('id', flat=True))
         self.message_user(request, f'{count} usuarios desactivados.')
     deactivate_users.short_description = 'Desactivar usuarios seleccionados'
 
 
+@admin.register(ApiToken)
+class ApiTokenAdmin(admin.ModelAdmin):
+    list_display = ['key_prefix', 'user', 'name', 'expires_at', 'created_at']
+    search_fields = ['user__username', 'name', 'key_prefix']
+    list_select_related = ['user']
+    readonly_fields = ['user', 'key_prefix', 'key_hash', 'created_at', 'updated_at']
+
+    def has_add_permission(self, request):
+        # Los tokens se emiten por la API, que es la única que ve la clave en claro
+        return False
+
+    def delete_model(self, request, obj):
+        revoke_token(obj)
+
+    def delete_queryset(self, request, queryset):
+        invalidate_tokens(queryset.values_list('key_hash', flat=True))
+        queryset.delete()
+
+
 @admin.register(Profile)
 class ProfileAdmin(admin.ModelAdmin):
     list_display = ['user', 'city', 'country', 'created_at', 'is_active']
-    list_filter = ['city', 'country', 'is_active', 'created_at']
+    list_filter = ['city', 'country', 'notification_delivery', 'is_active', 'created_at']
     search_fields = ['user__username', 'user__email', 'city']
     ordering = ['-created_at']
 
     fieldsets = (
         (_('Usuario'), {'fields': ('user',)}),
         (_('Información'), {'fields': ('bio', 'address', 'city', 'country')}),
+        (_('Notificaciones'), {'fields': ('notification_delivery',)}),
         (_('Estado'), {'fields': ('is_active', 'created_at', 'updated_at')}),
     )
 
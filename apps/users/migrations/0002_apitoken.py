@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-16 23:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApiToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Fecha y hora de creación del registro', verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Fecha y hora de última actualización', verbose_name='Fecha de actualización')),
+                ('is_active', models.BooleanField(default=True, help_text='Indica si el registro está activo', verbose_name='Activo')),
+                ('name', models.CharField(blank=True, help_text='Descripción de la integración que usa el token', max_length=100, verbose_name='Nombre')),
+                ('key_prefix', models.CharField(help_text='Primeros caracteres de la clave, para identificarla', max_length=8, verbose_name='Prefijo')),
+                ('key_hash', models.CharField(max_length=64, unique=True, verbose_name='Hash de la clave')),
+                ('expires_at', models.DateTimeField(blank=True, help_text='Vacío para un token sin expiración', null=True, verbose_name='Expira')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='api_tokens', to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+            ],
+            options={
+                'verbose_name': 'Token de API',
+                'verbose_name_plural': 'Tokens de API',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_apitoken'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='notification_delivery',
+            field=models.CharField(choices=[('IMMEDIATE', 'Inmediato'), ('HOURLY', 'Resumen cada hora'), ('DAILY', 'Resumen diario')], default='IMMEDIATE', help_text='Correo por cada notificación o un resumen periódico', max_length=10, verbose_name='Envío de notificaciones'),
+        ),
+    ]
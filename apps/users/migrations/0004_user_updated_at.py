@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_profile_notification_delivery'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, help_text='Fecha y hora de última actualización (p. ej. del nombre, que imprimen los reportes)', verbose_name='Fecha de actualización'),
+        ),
+    ]
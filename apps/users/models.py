@@ -55,6 +55,11 @@ class User(AbstractUser):
         null=True,
         help_text=_('Fecha de nacimiento del usuario')
     )
+    updated_at = models.DateTimeField(
+        _('Fecha de actualización'),
+        auto_now=True,
+        help_text=_('Fecha y hora de última actualización (p. ej. del nombre, que imprimen los reportes)')
+    )
 
     groups = models.ManyToManyField(
         Group,
@@ -110,6 +115,12 @@ class Profile(AbstractBaseModel):
     """
     Perfil extendido del usuario con información adicional.
     """
+
+    class NotificationDelivery(models.TextChoices):
+        IMMEDIATE = 'IMMEDIATE', _('Inmediato')
+        HOURLY = 'HOURLY', _('Resumen cada hora')
+        DAILY = 'DAILY', _('Resumen diario')
+
     user = models.OneToOneField(
         User,
         on_delete=models.CASCADE,
@@ -139,6 +150,13 @@ class Profile(AbstractBaseModel):
         default='Colombia',
         help_text=_('País de residencia')
     )
+    notification_delivery = models.CharField(
+        _('Envío de notificaciones'),
+        max_length=10,
+        choices=NotificationDelivery.choices,
+        default=NotificationDelivery.IMMEDIATE,
+        help_text=_('Correo por cada notificación o un resumen periódico')
+    )
 
     def clean(self):
         """Validación personalizada de campos."""
@@ -160,4 +178,50 @@ class Profile(AbstractBaseModel):
         return f"Perfil de {self.user.get_full_name()}"
 
 
-__all__ = ['User', 'Profile']
+class ApiToken(AbstractBaseModel):
+    """
+    Token de acceso a la API.
+
+    Solo se guarda el SHA-256 de la clave: un digest rápido basta porque la
+    clave es aleatoria (no un password elegido por el usuario), y así la
+    autenticación por petición no paga el coste de PBKDF2.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='api_tokens',
+        verbose_name=_('Usuario')
+    )
+    name = models.CharField(
+        _('Nombre'),
+        max_length=100,
+        blank=True,
+        help_text=_('Descripción de la integración que usa el token')
+    )
+    key_prefix = models.CharField(
+        _('Prefijo'),
+        max_length=8,
+        help_text=_('Primeros caracteres de la clave, para identificarla')
+    )
+    key_hash = models.CharField(
+        _('Hash de la clave'),
+        max_length=64,
+        unique=True
+    )
+    expires_at = models.DateTimeField(
+        _('Expira'),
+        blank=True,
+        null=True,
+        help_text=_('Vacío para un token sin expiración')
+    )
+
+    class Meta:
+        verbose_name = _('Token de API')
+        verbose_name_plural = _('Tokens de API')
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.key_prefix}… ({self.user.username})"
+
+
+__all__ = ['User', 'Profile', 'ApiToken']
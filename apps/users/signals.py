@@ -1,7 +1,9 @@
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from apps.users.models import ApiToken
+
 User = get_user_model()
 
 
@@ -41,6 +43,25 @@ def save_user_profile(sender, instance, **kwargs):
         pass
 
 
+@receiver(post_save, sender=User)
+def invalidate_api_tokens_on_deactivation(sender, instance, created, **kwargs):
+    """Olvidar los tokens cacheados de un usuario desactivado."""
+    if not created and not instance.is_active:
+        from apps.users.tokens import invalidate_user_tokens
+
+        invalidate_user_tokens([instance.pk])
+
+
+@receiver(post_save, sender=ApiToken)
+@receiver(post_delete, sender=ApiToken)
+def invalidate_api_token_cache(sender, instance, created=False, **kwargs):
+    """Olvidar en caché un token modificado o borrado (también en cascada)."""
+    if not created:
+        from apps.users.tokens import invalidate_tokens
+
+        invalidate_tokens([instance.key_hash])
+
+
 @receiver(post_save, sender=User)
 def send_welcome_email_on_registration(sender, instance, created, **kwargs):
     """Enviar email de bienvenida de forma asíncrona cuando se crea el usuario.
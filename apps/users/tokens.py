@@ -0,0 +1,65 @@
+"""
+Emisión, hash y caché de los tokens de API (`ApiToken`).
+
+La caché guarda `(user_id, expires_at)` bajo el digest de la clave, así una
+petición autenticada con un token ya visto no consulta la tabla de tokens.
+El usuario no se cachea: se lee por clave primaria en cada petición para que
+un borrado o un cambio de rol o de permisos se aplique de inmediato.
+"""
+import hashlib
+import secrets
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.users.models import ApiToken
+
+CACHE_KEY_PREFIX = 'api_token'
+
+
+def hash_token_key(key):
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def token_cache_key(key_hash):
+    return f'{CACHE_KEY_PREFIX}:{key_hash}'
+
+
+def issue_token(user, name='', expires_at=None):
+    """Crear un token para `user`; devuelve (token, clave en claro).
+
+    La clave en claro no se guarda: solo puede mostrarse en esta respuesta.
+    """
+    key = secrets.token_urlsafe(32)
+    token = ApiToken.objects.create(
+        user=user,
+        name=name,
+        key_prefix=key[:8],
+        key_hash=hash_token_key(key),
+        expires_at=expires_at,
+    )
+    return token, key
+
+
+def cache_token_user(key_hash, user_id, expires_at):
+    cache.set(token_cache_key(key_hash), (user_id, expires_at), settings.API_TOKEN_CACHE_TIMEOUT)
+
+
+def get_cached_token_user(key_hash):
+    """Devolver `(user_id, expires_at)` si la clave está en caché, o None."""
+    return cache.get(token_cache_key(key_hash))
+
+
+def invalidate_tokens(key_hashes):
+    cache.delete_many([token_cache_key(key_hash) for key_hash in key_hashes])
+
+
+def invalidate_user_tokens(user_ids):
+    """Olvidar en caché los tokens de los usuarios dados (p.ej. al desactivarlos)."""
+    invalidate_tokens(ApiToken.objects.filter(
+        user_id__in=user_ids).values_list('key_hash', flat=True))
+
+
+def revoke_token(token):
+    invalidate_tokens([token.key_hash])
+    token.delete()
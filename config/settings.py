@@ -6,6 +6,7 @@ como Render (usar `DATABASE_URL`, `CELERY_BROKER_URL`, etc. en el entorno).
 
 from pathlib import Path
 
+from celery.schedules import crontab
 from decouple import Csv, config
 
 # Build paths
@@ -52,6 +53,7 @@ INSTALLED_APPS = [
 PIPELINE = {}
 
 MIDDLEWARE = [
+    'apps.core.instrumentation.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # serve static files
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -110,6 +112,44 @@ if DATABASE_URL:
     DATABASES['default'] = dj_database_url.parse(
         DATABASE_URL, conn_max_age=600)
 
+# Cache: memoria local por defecto; en producción usar Redis (`REDIS_CACHE_URL`)
+# para que la caché sea compartida entre workers.
+REDIS_CACHE_URL = config('REDIS_CACHE_URL', default='')
+if REDIS_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Segundos que se conservan en caché las estadísticas de calificaciones
+GRADE_STATS_CACHE_TIMEOUT = config('GRADE_STATS_CACHE_TIMEOUT', default=300, cast=int)
+# Segundos que se recuerda en caché el token de API resuelto (el usuario se lee siempre)
+API_TOKEN_CACHE_TIMEOUT = config('API_TOKEN_CACHE_TIMEOUT', default=300, cast=int)
+# Contador de notificaciones sin leer por usuario (apps.notifications.counters):
+# expiración de la clave y cada cuántos segundos se reconcilia con la base de datos
+NOTIFICATION_UNREAD_CACHE_TIMEOUT = config('NOTIFICATION_UNREAD_CACHE_TIMEOUT', default=86400, cast=int)
+NOTIFICATION_UNREAD_RECONCILE_INTERVAL = config('NOTIFICATION_UNREAD_RECONCILE_INTERVAL', default=900, cast=int)
+# Stream SSE de notificaciones (apps.notifications.streams): pub/sub de Redis para
+# recibir los avisos de los workers (vacío = en memoria del proceso), segundos
+# entre keepalives y espera de reconexión sugerida al navegador
+NOTIFICATION_STREAM_REDIS_URL = config('NOTIFICATION_STREAM_REDIS_URL', default='')
+NOTIFICATION_STREAM_HEARTBEAT = config('NOTIFICATION_STREAM_HEARTBEAT', default=15, cast=float)
+NOTIFICATION_STREAM_RETRY_MS = config('NOTIFICATION_STREAM_RETRY_MS', default=3000, cast=int)
+
+# Instrumentación SQL por petición (apps.core.instrumentation). Con
+# QUERY_BUDGET_STRICT, superar el presupuesto de consultas de una vista lanza
+# una excepción en lugar de registrar un warning (los tests lo activan).
+SQL_INSTRUMENTATION_ENABLED = config('SQL_INSTRUMENTATION_ENABLED', default=True, cast=bool)
+QUERY_BUDGET_STRICT = config('QUERY_BUDGET_STRICT', default=False, cast=bool)
+
 # Password validation (default Django validators)
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -139,6 +179,16 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Reportes generados en segundo plano (apps.reports). Fuera de MEDIA_ROOT:
+# solo se descargan a través de la API, que comprueba el propietario.
+REPORTS_ROOT = config('REPORTS_ROOT', default=str(BASE_DIR / 'private' / 'reports'))
+# Procesos para renderizar boletines en lote (0 = uno por núcleo disponible)
+REPORT_CARD_WORKERS = config('REPORT_CARD_WORKERS', default=0, cast=int)
+# Caché de reportes por huella de datos (vacío = REPORTS_ROOT/cache) y su tope
+# en bytes; al superarlo se borran los menos usados. 0 desactiva la caché.
+REPORT_CACHE_DIR = config('REPORT_CACHE_DIR', default='')
+REPORT_CACHE_MAX_BYTES = config('REPORT_CACHE_MAX_BYTES', default=256 * 1024 * 1024, cast=int)
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -150,6 +200,7 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
+        'apps.api.authentication.HashedTokenAuthentication',
         'rest_framework.authentication.BasicAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
@@ -199,6 +250,36 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_RESULT_EXTENDED = True
 
+# Retención de notificaciones leídas (apps.notifications.retention): antigüedad
+# en días, archivar en lugar de borrar, filas por transacción y pausa entre rangos
+NOTIFICATION_RETENTION_DAYS = config('NOTIFICATION_RETENTION_DAYS', default=180, cast=int)
+NOTIFICATION_RETENTION_ARCHIVE = config('NOTIFICATION_RETENTION_ARCHIVE', default=False, cast=bool)
+NOTIFICATION_RETENTION_CHUNK_SIZE = config('NOTIFICATION_RETENTION_CHUNK_SIZE', default=1000, cast=int)
+NOTIFICATION_RETENTION_SLEEP = config('NOTIFICATION_RETENTION_SLEEP', default=0.05, cast=float)
+
+# Resúmenes de notificaciones por correo (Profile.notification_delivery)
+NOTIFICATION_DIGEST_HOUR = config('NOTIFICATION_DIGEST_HOUR', default=7, cast=int)
+CELERY_BEAT_SCHEDULE = {
+    'notification-digest-hourly': {
+        'task': 'apps.notifications.tasks.send_notification_digests',
+        'schedule': crontab(minute=0),
+        'args': ('HOURLY',),
+    },
+    'notification-digest-daily': {
+        'task': 'apps.notifications.tasks.send_notification_digests',
+        'schedule': crontab(minute=0, hour=NOTIFICATION_DIGEST_HOUR),
+        'args': ('DAILY',),
+    },
+    'notification-unread-reconcile': {
+        'task': 'apps.notifications.tasks.reconcile_unread_notification_counts',
+        'schedule': NOTIFICATION_UNREAD_RECONCILE_INTERVAL,
+    },
+    'notification-retention': {
+        'task': 'apps.notifications.tasks.purge_old_notifications',
+        'schedule': crontab(minute=30, hour=3),
+    },
+}
+
 # Login URLs
 LOGIN_URL = '/accounts/login/'
 LOGIN_REDIRECT_URL = '/'
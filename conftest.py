@@ -0,0 +1,32 @@
+import pytest
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('benchmarks', 'Benchmarks de rendimiento (tests/benchmarks)')
+    group.addoption('--run-benchmarks', action='store_true', default=False,
+                    help='Ejecutar los tests marcados con @pytest.mark.benchmark.')
+    group.addoption('--benchmark-scale', type=int, default=300,
+                    help='Estudiantes del conjunto de datos sintético (seed_initial_data --scale).')
+    group.addoption('--benchmark-iterations', type=int, default=20,
+                    help='Repeticiones medidas por benchmark.')
+    group.addoption('--benchmark-json', default='benchmark-results.json',
+                    help='Archivo JSON donde se escriben los resultados.')
+    group.addoption('--benchmark-baseline', default=None,
+                    help='Archivo JSON de referencia contra el que comparar.')
+    group.addoption('--benchmark-tolerance', type=float, default=0.25,
+                    help='Empeoramiento relativo admitido frente a la referencia (0.25 = 25%%).')
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--run-benchmarks'):
+        return
+    skip = pytest.mark.skip(reason='benchmark: usar --run-benchmarks')
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True)
+def strict_query_budgets(settings):
+    """En los tests, superar el presupuesto de consultas de una vista es un error."""
+    settings.QUERY_BUDGET_STRICT = True
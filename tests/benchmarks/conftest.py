@@ -0,0 +1,169 @@
+"""
+Infraestructura de los benchmarks de la API.
+
+Los benchmarks se ejecutan sobre el conjunto de datos de
+`seed_initial_data --scale` y solo con `--run-benchmarks`. Cada medición
+registra p50/p95, consultas por petición y memoria pico; al final de la
+sesión los resultados se escriben en `--benchmark-json` y, si se indica
+`--benchmark-baseline`, se comparan con la referencia.
+"""
+import json
+import math
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.management.commands.scale_helpers import (COURSE_CODE_PREFIX,
+                                                         USERNAME_PREFIX,
+                                                         seed_scale_dataset)
+from apps.courses.models import Classroom, Course
+from apps.notifications.models import Notification
+
+User = get_user_model()
+
+BENCHMARK_NOTIFICATIONS = 200
+
+
+def percentile(values, pct):
+    """Percentil por rango más cercano."""
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+class BenchmarkRunner:
+    """Ejecuta y mide benchmarks; acumula los resultados de la sesión."""
+
+    # Métricas comparadas con la referencia; las consultas no admiten tolerancia
+    TIMED_METRICS = ('p50_ms', 'p95_ms', 'peak_kib')
+
+    def __init__(self, iterations, tolerance=0.25, baseline=None, warmup=2):
+        self.iterations = iterations
+        self.tolerance = tolerance
+        self.baseline = baseline or {}
+        self.warmup = warmup
+        self.results = {}
+
+    def measure(self, name, fn, setup=None):
+        """Medir `fn`. Si hay `setup`, se llama antes de cada ejecución y su
+        resultado se pasa a `fn` (sin contar en el tiempo)."""
+        def call():
+            return fn(setup()) if setup else fn()
+
+        for _ in range(self.warmup):
+            call()
+
+        timings, queries = [], []
+        for _ in range(self.iterations):
+            argument = setup() if setup else None
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                fn(argument) if setup else fn()
+                timings.append((time.perf_counter() - start) * 1000)
+            queries.append(len(captured))
+
+        # Memoria en una ejecución aparte: tracemalloc distorsiona los tiempos
+        argument = setup() if setup else None
+        tracemalloc.start()
+        try:
+            fn(argument) if setup else fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        result = {
+            'iterations': self.iterations,
+            'p50_ms': round(percentile(timings, 50), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'mean_ms': round(statistics.fmean(timings), 3),
+            'queries': max(queries),
+            'peak_kib': round(peak / 1024, 1),
+        }
+        self.results[name] = result
+        self.check(name, result)
+        return result
+
+    def regressions(self, name, result):
+        reference = self.baseline.get(name)
+        if not reference:
+            return []
+        problems = []
+        for metric in self.TIMED_METRICS:
+            limit = reference[metric] * (1 + self.tolerance)
+            if result[metric] > limit:
+                problems.append(f'{metric} {result[metric]} > {limit:.1f} (referencia {reference[metric]})')
+        if result['queries'] > reference['queries']:
+            problems.append(f'queries {result["queries"]} > {reference["queries"]}')
+        return problems
+
+    def check(self, name, result):
+        problems = self.regressions(name, result)
+        if problems:
+            pytest.fail(f'Regresión en {name}: ' + '; '.join(problems))
+
+    def report(self, scale):
+        return {
+            'meta': {
+                'scale': scale,
+                'iterations': self.iterations,
+                'python': platform.python_version(),
+                'database': connection.vendor,
+                'created_at': datetime.now(timezone.utc).isoformat(),
+            },
+            'results': self.results,
+        }
+
+
+def load_baseline(path):
+    if not path:
+        return {}
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle).get('results', {})
+
+
+@pytest.fixture(scope='session')
+def benchmark_runner(pytestconfig):
+    config = pytestconfig
+    runner = BenchmarkRunner(
+        iterations=config.getoption('--benchmark-iterations'),
+        tolerance=config.getoption('--benchmark-tolerance'),
+        baseline=load_baseline(config.getoption('--benchmark-baseline')),
+    )
+    yield runner
+    if runner.results:
+        with open(config.getoption('--benchmark-json'), 'w', encoding='utf-8') as handle:
+            json.dump(runner.report(config.getoption('--benchmark-scale')), handle, indent=2)
+
+
+@pytest.fixture(scope='session')
+def scaled_dataset(django_db_setup, django_db_blocker, pytestconfig):
+    """Conjunto sintético compartido por todos los benchmarks de la sesión."""
+    with django_db_blocker.unblock():
+        counts = seed_scale_dataset(
+            pytestconfig.getoption('--benchmark-scale'),
+            grades_per_subject=6, attendance_days=20,
+        )
+        admin = User.objects.create_user(
+            username='bench_admin', password='bench', role=User.UserRole.ADMIN, is_staff=True)
+        student = User.objects.get(username=f'{USERNAME_PREFIX}s1')
+        teacher = User.objects.get(username=f'{USERNAME_PREFIX}t1')
+        Notification.objects.bulk_create([
+            Notification(user=student, title=f'Aviso {i}', message='Benchmark')
+            for i in range(BENCHMARK_NOTIFICATIONS)
+        ])
+        counts['notifications'] = BENCHMARK_NOTIFICATIONS
+
+    yield {'counts': counts, 'admin': admin, 'student': student, 'teacher': teacher}
+
+    with django_db_blocker.unblock():
+        Course.objects.filter(code__startswith=COURSE_CODE_PREFIX).delete()
+        Classroom.objects.filter(name__startswith=f'Aula {USERNAME_PREFIX}').delete()
+        User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+        admin.delete()
@@ -0,0 +1,110 @@
+"""
+Benchmarks de los endpoints más usados sobre el conjunto de datos escalado.
+
+    pytest tests/benchmarks --run-benchmarks --benchmark-scale 1000 \
+        --benchmark-json resultados.json --benchmark-baseline referencia.json
+"""
+import itertools
+from contextlib import closing
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from apps.academics.cache import invalidate_grade_stats
+from apps.academics.models import Grade
+from apps.courses.models import Course
+from utils.reports import ExcelReportGenerator, PDFReportGenerator
+
+User = get_user_model()
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+_course_codes = itertools.count(1)
+
+
+def _client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def _get_ok(client, url, params=None):
+    def request():
+        response = client.get(url, params or {})
+        assert response.status_code == 200, response.content
+        return response
+    return request
+
+
+@pytest.mark.parametrize('name,url,role', [
+    ('course_list', '/api/courses/', 'admin'),
+    ('grade_list', '/api/grades/', 'admin'),
+    ('grade_list_teacher', '/api/grades/', 'teacher'),
+    ('notification_list', '/api/notifications/', 'student'),
+])
+def test_list_endpoints(benchmark_runner, scaled_dataset, name, url, role):
+    result = benchmark_runner.measure(name, _get_ok(_client(scaled_dataset[role]), url))
+    assert result['queries'] > 0
+
+
+def test_grade_statistics_cold(benchmark_runner, scaled_dataset):
+    # Cada ejecución parte de la caché vacía: se mide el cálculo, no el acierto
+    request = _get_ok(_client(scaled_dataset['admin']), '/api/grades/statistics/')
+    benchmark_runner.measure(
+        'grade_statistics', lambda _: request(), setup=invalidate_grade_stats)
+
+
+def test_attendance_statistics(benchmark_runner, scaled_dataset):
+    request = _get_ok(_client(scaled_dataset['admin']), '/api/attendance/statistics/')
+    benchmark_runner.measure('attendance_statistics', request)
+
+
+def test_bulk_enroll(benchmark_runner, scaled_dataset):
+    admin = scaled_dataset['admin']
+    client = _client(admin)
+    student_ids = list(User.objects.filter(
+        username__startswith='scale_s').order_by('id').values_list('id', flat=True)[:30])
+
+    def new_course():
+        return Course.objects.create(
+            name='Curso benchmark', code=f'SCB{next(_course_codes):04d}',
+            academic_year=2025, semester=1, teacher=scaled_dataset['teacher'],
+            max_students=len(student_ids))
+
+    def enroll(course):
+        response = client.post('/api/enrollments/bulk_enroll/', {
+            'course_id': course.pk, 'student_ids': student_ids,
+        }, format='json')
+        assert response.status_code in (200, 201), response.content
+
+    benchmark_runner.measure('bulk_enroll', enroll, setup=new_course)
+
+
+def test_pdf_grade_report(benchmark_runner, scaled_dataset, settings):
+    # Medir el renderizado, no la caché de reportes
+    settings.REPORT_CACHE_MAX_BYTES = 0
+    student = scaled_dataset['student']
+
+    def render():
+        grades = Grade.objects.filter(student=student).select_related('subject')
+        response = PDFReportGenerator.generate_grade_report(student, grades)
+        with closing(response):
+            assert b''.join(response.streaming_content).startswith(b'%PDF')
+
+    benchmark_runner.measure('pdf_grade_report', render)
+
+
+def test_excel_grades_export(benchmark_runner, scaled_dataset, settings):
+    # Medir el renderizado, no la caché de reportes
+    settings.REPORT_CACHE_MAX_BYTES = 0
+    teacher = scaled_dataset['teacher']
+
+    def render():
+        grades = Grade.objects.filter(subject__teacher=teacher).select_related(
+            'student', 'subject', 'graded_by')
+        response = ExcelReportGenerator.generate_grades_excel(grades)
+        with closing(response):
+            assert b''.join(response.streaming_content)[:2] == b'PK'
+
+    benchmark_runner.measure('excel_grades_export', render)
@@ -8,7 +8,7 @@ from apps.notifications.models import Notification
 
 
 @pytest.mark.django_db
-def test_grade_creation_triggers_notification_eager_celery(settings):
+def test_grade_creation_triggers_notification_eager_celery(settings, django_capture_on_commit_callbacks):
     """Integration-style test: with Celery eager mode, creating a Grade should
     cause the signal to enqueue the task which will run immediately, creating
     a Notification for the student.
@@ -25,8 +25,9 @@ def test_grade_creation_triggers_notification_eager_celery(settings):
     subject = Subject.objects.create(name='Materia E2E', code='ME2E', course=course, teacher=teacher)
     CourseEnrollment.objects.create(student=student, course=course)
 
-    # Create grade; the post_save signal should call send_grade_notification_email.delay()
-    grade = Grade.objects.create(student=student, subject=subject, value='4.7', graded_by=teacher)
+    # Create grade; the post_save signal enqueues send_grade_notifications on commit
+    with django_capture_on_commit_callbacks(execute=True):
+        grade = Grade.objects.create(student=student, subject=subject, value='4.7', graded_by=teacher)
 
     # Because CELERY_TASK_ALWAYS_EAGER=True the task should run synchronously
     assert Notification.objects.filter(user=student, object_id=grade.id, notification_type='grade').exists()
@@ -8,7 +8,7 @@ from apps.academics.models import Grade
 
 
 @pytest.mark.django_db
-def test_notify_student_on_grade_creation_triggers_task():
+def test_notify_student_on_grade_creation_triggers_task(django_capture_on_commit_callbacks):
     User = get_user_model()
     student = User.objects.create_user(
         username='stud', email='s@example.com', password='p',
@@ -18,16 +18,16 @@ def test_notify_student_on_grade_creation_triggers_task():
     course = Course.objects.create(name='Curso A', code='CURA', academic_year=2025, semester=1)
     subject = Subject.objects.create(name='Materia A', code='MAT-A', course=course)
 
-    with patch('apps.notifications.tasks.send_grade_notification_email.delay') as mock_delay:
-        grade = Grade.objects.create(student=student, subject=subject, value='4.5')
-        # signal should import the task and call .delay with the new grade id
-        mock_delay.assert_called()
-        called_args = mock_delay.call_args[0]
-        assert called_args[0] == grade.id
+    with patch('apps.notifications.tasks.send_grade_notifications.delay') as mock_delay:
+        with django_capture_on_commit_callbacks(execute=True):
+            grade = Grade.objects.create(student=student, subject=subject, value='4.5')
+            # nothing is enqueued until the transaction commits
+            mock_delay.assert_not_called()
+        mock_delay.assert_called_once_with([grade.id])
 
 
 @pytest.mark.django_db
-def test_notify_student_signal_handles_task_exception():
+def test_notify_student_signal_handles_task_exception(django_capture_on_commit_callbacks):
     """If the task's .delay raises, the signal should swallow the exception."""
     User = get_user_model()
     student = User.objects.create_user(
@@ -38,14 +38,15 @@ def test_notify_student_signal_handles_task_exception():
     course = Course.objects.create(name='Curso B', code='CURB', academic_year=2025, semester=1)
     subject = Subject.objects.create(name='Materia B', code='MAT-B', course=course)
 
-    with patch('apps.notifications.tasks.send_grade_notification_email.delay', side_effect=Exception('boom')) as mock_delay:
+    with patch('apps.notifications.tasks.send_grade_notifications.delay', side_effect=Exception('boom')) as mock_delay:
         # Should not raise despite .delay raising internally
-        Grade.objects.create(student=student, subject=subject, value='3.7')
+        with django_capture_on_commit_callbacks(execute=True):
+            Grade.objects.create(student=student, subject=subject, value='3.7')
         assert mock_delay.called
 
 
 @pytest.mark.django_db
-def test_notify_student_via_update_or_create_triggers_task():
+def test_notify_student_via_update_or_create_triggers_task(django_capture_on_commit_callbacks):
     User = get_user_model()
     student = User.objects.create_user(
         username='stud3', email='s3@example.com', password='p',
@@ -55,9 +56,10 @@ def test_notify_student_via_update_or_create_triggers_task():
     course = Course.objects.create(name='Curso C', code='CURC', academic_year=2025, semester=1)
     subject = Subject.objects.create(name='Materia C', code='MAT-C', course=course)
 
-    with patch('apps.notifications.tasks.send_grade_notification_email.delay') as mock_delay:
-        grade, created = Grade.objects.update_or_create(
-            student=student, subject=subject, defaults={'value': '4.2'}
-        )
+    with patch('apps.notifications.tasks.send_grade_notifications.delay') as mock_delay:
+        with django_capture_on_commit_callbacks(execute=True):
+            grade, created = Grade.objects.update_or_create(
+                student=student, subject=subject, defaults={'value': '4.2'}
+            )
         assert created is True
         assert mock_delay.called
@@ -0,0 +1,66 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+
+from apps.api.access import get_access_context
+from apps.api.permissions import CoursePermission, SubjectPermission
+from apps.courses.models import Course, CourseEnrollment, Subject
+
+
+@pytest.fixture
+def student_with_courses():
+    User = get_user_model()
+    teacher = User.objects.create_user(username='ac_t', password='p', role=User.UserRole.TEACHER)
+    student = User.objects.create_user(username='ac_s', password='p', role=User.UserRole.STUDENT)
+    courses = [
+        Course.objects.create(name=f'Curso {i}', code=f'AC{i}', academic_year=2025, semester=1, teacher=teacher)
+        for i in range(4)
+    ]
+    for course in courses[:2]:
+        CourseEnrollment.objects.create(student=student, course=course)
+    subjects = [
+        Subject.objects.create(name=f'Materia {i}', code=f'AC-M{i}', course=course, teacher=teacher)
+        for i, course in enumerate(courses)
+    ]
+    return student, courses, subjects
+
+
+def _drf_request(user):
+    request = Request(RequestFactory().get('/'))
+    request.user = user
+    return request
+
+
+@pytest.mark.django_db
+def test_object_permissions_share_one_enrollment_query(student_with_courses):
+    student, courses, subjects = student_with_courses
+    request = _drf_request(student)
+
+    with CaptureQueriesContext(connection) as ctx:
+        course_results = [CoursePermission().has_object_permission(request, None, c) for c in courses]
+        subject_results = [SubjectPermission().has_object_permission(request, None, s) for s in subjects]
+
+    assert course_results == [True, True, False, False]
+    assert subject_results == [True, True, False, False]
+    assert len(ctx.captured_queries) == 1
+    assert get_access_context(request) is get_access_context(request)
+
+
+@pytest.mark.django_db
+def test_course_detail_reuses_enrollments_from_queryset(student_with_courses):
+    student, courses, _ = student_with_courses
+    client = APIClient()
+    client.force_authenticate(user=student)
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert client.get(f'/api/courses/{courses[0].id}/').status_code == 200
+    enrollment_queries = [
+        q for q in ctx.captured_queries if 'FROM "courses_courseenrollment"' in q['sql']
+    ]
+    assert len(enrollment_queries) == 1
+
+    assert client.get(f'/api/courses/{courses[3].id}/').status_code == 404
@@ -1,4 +1,4 @@
-from apps.api.v1.helpers import normalize_student_ids
+from apps.api.v1.helpers import normalize_student_ids, partition_enrollment_candidates
 
 
 def test_normalize_from_list_of_ints():
@@ -16,3 +16,21 @@ def test_normalize_from_single_value():
 
 def test_normalize_skips_invalid_values():
     assert normalize_student_ids(['1', 'a', None, '2']) == [1, 2]
+
+
+def test_partition_enrollment_candidates_reports_errors_in_order():
+    enrolled, errors = partition_enrollment_candidates(
+        [1, 2, 3, 4, 5], valid_ids={1, 2, 3, 5}, already_enrolled={2}, remaining=1)
+    assert enrolled == [1]
+    assert errors == [
+        {'student_id': 2, 'error': 'Ya inscrito'},
+        {'student_id': 3, 'error': 'El curso ha alcanzado su capacidad máxima.'},
+        {'student_id': 4, 'error': 'Estudiante no encontrado'},
+        {'student_id': 5, 'error': 'El curso ha alcanzado su capacidad máxima.'},
+    ]
+
+
+def test_partition_enrollment_candidates_without_limit():
+    enrolled, errors = partition_enrollment_candidates([3, 1], {1, 3}, set())
+    assert enrolled == [3, 1]
+    assert errors == []
@@ -252,6 +252,69 @@ class TestGradeAPI:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data) > 0
 
+    def test_bulk_grades_json_reports_row_errors(
+            self,
+            api_client,
+            teacher_user,
+            student_user,
+            setup_grade_data,
+            django_assert_max_num_queries):
+        """Test: Carga masiva JSON inserta filas válidas y reporta errores."""
+        subject = setup_grade_data['subject']
+        outsider = User.objects.create_user(
+            username='outsider', password='pass123', role=User.UserRole.STUDENT)
+        rows = [
+            {'student': student_user.id, 'subject': subject.id, 'value': '4.5'},
+            {'student': outsider.id, 'subject': subject.id, 'value': '3.0'},
+            {'student': student_user.id, 'subject': subject.id, 'value': '7.0'},
+            {'student': student_user.id, 'subject': 999999, 'value': '4.0'},
+        ] + [
+            {'student': student_user.id, 'subject': subject.id, 'value': '3.5',
+             'grade_type': 'QUIZ', 'weight': '10'}
+        ] * 50
+
+        api_client.force_authenticate(user=teacher_user)
+        with django_assert_max_num_queries(6):
+            response = api_client.post('/api/grades/bulk/', rows, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['created_count'] == 51
+        assert [e['row'] for e in response.data['errors']] == [1, 2, 3]
+        assert 'value' in response.data['errors'][1]['errors']
+        assert Grade.objects.filter(student=student_user).count() == 51
+        assert not Grade.objects.filter(student=outsider).exists()
+        assert Grade.objects.filter(grade_type='QUIZ', graded_by=teacher_user).count() == 50
+
+    def test_bulk_grades_csv(
+            self,
+            api_client,
+            teacher_user,
+            student_user,
+            setup_grade_data):
+        """Test: Carga masiva desde CSV."""
+        subject = setup_grade_data['subject']
+        body = (
+            'student,subject,value,grade_type,weight,comments\n'
+            f'{student_user.id},{subject.id},4.0,EXAM,,Bien\n'
+            f'{student_user.id},{subject.id},2.5,HOMEWORK,20,\n'
+        )
+        api_client.force_authenticate(user=teacher_user)
+        response = api_client.generic(
+            'POST', '/api/grades/bulk/', body, content_type='text/csv')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['created_count'] == 2
+        assert response.data['errors'] == []
+        grade = Grade.objects.get(grade_type='EXAM', student=student_user)
+        assert grade.weight == Decimal('100.00')
+        assert grade.comments == 'Bien'
+
+    def test_bulk_grades_forbidden_for_students(self, api_client, student_user):
+        """Test: Estudiantes no pueden cargar calificaciones."""
+        api_client.force_authenticate(user=student_user)
+        response = api_client.post('/api/grades/bulk/', [], format='json')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
     def test_create_grade_without_enrollment_fails(
             self, api_client, teacher_user, student_user):
         """Test: No se puede crear calificación sin inscripción."""
@@ -323,6 +386,42 @@ class TestEnrollmentAPI:
         assert response.data['enrolled_count'] == 3
         assert course.enrollments.count() == 3
 
+    def test_bulk_enrollment_respects_capacity_in_constant_queries(
+            self, api_client, teacher_user, django_assert_max_num_queries):
+        """Test: La inscripción masiva no supera el cupo y no hace N consultas."""
+        course = Course.objects.create(
+            name='Test Course',
+            code='TST002',
+            academic_year=2025,
+            semester=1,
+            teacher=teacher_user,
+            max_students=3
+        )
+        students = [
+            User.objects.create_user(
+                username=f'cap{i}', password='pass123',
+                role=User.UserRole.STUDENT).id
+            for i in range(5)
+        ]
+        CourseEnrollment.objects.create(student_id=students[0], course=course)
+
+        api_client.force_authenticate(user=teacher_user)
+        data = {
+            'course_id': course.id,
+            'student_ids': students + [teacher_user.id],
+        }
+        with django_assert_max_num_queries(8):
+            response = api_client.post(
+                '/api/enrollments/bulk_enroll/', data, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['enrolled_ids'] == students[1:3]
+        errors = {e['student_id']: e['error'] for e in response.data['errors']}
+        assert errors[students[0]] == 'Ya inscrito'
+        assert errors[teacher_user.id] == 'Estudiante no encontrado'
+        assert set(errors) == {students[0], students[3], students[4], teacher_user.id}
+        assert course.enrollments.count() == 3
+
     def test_enrollment_duplicate_fails(
             self, api_client, teacher_user, student_user):
         """Test: No se puede inscribir dos veces al mismo estudiante."""
@@ -0,0 +1,88 @@
+import re
+from datetime import date, timedelta
+from io import BytesIO
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from apps.academics.models import Attendance
+from apps.courses.models import Course, CourseEnrollment
+from utils.attendance_reports import build_attendance_report
+from utils.reports import PDFReportGenerator, course_attendance_reports
+
+User = get_user_model()
+PAGE = re.compile(rb'/Type /Page\b(?!s)')
+STATUSES = ['PRESENT', 'ABSENT', 'LATE', 'EXCUSED', 'PRESENT']
+
+
+@pytest.fixture
+def course_factory(db):
+    teacher = User.objects.create_user(username='ar_t', password='p', role=User.UserRole.TEACHER)
+    created = []
+
+    def make(students, days=5):
+        index = len(created)
+        course = Course.objects.create(name=f'Curso AR{index}', code=f'AR{index}', academic_year=2025,
+                                       semester=1, teacher=teacher)
+        roster = []
+        for i in range(students):
+            student = User.objects.create_user(
+                username=f'ar{index}_s{i}', password='p', role=User.UserRole.STUDENT,
+                first_name='Est', last_name=f'{students - i:02d}')
+            CourseEnrollment.objects.create(student=student, course=course)
+            roster.append(student)
+        Attendance.objects.bulk_create([
+            Attendance(student=student, course=course, date=date(2025, 3, 3) + timedelta(days=day),
+                       status=STATUSES[(i + day) % len(STATUSES)], recorded_by=teacher)
+            for i, student in enumerate(roster) for day in range(days)
+        ])
+        created.append(course)
+        return course, roster
+
+    return make
+
+
+def test_totals_are_tallied_while_building_rows():
+    records = [
+        (date(2025, 3, day), status, status.title(), '')
+        for day, status in enumerate(['PRESENT', 'ABSENT', 'LATE', 'EXCUSED', 'PRESENT'], start=1)
+    ]
+    report = build_attendance_report('Ana Ruiz', 'Curso', iter(records))
+    assert (report['total'], report['present'], report['absent'], report['late']) == (5, 2, 1, 1)
+    assert report['rows'][0] == ['01/03/2025', 'Present', '-']
+
+
+@pytest.mark.django_db
+def test_student_report_uses_one_query(course_factory, django_assert_num_queries):
+    course, roster = course_factory(students=1, days=8)
+    output = BytesIO()
+    with django_assert_num_queries(1):
+        PDFReportGenerator.write_attendance_report(
+            roster[0], Attendance.objects.filter(student=roster[0], course=course), course, output)
+    assert output.getvalue().startswith(b'%PDF')
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('students', [2, 7])
+def test_course_report_has_one_page_per_student_in_one_query(
+        course_factory, django_assert_num_queries, students):
+    course, roster = course_factory(students=students)
+    output = BytesIO()
+    with django_assert_num_queries(1):
+        PDFReportGenerator.write_course_attendance_report(course, Attendance.objects.all(), output)
+    assert len(PAGE.findall(output.getvalue())) == students
+
+    reports = list(course_attendance_reports(course, Attendance.objects.all()))
+    # Orden alfabético por apellido; cada estudiante con sus propios registros
+    assert [report['student_name'] for report in reports] == [
+        f'Est {n:02d}' for n in range(1, students + 1)]
+    assert all(report['total'] == 5 and report['course_name'] == course.name for report in reports)
+    assert reports[-1]['present'] == 2
+
+
+@pytest.mark.django_db
+def test_course_report_names_student_without_name_by_username(course_factory):
+    course, roster = course_factory(students=2)
+    User.objects.filter(pk=roster[0].pk).update(first_name='', last_name='')
+    reports = list(course_attendance_reports(course, Attendance.objects.all()))
+    assert sorted(report['student_name'] for report in reports) == ['Est 01', 'ar0_s0']
@@ -0,0 +1,82 @@
+import pytest
+
+from rest_framework.test import APIClient
+
+from django.contrib.auth import get_user_model
+
+from apps.academics.models import Attendance
+from apps.courses.models import Course, CourseEnrollment
+
+
+@pytest.fixture
+def roll_call_setup():
+    User = get_user_model()
+    teacher = User.objects.create_user(username='rc_t', email='rc_t@example.com', password='p', role=User.UserRole.TEACHER)
+    students = [
+        User.objects.create_user(username=f'rc_s{i}', email=f'rc_s{i}@example.com', password='p', role=User.UserRole.STUDENT)
+        for i in range(4)
+    ]
+    course = Course.objects.create(name='Curso RC', code='RC1', academic_year=2025, semester=1, teacher=teacher)
+    for student in students[:3]:
+        CourseEnrollment.objects.create(student=student, course=course, is_active=True)
+    client = APIClient()
+    client.force_authenticate(user=teacher)
+    return client, teacher, students, course
+
+
+@pytest.mark.django_db
+def test_roll_call_defaults_unlisted_students_to_present(roll_call_setup, django_assert_max_num_queries):
+    client, teacher, students, course = roll_call_setup
+    payload = {
+        'course': course.id,
+        'date': '2025-03-03',
+        'statuses': {str(students[0].id): 'absent', str(students[3].id): 'LATE'},
+    }
+    # curso, plantilla, upsert y recálculo del resumen mensual
+    with django_assert_max_num_queries(8):
+        resp = client.post('/api/attendance/roll_call/', payload, format='json')
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data['recorded_count'] == 3
+    assert data['summary'] == {'PRESENT': 2, 'ABSENT': 1, 'LATE': 0, 'EXCUSED': 0}
+    assert data['errors'] == [{'student_id': students[3].id, 'error': 'El estudiante no está inscrito en este curso.'}]
+
+    records = {a.student_id: a for a in Attendance.objects.filter(course=course)}
+    assert set(records) == {s.id for s in students[:3]}
+    assert records[students[0].id].status == 'ABSENT'
+    assert records[students[1].id].status == 'PRESENT'
+    assert records[students[1].id].recorded_by == teacher
+
+
+@pytest.mark.django_db
+def test_roll_call_updates_existing_records(roll_call_setup):
+    client, teacher, students, course = roll_call_setup
+    existing = Attendance.objects.create(
+        student=students[1], course=course, date='2025-03-04', status='ABSENT', notes='Nota previa')
+
+    payload = {'course': course.id, 'date': '2025-03-04', 'statuses': {str(students[1].id): 'EXCUSED'}}
+    resp = client.post('/api/attendance/roll_call/', payload, format='json')
+
+    assert resp.status_code == 200
+    assert Attendance.objects.filter(course=course, date='2025-03-04').count() == 3
+    existing.refresh_from_db()
+    assert existing.status == 'EXCUSED'
+    assert existing.notes == 'Nota previa'
+
+
+@pytest.mark.django_db
+def test_roll_call_rejects_invalid_status_and_foreign_course(roll_call_setup):
+    client, teacher, students, course = roll_call_setup
+    resp = client.post('/api/attendance/roll_call/', {
+        'course': course.id, 'date': '2025-03-05', 'statuses': {str(students[0].id): 'SICK'},
+    }, format='json')
+    assert resp.status_code == 400
+    assert not Attendance.objects.exists()
+
+    User = get_user_model()
+    other = User.objects.create_user(username='rc_o', email='rc_o@example.com', password='p', role=User.UserRole.TEACHER)
+    client.force_authenticate(user=other)
+    resp = client.post('/api/attendance/roll_call/', {'course': course.id, 'date': '2025-03-05'}, format='json')
+    assert resp.status_code == 400
+    assert 'course' in resp.json()
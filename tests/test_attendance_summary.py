@@ -0,0 +1,87 @@
+from datetime import date
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from apps.academics.models import Attendance, AttendanceMonthlySummary
+from apps.courses.models import Course, CourseEnrollment
+
+
+@pytest.fixture
+def summary_setup():
+    User = get_user_model()
+    teacher = User.objects.create_user(username='sum_t', password='p', role=User.UserRole.TEACHER)
+    students = [
+        User.objects.create_user(username=f'sum_s{i}', password='p', role=User.UserRole.STUDENT)
+        for i in range(3)
+    ]
+    course = Course.objects.create(name='Curso Sum', code='SUM1', academic_year=2025, semester=1, teacher=teacher)
+    for student in students:
+        CourseEnrollment.objects.create(student=student, course=course)
+
+    statuses = ['PRESENT', 'ABSENT', 'LATE', 'EXCUSED', 'PRESENT']
+    for month in (1, 2, 3):
+        for day in range(1, 6):
+            for i, student in enumerate(students):
+                Attendance.objects.create(
+                    student=student, course=course, date=date(2025, month, day),
+                    status=statuses[(day + i + month) % len(statuses)], recorded_by=teacher)
+    client = APIClient()
+    client.force_authenticate(user=teacher)
+    return client, teacher, students, course
+
+
+def _stats(client, **params):
+    resp = client.get('/api/attendance/statistics/', params)
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def _raw_stats(client, **params):
+    # Un filtro `status` vacío no filtra nada pero fuerza la ruta que recorre
+    # la tabla de asistencia en lugar del resumen mensual.
+    return _stats(client, status='', **params)
+
+
+@pytest.mark.django_db
+def test_summary_statistics_match_raw_after_updates_and_deletes(summary_setup):
+    client, teacher, students, course = summary_setup
+
+    record = Attendance.objects.filter(student=students[0], date=date(2025, 1, 2)).get()
+    record.status = 'ABSENT'
+    record.date = date(2025, 2, 20)
+    record.save()
+    Attendance.objects.filter(student=students[1], date=date(2025, 3, 1)).get().delete()
+
+    for params in ({}, {'student_id': students[0].id}, {'course_id': course.id, 'student': students[1].id}):
+        summary = _stats(client, **params)
+        assert summary == _raw_stats(client, **params)
+    assert len(_stats(client)) == 3
+    assert sum(m['total_count'] for m in _stats(client)) == 44
+
+
+@pytest.mark.django_db
+def test_summary_statistics_use_constant_queries(summary_setup, django_assert_num_queries):
+    client, teacher, students, course = summary_setup
+    with django_assert_num_queries(1):
+        data = _stats(client, course_id=course.id)
+    assert [m['month'] for m in data] == ['2025-01-01', '2025-02-01', '2025-03-01']
+    assert all(m['total_count'] == 15 for m in data)
+
+
+@pytest.mark.django_db
+def test_roll_call_and_rebuild_keep_summary_in_sync(summary_setup):
+    client, teacher, students, course = summary_setup
+    resp = client.post('/api/attendance/roll_call/', {
+        'course': course.id, 'date': '2025-03-02', 'statuses': {str(students[2].id): 'ABSENT'},
+    }, format='json')
+    assert resp.status_code == 200
+    assert _stats(client) == _raw_stats(client)
+
+    expected = _stats(client)
+    AttendanceMonthlySummary.objects.update(present_count=0)
+    call_command('rebuild_attendance_summaries', chunk_size=1, stdout=StringIO())
+    assert _stats(client) == expected
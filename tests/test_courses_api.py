@@ -113,3 +113,46 @@ def test_course_detail_includes_classroom_and_schedule_for_admin():
     sess = sessions[0]
     assert sess['classroom']['name'] == 'Aula 101'
     assert sess['timeslot']['start_time'] == '08:00:00'
+
+
+@pytest.mark.django_db
+def test_course_list_query_count_is_constant(django_assert_num_queries):
+    User = get_user_model()
+    admin = User.objects.create_user(
+        username='admin3',
+        email='a3@example.com',
+        password='p',
+        role=User.UserRole.ADMIN,
+        is_staff=True,
+    )
+    teacher = User.objects.create_user(
+        username='teach3', email='t3@example.com', password='p',
+        role=User.UserRole.TEACHER,
+    )
+    student = User.objects.create_user(
+        username='stud4', email='s4@example.com', password='p',
+        role=User.UserRole.STUDENT,
+    )
+
+    from apps.courses.models import TimeSlot, Classroom, CourseSession
+    room = Classroom.objects.create(name='Aula 202')
+    for i in range(8):
+        c = Course.objects.create(
+            name=f'Curso {i}', code=f'CQ{i}', academic_year=2025, semester=1,
+            teacher=teacher, max_students=1,
+        )
+        ts = TimeSlot.objects.create(day_of_week=i % 7, start_time=f'{8 + i}:00', end_time=f'{9 + i}:00')
+        CourseSession.objects.create(course=c, timeslot=ts, classroom_fk=room)
+        CourseEnrollment.objects.create(student=student, course=c)
+
+    client = APIClient()
+    client.force_authenticate(user=admin)
+
+    # count (paginación) + cursos con docente + sesiones + franjas + aulas
+    with django_assert_num_queries(5):
+        resp = client.get('/api/courses/')
+    assert resp.status_code == 200
+    results = resp.json()['results']
+    assert len(results) == 8
+    assert all(r['enrolled_count'] == 1 and r['is_full'] for r in results)
+    assert all(r['teacher_name'] == 'teach3' for r in results)
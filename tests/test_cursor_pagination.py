@@ -0,0 +1,82 @@
+import pytest
+
+from rest_framework.test import APIClient
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.academics.models import Attendance
+from apps.courses.models import Course, CourseEnrollment
+from apps.notifications.models import Notification
+
+
+def _collect(client, url, params):
+    """Seguir los enlaces `next` y devolver los ids en orden."""
+    ids = []
+    resp = client.get(url, params)
+    while True:
+        assert resp.status_code == 200
+        data = resp.json()
+        assert 'count' not in data
+        ids.extend(item['id'] for item in data['results'])
+        if not data['next']:
+            return ids
+        resp = client.get(data['next'])
+
+
+@pytest.mark.django_db
+def test_notification_cursor_pages_cover_all_rows_in_order(settings):
+    User = get_user_model()
+    user = User.objects.create_user('cur_u', 'cur_u@example.com', 'pass')
+    for i in range(45):
+        Notification.objects.create(user=user, title=f'T{i}', message='M')
+    # Mismo created_at para parte de las filas: el id debe desempatar
+    Notification.objects.filter(id__in=Notification.objects.values('id')[:10]).update(
+        created_at=Notification.objects.first().created_at)
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+    ids = _collect(client, '/api/notifications/', {'cursor': ''})
+
+    expected = list(Notification.objects.filter(user=user).order_by('-created_at', '-id').values_list('id', flat=True))
+    assert ids == expected
+
+
+@pytest.mark.django_db
+def test_attendance_cursor_page_runs_no_count_or_offset():
+    User = get_user_model()
+    admin = User.objects.create_user(username='cur_a', password='p', role=User.UserRole.ADMIN, is_staff=True)
+    student = User.objects.create_user(username='cur_s', password='p', role=User.UserRole.STUDENT)
+    course = Course.objects.create(name='Curso Cur', code='CUR1', academic_year=2025, semester=1)
+    CourseEnrollment.objects.create(student=student, course=course)
+    Attendance.objects.bulk_create([
+        Attendance(student=student, course=course, date=f'2025-01-{day:02d}') for day in range(1, 26)
+    ])
+
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    first = client.get('/api/attendance/', {'cursor': ''}).json()
+    assert [r['date'] for r in first['results']][:2] == ['2025-01-25', '2025-01-24']
+
+    with CaptureQueriesContext(connection) as ctx:
+        second = client.get(first['next']).json()
+    page_sql = ctx.captured_queries[0]['sql'].upper()
+    assert 'COUNT(' not in page_sql and 'OFFSET' not in page_sql
+    assert not any('COUNT(' in q['sql'].upper() for q in ctx.captured_queries)
+    assert [r['date'] for r in second['results']] == [f'2025-01-{day:02d}' for day in range(5, 0, -1)]
+    assert second['next'] is None
+
+
+@pytest.mark.django_db
+def test_page_number_pagination_stays_default_and_bad_cursor_404():
+    User = get_user_model()
+    user = User.objects.create_user('cur_p', 'cur_p@example.com', 'pass')
+    Notification.objects.create(user=user, title='T', message='M')
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+    data = client.get('/api/notifications/').json()
+    assert data['count'] == 1
+
+    assert client.get('/api/notifications/', {'cursor': 'nope'}).status_code == 404
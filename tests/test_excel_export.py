@@ -0,0 +1,128 @@
+import tracemalloc
+from datetime import date
+from io import BytesIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from openpyxl import load_workbook
+
+from apps.academics.models import Attendance, Grade
+from apps.courses.models import Course, CourseEnrollment, Subject
+from utils.excel import write_sheet
+from utils.reports import (GRADE_COLUMNS, ExcelReportGenerator, attendance_rows,
+                           grade_rows)
+
+User = get_user_model()
+
+
+@pytest.fixture
+def gradebook(db):
+    teacher = User.objects.create_user(username='xl_t', password='p', role=User.UserRole.TEACHER,
+                                       first_name='Doc', last_name='Ente')
+    students = [
+        User.objects.create_user(username=f'xl_s{i}', password='p', role=User.UserRole.STUDENT,
+                                 first_name='Alumno', last_name=str(i))
+        for i in range(5)
+    ]
+    course = Course.objects.create(name='Curso XL', code='XL1', academic_year=2025, semester=1, teacher=teacher)
+    subject = Subject.objects.create(name='Química', code='XL1-Q', credits=3, course=course, teacher=teacher)
+    for student in students:
+        CourseEnrollment.objects.create(student=student, course=course)
+    return {'teacher': teacher, 'students': students, 'course': course, 'subject': subject}
+
+
+def _add_grades(gradebook, count):
+    students = gradebook['students']
+    Grade.objects.bulk_create([
+        Grade(student=students[i % len(students)], subject=gradebook['subject'],
+              value=f'{(i % 50) / 10:.1f}', grade_type='QUIZ', weight='20.00',
+              graded_by=gradebook['teacher'])
+        for i in range(count)
+    ])
+
+
+def _sheet(output):
+    output.seek(0)
+    workbook = load_workbook(output)
+    return workbook, workbook.active
+
+
+@pytest.mark.django_db
+def test_grades_excel_rows_and_format(gradebook, django_assert_num_queries):
+    student = gradebook['students'][0]
+    Grade.objects.create(student=student, subject=gradebook['subject'], value='4.6',
+                         grade_type='EXAM', weight='100.00', graded_by=gradebook['teacher'])
+    Grade.objects.create(student=student, subject=gradebook['subject'], value='2.5',
+                         grade_type='QUIZ', weight='50.00', graded_by=None)
+
+    output = BytesIO()
+    with django_assert_num_queries(1):
+        written = ExcelReportGenerator.write_grades_excel(Grade.objects.order_by('id'), output)
+    assert written == 2
+
+    workbook, sheet = _sheet(output)
+    rows = list(sheet.iter_rows(values_only=True))
+    today = date.today().strftime('%Y-%m-%d')
+    assert rows[0] == ('Estudiante', 'Código', 'Materia', 'Curso', 'Tipo', 'Calificación',
+                       'Peso (%)', 'Calificado por', 'Fecha', 'Estado', 'Letra')
+    assert rows[1] == ('Alumno 0', 'xl_s0', 'Química', 'Curso XL', 'Examen', 4.6, 100.0,
+                       'Doc Ente', today, 'Aprobado', 'A')
+    assert rows[2] == ('Alumno 0', 'xl_s0', 'Química', 'Curso XL', 'Quiz', 2.5, 50.0,
+                       '-', today, 'Reprobado', 'D')
+    assert sheet.title == 'Calificaciones'
+    assert sheet['A1'].font.bold
+    assert sheet['A1'].fill.start_color.rgb.endswith('FF0000')
+    # Ancho según el valor más largo de la columna (encabezado 'Calificado por')
+    assert sheet.column_dimensions['H'].width == len('Calificado por') + 2
+    workbook.close()
+
+
+@pytest.mark.django_db
+def test_attendance_excel_rows(gradebook, django_assert_num_queries):
+    Attendance.objects.create(student=gradebook['students'][1], course=gradebook['course'],
+                              date=date(2025, 3, 4), status='LATE', notes='',
+                              recorded_by=gradebook['teacher'])
+    output = BytesIO()
+    with django_assert_num_queries(1):
+        ExcelReportGenerator.write_attendance_excel(Attendance.objects.all(), output)
+    workbook, sheet = _sheet(output)
+    assert list(sheet.iter_rows(min_row=2, values_only=True)) == [
+        ('Alumno 1', 'xl_s1', 'Curso XL', '2025-03-04', 'Tarde', '-', 'Doc Ente'),
+    ]
+    workbook.close()
+
+
+@pytest.mark.django_db
+def test_grades_excel_memory_does_not_grow_with_rows(gradebook, tmp_path):
+    def peak_for_export():
+        # Bloques y muestra pequeños para llegar al régimen estable con pocas filas;
+        # se escribe a disco para no medir el propio archivo de salida
+        with open(tmp_path / 'export.xlsx', 'wb') as output:
+            tracemalloc.start()
+            try:
+                write_sheet(output, 'Calificaciones', GRADE_COLUMNS,
+                            grade_rows(Grade.objects.all(), chunk_size=100), sample_size=100)
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+    _add_grades(gradebook, 500)
+    small = peak_for_export()
+    _add_grades(gradebook, 4500)
+    large = peak_for_export()
+    # 10x filas: el pico lo marcan el bloque de lectura y la muestra, no el total
+    assert large < small * 1.5, (small, large)
+
+
+@pytest.mark.django_db
+def test_users_without_name_fall_back_to_username(gradebook):
+    User.objects.filter(username__in=['xl_t', 'xl_s2']).update(first_name='', last_name='')
+    Grade.objects.create(student=gradebook['students'][2], subject=gradebook['subject'], value='3.0',
+                         graded_by=gradebook['teacher'])
+    Attendance.objects.create(student=gradebook['students'][2], course=gradebook['course'],
+                              date=date(2025, 3, 4), recorded_by=gradebook['teacher'])
+
+    grade = next(grade_rows(Grade.objects.all()))
+    assert (grade[0], grade[7]) == ('xl_s2', 'xl_t')
+    attendance = next(attendance_rows(Attendance.objects.all()))
+    assert (attendance[0], attendance[6]) == ('xl_s2', 'xl_t')
@@ -0,0 +1,130 @@
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.academics.models import Grade
+from apps.courses.models import Course, CourseEnrollment, Subject
+from apps.notifications import batching, tasks
+from apps.notifications.models import Notification
+
+User = get_user_model()
+
+
+@pytest.fixture
+def classroom(db, settings):
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+    teacher = User.objects.create_user(username='gb_t', email='t@gb.test', password='p',
+                                       role=User.UserRole.TEACHER)
+    course = Course.objects.create(name='Curso GB', code='GB1', academic_year=2025, semester=1, teacher=teacher)
+    subjects = [
+        Subject.objects.create(name=f'Materia {i}', code=f'GB1-{i}', course=course, teacher=teacher)
+        for i in range(4)
+    ]
+    students = []
+    for i in range(3):
+        student = User.objects.create_user(username=f'gb_s{i}', email=f's{i}@gb.test', password='p',
+                                           role=User.UserRole.STUDENT)
+        CourseEnrollment.objects.create(student=student, course=course)
+        students.append(student)
+    return {'teacher': teacher, 'students': students, 'subjects': subjects}
+
+
+@pytest.fixture
+def enqueued(monkeypatch):
+    calls = []
+    monkeypatch.setattr(tasks.send_grade_notifications, 'delay', lambda grade_ids: calls.append(grade_ids))
+    return calls
+
+
+def _publish(classroom):
+    return [
+        Grade.objects.create(student=student, subject=subject, value='4.0', graded_by=classroom['teacher'])
+        for student in classroom['students'] for subject in classroom['subjects']
+    ]
+
+
+@pytest.mark.django_db
+def test_grades_in_one_transaction_become_one_task(classroom, enqueued, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        with transaction.atomic():
+            grades = _publish(classroom)
+        assert enqueued == []
+    assert len([cb for cb in callbacks if hasattr(cb, 'grade_notification_buffer')]) == 1
+    assert len(enqueued) == 1
+    # Agrupadas por estudiante: las de cada uno van juntas
+    by_student = {grade.id: grade.student_id for grade in grades}
+    assert [by_student[grade_id] for grade_id in enqueued[0]] == sorted(by_student.values())
+
+
+@pytest.mark.django_db
+def test_rolled_back_grades_are_not_notified(classroom, enqueued, django_capture_on_commit_callbacks):
+    student, subject = classroom['students'][0], classroom['subjects'][0]
+    with django_capture_on_commit_callbacks(execute=True):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                Grade.objects.create(student=student, subject=subject, value='1.0')
+                raise RuntimeError
+        kept = Grade.objects.create(student=student, subject=subject, value='4.0')
+    assert enqueued == [[kept.id]]
+
+
+@pytest.mark.django_db
+def test_large_batches_are_split_by_student(classroom, enqueued, monkeypatch, django_capture_on_commit_callbacks):
+    monkeypatch.setattr(batching, 'STUDENTS_PER_TASK', 2)
+    with django_capture_on_commit_callbacks(execute=True):
+        grades = _publish(classroom)
+    assert [len(grade_ids) for grade_ids in enqueued] == [8, 4]
+    student_of = {grade.id: grade.student_id for grade in grades}
+    assert len({student_of[grade_id] for grade_id in enqueued[1]}) == 1
+
+
+@pytest.mark.django_db
+def test_task_sends_one_mail_per_student_over_one_connection(classroom):
+    grade_ids = [grade.id for grade in _publish(classroom)]
+    opened = []
+    get_connection = tasks.get_connection
+
+    def counting_connection(*args, **kwargs):
+        opened.append(1)
+        return get_connection(*args, **kwargs)
+
+    with mock.patch.object(tasks, 'get_connection', counting_connection):
+        with CaptureQueriesContext(connection) as queries:
+            assert tasks.send_grade_notifications(grade_ids) is True
+
+    assert len(opened) == 1
+    assert sorted(message.to[0] for message in mail.outbox) == ['s0@gb.test', 's1@gb.test', 's2@gb.test']
+    assert mail.outbox[0].subject == '4 nuevas calificaciones'
+    assert 'Materia 3' in mail.outbox[0].body
+    assert Notification.objects.filter(notification_type='grade').count() == 12
+    # Lectura de notas y de notificaciones previas, un solo INSERT, la relectura
+    # de lo insertado (para el badge) y el savepoint
+    assert len(queries) <= 6
+
+    # Reentregar la tarea no duplica notificaciones ni correos
+    tasks.send_grade_notifications(grade_ids)
+    assert Notification.objects.filter(notification_type='grade').count() == 12
+    assert len(mail.outbox) == 3
+
+
+@pytest.mark.django_db
+def test_bulk_grade_upload_enqueues_one_task(classroom, monkeypatch, django_capture_on_commit_callbacks):
+    monkeypatch.setattr(tasks.send_grade_notifications, 'delay',
+                        lambda grade_ids: tasks.send_grade_notifications.apply(args=(grade_ids,)))
+    rows = [
+        {'student': student.id, 'subject': subject.id, 'value': '3.5'}
+        for student in classroom['students'] for subject in classroom['subjects']
+    ]
+    client = APIClient()
+    client.force_authenticate(user=classroom['teacher'])
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        response = client.post('/api/grades/bulk/', rows, format='json')
+    assert response.data['created_count'] == 12
+    assert len([cb for cb in callbacks if hasattr(cb, 'grade_notification_buffer')]) == 1
+    assert len(mail.outbox) == 3
+    assert Notification.objects.filter(notification_type='grade').count() == 12
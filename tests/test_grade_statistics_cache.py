@@ -0,0 +1,97 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from apps.academics.models import Grade
+from apps.courses.models import Course, CourseEnrollment, Subject
+
+
+@pytest.fixture
+def stats_setup():
+    cache.clear()
+    User = get_user_model()
+    teacher = User.objects.create_user(username='gs_t', password='p', role=User.UserRole.TEACHER)
+    student = User.objects.create_user(username='gs_s', password='p', role=User.UserRole.STUDENT)
+    course = Course.objects.create(name='Curso GS', code='GS1', academic_year=2025, semester=1, teacher=teacher)
+    math = Subject.objects.create(name='Matemáticas', code='GS-M', course=course, teacher=teacher)
+    art = Subject.objects.create(name='Arte', code='GS-A', course=course, teacher=teacher)
+    CourseEnrollment.objects.create(student=student, course=course)
+    Grade.objects.create(student=student, subject=math, value=Decimal('4.0'), graded_by=teacher)
+    Grade.objects.create(student=student, subject=art, value=Decimal('2.0'), graded_by=teacher)
+    client = APIClient()
+    client.force_authenticate(user=teacher)
+    return client, teacher, student, math, art
+
+
+@pytest.mark.django_db
+def test_statistics_served_from_cache_without_queries(stats_setup, django_assert_num_queries):
+    client, teacher, student, math, art = stats_setup
+
+    first = client.get('/api/grades/statistics/', {'subject_id': math.id})
+    assert first['X-Cache'] == 'MISS'
+    with django_assert_num_queries(0):
+        second = client.get('/api/grades/statistics/', {'subject_id': math.id})
+    assert second['X-Cache'] == 'HIT'
+    assert second.data == first.data
+    assert first.data[0]['total_count'] == 1
+
+    # Otro filtro es otra entrada
+    assert client.get('/api/grades/statistics/', {'subject_id': art.id})['X-Cache'] == 'MISS'
+
+
+@pytest.mark.django_db
+def test_grade_change_invalidates_only_affected_subject(stats_setup, django_capture_on_commit_callbacks):
+    client, teacher, student, math, art = stats_setup
+    client.get('/api/grades/statistics/', {'subject_id': math.id})
+    client.get('/api/grades/statistics/', {'subject_id': art.id})
+    client.get('/api/grades/statistics/')
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Grade.objects.create(student=student, subject=math, value=Decimal('5.0'), graded_by=teacher)
+
+    refreshed = client.get('/api/grades/statistics/', {'subject_id': math.id})
+    assert refreshed['X-Cache'] == 'MISS'
+    assert refreshed.data[0]['total_count'] == 2
+    assert client.get('/api/grades/statistics/', {'subject_id': art.id})['X-Cache'] == 'HIT'
+    assert client.get('/api/grades/statistics/')['X-Cache'] == 'MISS'
+
+    grade = Grade.objects.filter(subject=art).get()
+    client.get('/api/grades/statistics/', {'subject_id': art.id})
+    with django_capture_on_commit_callbacks(execute=True):
+        grade.delete()
+    resp = client.get('/api/grades/statistics/', {'subject_id': art.id})
+    assert resp['X-Cache'] == 'MISS'
+    assert resp.data == []
+
+
+@pytest.mark.django_db
+def test_statistics_cache_is_scoped_by_role(stats_setup):
+    client, teacher, student, math, art = stats_setup
+    client.get('/api/grades/statistics/')
+
+    other = get_user_model().objects.create_user(username='gs_t2', password='p', role='TEACHER')
+    other_client = APIClient()
+    other_client.force_authenticate(user=other)
+    resp = other_client.get('/api/grades/statistics/')
+    assert resp['X-Cache'] == 'MISS'
+    assert resp.data == []
+
+
+@pytest.mark.django_db
+def test_moving_grade_invalidates_previous_subject(stats_setup, django_capture_on_commit_callbacks):
+    client, teacher, student, math, art = stats_setup
+    client.get('/api/grades/statistics/', {'subject_id': math.id})
+    client.get('/api/grades/statistics/', {'subject_id': art.id})
+
+    grade = Grade.objects.get(subject=math)
+    grade.subject = art
+    with django_capture_on_commit_callbacks(execute=True):
+        grade.save()
+
+    assert client.get('/api/grades/statistics/', {'subject_id': math.id})['X-Cache'] == 'MISS'
+    refreshed = client.get('/api/grades/statistics/', {'subject_id': art.id})
+    assert refreshed['X-Cache'] == 'MISS'
+    assert refreshed.data[0]['total_count'] == 2
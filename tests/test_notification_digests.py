@@ -0,0 +1,119 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core import mail
+from rest_framework.test import APIClient
+
+from apps.academics.models import Grade
+from apps.courses.models import Course, Subject
+from apps.notifications.models import Notification
+from apps.notifications.tasks import (deliver_grade_notifications,
+                                      send_notification_digests)
+from apps.users.models import Profile
+
+User = get_user_model()
+Delivery = Profile.NotificationDelivery
+
+
+@pytest.fixture
+def gradebook(db, settings):
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+    teacher = User.objects.create_user(username='dg_t', email='t@dg.test', password='p',
+                                       role=User.UserRole.TEACHER)
+    course = Course.objects.create(name='Curso DG', code='DG1', academic_year=2025, semester=1, teacher=teacher)
+    subjects = [Subject.objects.create(name=f'Materia {i}', code=f'DG1-{i}', course=course, teacher=teacher)
+                for i in range(3)]
+
+    def student(username, delivery):
+        user = User.objects.create_user(username=username, email=f'{username}@dg.test', password='p',
+                                        role=User.UserRole.STUDENT)
+        Profile.objects.filter(user=user).update(notification_delivery=delivery)
+        return user
+
+    def publish(students):
+        grades = [Grade.objects.create(student=s, subject=subject, value='4.0', graded_by=teacher)
+                  for s in students for subject in subjects]
+        deliver_grade_notifications([grade.id for grade in grades])
+        return grades
+
+    return {'student': student, 'publish': publish}
+
+
+@pytest.mark.django_db
+def test_digest_users_get_no_immediate_mail(gradebook):
+    immediate = gradebook['student']('dg_now', Delivery.IMMEDIATE)
+    hourly = gradebook['student']('dg_hourly', Delivery.HOURLY)
+    gradebook['publish']([immediate, hourly])
+
+    assert [message.to for message in mail.outbox] == [['dg_now@dg.test']]
+    assert Notification.objects.filter(user=hourly, email_pending=True).count() == 3
+    assert not Notification.objects.filter(user=immediate, email_pending=True).exists()
+
+
+@pytest.mark.django_db
+def test_digest_sends_one_mail_per_user_in_constant_queries(gradebook, django_assert_num_queries):
+    hourly = [gradebook['student'](f'dg_h{i}', Delivery.HOURLY) for i in range(2)]
+    daily = gradebook['student']('dg_daily', Delivery.DAILY)
+    gradebook['publish'](hourly + [daily])
+    assert mail.outbox == []
+
+    with django_assert_num_queries(2):
+        assert send_notification_digests('HOURLY') == 2
+    assert sorted(message.to[0] for message in mail.outbox) == ['dg_h0@dg.test', 'dg_h1@dg.test']
+    assert 'Materia 2' in mail.outbox[0].body
+    assert mail.outbox[0].subject == 'Tienes 3 notificaciones nuevas en Estudify'
+    # Los del resumen diario siguen pendientes
+    assert Notification.objects.filter(email_pending=True).count() == 3
+
+    # Con más usuarios, las mismas dos consultas
+    more = [gradebook['student'](f'dg_h{i}', Delivery.HOURLY) for i in range(2, 6)]
+    gradebook['publish'](more)
+    with django_assert_num_queries(2):
+        assert send_notification_digests('HOURLY') == 4
+
+    with django_assert_num_queries(1):
+        assert send_notification_digests('HOURLY') == 0
+    assert send_notification_digests('DAILY') == 1
+    assert not Notification.objects.filter(email_pending=True).exists()
+
+
+@pytest.mark.django_db
+def test_digest_only_clears_the_rows_it_sent(gradebook, monkeypatch):
+    from apps.notifications import tasks
+
+    hourly = gradebook['student']('dg_late', Delivery.HOURLY)
+    # Fila de id menor que se confirma como pendiente mientras sale el resumen
+    late = Notification.objects.create(user=hourly, title='Tarde', message='m', email_pending=False)
+    gradebook['publish']([hourly])
+    get_connection = tasks.get_connection
+
+    class LateCommit:
+        def send_messages(self, messages):
+            Notification.objects.filter(id=late.id).update(email_pending=True)
+            return get_connection().send_messages(messages)
+
+    monkeypatch.setattr(tasks, 'get_connection', LateCommit)
+    assert send_notification_digests('HOURLY') == 1
+    assert list(Notification.objects.filter(email_pending=True).values_list('id', flat=True)) == [late.id]
+
+
+@pytest.mark.django_db
+def test_hourly_run_flushes_users_back_on_immediate(gradebook):
+    student = gradebook['student']('dg_switch', Delivery.DAILY)
+    gradebook['publish']([student])
+    Profile.objects.filter(user=student).update(notification_delivery=Delivery.IMMEDIATE)
+    assert send_notification_digests('HOURLY') == 1
+    assert not Notification.objects.filter(email_pending=True).exists()
+
+
+@pytest.mark.django_db
+def test_preference_endpoint(gradebook):
+    student = gradebook['student']('dg_api', Delivery.IMMEDIATE)
+    client = APIClient()
+    client.force_authenticate(user=student)
+    assert client.get('/api/notifications/preferences/').data == {'notification_delivery': 'IMMEDIATE'}
+
+    response = client.patch('/api/notifications/preferences/', {'notification_delivery': 'DAILY'}, format='json')
+    assert response.status_code == 200
+    assert Profile.objects.get(user=student).notification_delivery == Delivery.DAILY
+    response = client.patch('/api/notifications/preferences/', {'notification_delivery': 'WEEKLY'}, format='json')
+    assert response.status_code == 400
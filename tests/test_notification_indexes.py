@@ -0,0 +1,70 @@
+"""
+Planes de ejecución (EXPLAIN) de las consultas de notificaciones.
+
+En Postgres se desactiva el seq scan para que el planificador no lo prefiera
+con tablas diminutas; en SQLite el plan ya refleja el índice disponible.
+"""
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+
+from apps.notifications.models import Notification
+from apps.notifications.views import NotificationListView
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user(db):
+    user = User.objects.create_user(username='idx_user', password='p')
+    Notification.objects.bulk_create([
+        Notification(user=user, title=f'N{i}', message='m', is_read=i % 2 == 0,
+                     notification_type='grade', object_id=i)
+        for i in range(20)
+    ])
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+    return user
+
+
+def _plan(queryset):
+    return queryset.explain()
+
+
+@pytest.mark.django_db
+def test_list_uses_user_created_index_without_sort(user, rf):
+    view = NotificationListView()
+    view.request = rf.get('/')
+    view.request.user = user
+    plan = _plan(view.get_queryset())
+    assert 'notif_user_created_id_idx' in plan
+    assert 'TEMP B-TREE' not in plan and 'Sort' not in plan
+
+
+@pytest.mark.django_db
+def test_unread_filters_use_partial_index(user):
+    unread = Notification.objects.filter(user=user, is_read=False)
+    assert 'notif_user_unread_idx' in _plan(unread)
+    assert unread.count() == 10
+
+
+@pytest.mark.django_db
+def test_dedupe_lookup_uses_unique_index(user):
+    plan = _plan(Notification.objects.filter(
+        user_id__in=[user.id], notification_type='grade', object_id__in=[1, 2]))
+    if connection.vendor == 'sqlite':
+        # SQLite materializa la restricción como índice automático de la tabla
+        assert 'USING INDEX' in plan and 'notification_type=? AND object_id=?' in plan
+    else:
+        assert 'notif_unique_user_type_object' in plan
+
+
+@pytest.mark.django_db
+def test_unique_constraint_rejects_duplicates_but_not_unlinked(user):
+    with pytest.raises(IntegrityError), transaction.atomic():
+        Notification.objects.create(user=user, title='dup', message='m', notification_type='grade', object_id=1)
+    # Sin object_id (NULL) no hay duplicados: p. ej. varias de bienvenida
+    Notification.objects.create(user=user, title='a', message='m')
+    Notification.objects.create(user=user, title='b', message='m')
+    assert Notification.objects.filter(user=user, object_id__isnull=True).count() == 2
@@ -0,0 +1,85 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.notifications import retention
+from apps.notifications.models import ArchivedNotification, Notification
+from apps.notifications.tasks import purge_old_notifications
+
+User = get_user_model()
+
+
+@pytest.fixture
+def history(db):
+    user = User.objects.create_user(username='ret_user', password='p')
+    old = timezone.now() - timedelta(days=400)
+
+    def make(count, is_read=True, age=old, **extra):
+        notifications = Notification.objects.bulk_create([
+            Notification(user=user, title=f'N{i}', message='m', is_read=is_read,
+                         read_at=timezone.now() if is_read else None, **extra)
+            for i in range(count)
+        ])
+        Notification.objects.filter(id__in=[n.id for n in notifications]).update(created_at=age)
+        return notifications
+
+    expired = make(7, notification_type='grade', target_url='/grades/')
+    make(2, age=timezone.now() - timedelta(days=10))   # leídas recientes
+    make(2, is_read=False)                               # sin leer
+    make(1, email_pending=True)                          # pendientes de resumen
+    return {'user': user, 'expired': expired}
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    calls = []
+    monkeypatch.setattr(retention.time, 'sleep', calls.append)
+    return calls
+
+
+@pytest.mark.django_db
+def test_deletes_only_expired_read_rows_in_chunks(history, sleeps, django_assert_max_num_queries):
+    # Por rango: ids, DELETE y el savepoint de la transacción (dos sentencias)
+    with django_assert_max_num_queries(4 * 4):
+        stats = retention.purge_notifications(days=180, archive=False, chunk_size=3, sleep=0.2)
+
+    assert stats['deleted'] == stats['processed'] == 7
+    assert stats['chunks'] == 3
+    assert stats['rows_per_second'] > 0
+    # Pausa entre rangos, no después del último (incompleto)
+    assert sleeps == [0.2, 0.2]
+    remaining = Notification.objects.filter(user=history['user'])
+    assert remaining.count() == 5
+    assert not remaining.filter(id__in=[n.id for n in history['expired']]).exists()
+    assert not ArchivedNotification.objects.exists()
+
+
+@pytest.mark.django_db
+def test_archive_mode_copies_rows_before_deleting(history, sleeps):
+    stats = retention.purge_notifications(days=180, archive=True, chunk_size=4, sleep=0)
+    assert stats['archived'] == 7 and sleeps == []
+
+    first = history['expired'][0]
+    archived = ArchivedNotification.objects.get(original_id=first.id)
+    assert (archived.user_id, archived.title, archived.notification_type, archived.target_url) == (
+        history['user'].id, 'N0', 'grade', '/grades/')
+    assert archived.notified_at < timezone.now() - timedelta(days=399)
+    assert archived.read_at is not None
+    assert ArchivedNotification.objects.count() == 7
+
+
+@pytest.mark.django_db
+def test_command_and_task_report_throughput(history, settings, sleeps):
+    settings.NOTIFICATION_RETENTION_DAYS = 180
+    out = StringIO()
+    call_command('purge_notifications', '--chunk-size', '5', '--sleep', '0', '--archive', '-v', '2', stdout=out)
+    output = out.getvalue()
+    assert 'rango 2: 7 filas' in output
+    assert '7 notificaciones archivadas en 2 rangos' in output and 'filas/s' in output
+
+    # Sin filas vencidas la tarea no procesa nada
+    assert purge_old_notifications()['processed'] == 0
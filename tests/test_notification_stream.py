@@ -0,0 +1,187 @@
+import asyncio
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncClient, Client
+
+from apps.academics.models import Grade
+from apps.courses.models import Course, Subject
+from apps.notifications import streams
+from apps.notifications.models import Notification
+from apps.notifications.tasks import deliver_grade_notifications, send_welcome_email
+from apps.users.tokens import issue_token
+
+User = get_user_model()
+URL = '/api/notifications/stream/'
+
+
+@pytest.fixture(autouse=True)
+def local_broker(settings, monkeypatch):
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+    settings.NOTIFICATION_STREAM_HEARTBEAT = 5
+    cache.clear()
+    broker = streams.LocalBroker()
+    monkeypatch.setattr(streams, 'get_broker', lambda: broker)
+    yield broker
+    cache.clear()
+
+
+@pytest.fixture
+def stream_user(db):
+    return User.objects.create_user(username='sse_user', email='sse@example.com', password='p')
+
+
+def _client(user):
+    client = AsyncClient()
+    client.force_login(user)
+    return client
+
+
+async def _next(content, timeout=2):
+    return (await asyncio.wait_for(anext(content), timeout)).decode()
+
+
+def _event(chunk):
+    fields = dict(line.split(': ', 1) for line in chunk.strip().splitlines())
+    return int(fields['id']), fields['event'], json.loads(fields['data'])
+
+
+@pytest.mark.django_db
+def test_stream_pushes_notifications_published_after_connecting(stream_user, local_broker):
+    client = _client(stream_user)
+    Notification.objects.create(user=stream_user, title='Vieja', message='ya estaba')
+
+    async def scenario():
+        response = await client.get(URL)
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'text/event-stream'
+        content = response.streaming_content
+        assert (await _next(content)).startswith('retry: ')
+
+        # Sin Last-Event-ID no se reenvía lo anterior a la conexión
+        pending = asyncio.ensure_future(_next(content))
+        await asyncio.sleep(0.05)
+        assert not pending.done()
+
+        created = await Notification.objects.acreate(user=stream_user, title='Nueva', message='hola')
+        local_broker.publish([stream_user.id])
+        event_id, event, data = _event(await pending)
+        assert (event_id, event, data['title']) == (created.id, 'notification', 'Nueva')
+
+        await content.aclose()
+
+    async_to_sync(scenario)()
+    # Al cerrar el cliente se libera su suscripción
+    assert not local_broker._subscribers
+
+
+@pytest.mark.django_db
+def test_stream_resumes_from_last_event_id(stream_user):
+    client = _client(stream_user)
+    first, second, third = [
+        Notification.objects.create(user=stream_user, title=f'N{i}', message='m') for i in range(3)]
+
+    async def scenario():
+        response = await client.get(URL, headers={'Last-Event-ID': str(first.id)})
+        content = response.streaming_content
+        await _next(content)
+        received = [_event(await _next(content))[0] for _ in range(2)]
+        await content.aclose()
+        return received
+
+    assert async_to_sync(scenario)() == [second.id, third.id]
+
+
+@pytest.mark.django_db
+def test_stream_sends_keepalive_when_idle(stream_user, settings):
+    settings.NOTIFICATION_STREAM_HEARTBEAT = 0.05
+    client = _client(stream_user)
+
+    async def scenario():
+        content = (await client.get(URL)).streaming_content
+        await _next(content)
+        chunk = await _next(content)
+        await content.aclose()
+        return chunk
+
+    assert async_to_sync(scenario)() == ': keepalive\n\n'
+
+
+@pytest.mark.django_db
+def test_stream_rereads_on_heartbeat_without_wake_up(stream_user, settings):
+    """Notificaciones creadas en otro proceso sin broker compartido llegan igual."""
+    settings.NOTIFICATION_STREAM_HEARTBEAT = 0.05
+    client = _client(stream_user)
+
+    async def scenario():
+        content = (await client.get(URL)).streaming_content
+        await _next(content)
+        created = await Notification.objects.acreate(user=stream_user, title='Otro proceso', message='m')
+        # La relectura del primer heartbeat ya la entrega; unos pocos de margen
+        for _ in range(5):
+            chunk = await _next(content)
+            if chunk != ': keepalive\n\n':
+                break
+        await content.aclose()
+        return created.id, _event(chunk)[0]
+
+    created_id, event_id = async_to_sync(scenario)()
+    assert event_id == created_id
+
+
+@pytest.mark.django_db
+def test_stream_authentication(stream_user):
+    _, key = issue_token(stream_user)
+
+    async def scenario():
+        anonymous = await AsyncClient().get(URL)
+        invalid = await AsyncClient().get(URL, headers={'Authorization': 'Token nope'})
+        response = await AsyncClient().get(URL, headers={'Authorization': f'Token {key}'})
+        await response.streaming_content.aclose()
+        return anonymous.status_code, invalid.status_code, response.status_code
+
+    assert async_to_sync(scenario)() == (401, 401, 200)
+    # Bajo WSGI un stream ocuparía un worker indefinidamente
+    client = Client()
+    client.force_login(stream_user)
+    assert client.get(URL).status_code == 501
+
+
+@pytest.mark.django_db
+def test_created_notifications_publish_after_commit(
+        stream_user, local_broker, monkeypatch, django_capture_on_commit_callbacks):
+    published = []
+    monkeypatch.setattr(local_broker, 'publish', published.append)
+    with django_capture_on_commit_callbacks(execute=True):
+        send_welcome_email(stream_user.id)
+        Notification.objects.create(user=stream_user, title='Manual', message='m')
+        assert published == []
+    assert published == [{stream_user.id}, {stream_user.id}]
+
+    teacher = User.objects.create_user(username='sse_t', password='p', role=User.UserRole.TEACHER)
+    course = Course.objects.create(name='Curso SSE', code='SSE1', academic_year=2025, semester=1, teacher=teacher)
+    subject = Subject.objects.create(name='Materia SSE', code='SSE1-M', course=course, teacher=teacher)
+    grade = Grade.objects.create(student=stream_user, subject=subject, value='4.0', graded_by=teacher)
+    published.clear()
+    with django_capture_on_commit_callbacks(execute=True):
+        deliver_grade_notifications([grade.id])
+    # bulk_create no emite post_save: la tarea publica por su cuenta
+    assert published == [{stream_user.id}]
+
+
+def test_local_broker_coalesces_wake_ups():
+    broker = streams.LocalBroker()
+
+    async def scenario():
+        async with broker.subscribe(7) as subscription:
+            assert not await subscription.wait(0.01)
+            broker.publish([7, 8])
+            broker.publish([7])
+            woken = await subscription.wait(1)
+            return woken, await subscription.wait(0.01)
+
+    assert async_to_sync(scenario)() == (True, False)
+    assert not broker._subscribers
@@ -0,0 +1,141 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from apps.academics.models import Grade
+from apps.courses.models import Course, Subject
+from apps.notifications.counters import reconcile_unread_counts, unread_count
+from apps.notifications.models import Notification
+from apps.notifications.tasks import deliver_grade_notifications, send_welcome_email
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(settings):
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def user_client(db):
+    user = User.objects.create_user(username='uc_user', email='uc@example.com', password='p')
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return user, client
+
+
+def _badge(client):
+    response = client.get('/api/notifications/unread_count/')
+    assert response.status_code == 200
+    return response.data['unread_count']
+
+
+@pytest.mark.django_db
+def test_cache_hit_runs_no_queries(user_client, django_assert_num_queries):
+    user, client = user_client
+    Notification.objects.create(user=user, title='A', message='a')
+    Notification.objects.create(user=user, title='B', message='b', is_read=True)
+
+    with django_assert_num_queries(1):
+        assert _badge(client) == 1
+    with django_assert_num_queries(0):
+        assert _badge(client) == 1
+
+
+@pytest.mark.django_db
+def test_session_authenticated_badge_fits_the_query_budget(settings, django_assert_max_num_queries):
+    """Con sesión real (no `force_authenticate`) la autenticación también consulta."""
+    settings.QUERY_BUDGET_STRICT = True
+    user = User.objects.create_user(username='uc_session', password='p')
+    Notification.objects.create(user=user, title='A', message='a')
+    client = APIClient()
+    assert client.login(username='uc_session', password='p')
+
+    with django_assert_max_num_queries(3):
+        assert _badge(client) == 1
+    with django_assert_max_num_queries(2):
+        assert _badge(client) == 1
+
+
+@pytest.mark.django_db
+def test_tasks_increment_and_views_adjust_the_counter(
+        user_client, django_capture_on_commit_callbacks, django_assert_num_queries):
+    user, client = user_client
+    assert _badge(client) == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        send_welcome_email(user.id)
+    teacher = User.objects.create_user(username='uc_t', password='p', role=User.UserRole.TEACHER)
+    course = Course.objects.create(name='Curso UC', code='UC1', academic_year=2025, semester=1, teacher=teacher)
+    subject = Subject.objects.create(name='Materia UC', code='UC1-M', course=course, teacher=teacher)
+    grades = Grade.objects.bulk_create([
+        Grade(student=user, subject=subject, value='4.0', graded_by=teacher) for _ in range(3)])
+    with django_capture_on_commit_callbacks(execute=True):
+        deliver_grade_notifications([grade.id for grade in grades])
+    with django_assert_num_queries(0):
+        assert _badge(client) == 4
+
+    notification = Notification.objects.filter(user=user).first()
+    with django_capture_on_commit_callbacks(execute=True):
+        client.patch(f'/api/notifications/{notification.id}/mark_read/')
+        # Marcar de nuevo una ya leída no descuenta dos veces
+        client.patch(f'/api/notifications/{notification.id}/mark_read/')
+    assert _badge(client) == 3
+
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post('/api/notifications/mark_all_read/')
+    with django_assert_num_queries(0):
+        assert _badge(client) == 0
+
+
+@pytest.mark.django_db
+def test_reconcile_fixes_drifted_counters(user_client):
+    user, client = user_client
+    other = User.objects.create_user(username='uc_other', password='p')
+    Notification.objects.create(user=user, title='A', message='a')
+    assert _badge(client) == 1
+    # Escrituras que no ajustan el contador
+    Notification.objects.create(user=user, title='B', message='b')
+    Notification.objects.create(user=other, title='C', message='c')
+    assert unread_count(user.id) == 1
+
+    assert reconcile_unread_counts() == 2
+    assert _badge(client) == 2
+    assert unread_count(other.id) == 1
+
+
+@pytest.mark.django_db
+def test_rows_skipped_by_the_unique_constraint_are_not_counted(
+        user_client, monkeypatch, django_capture_on_commit_callbacks):
+    from apps.notifications import tasks
+
+    user, client = user_client
+    teacher = User.objects.create_user(username='uc_t2', password='p', role=User.UserRole.TEACHER)
+    course = Course.objects.create(name='Curso UC2', code='UC2', academic_year=2025, semester=1, teacher=teacher)
+    subject = Subject.objects.create(name='Materia UC2', code='UC2-M', course=course, teacher=teacher)
+    grades = Grade.objects.bulk_create([
+        Grade(student=user, subject=subject, value='4.0', graded_by=teacher) for _ in range(3)])
+    assert _badge(client) == 0
+
+    delivery_mode = tasks.delivery_mode
+
+    def concurrent_delivery(student):
+        """Otra entrega inserta una de las filas entre la lectura previa y el INSERT."""
+        Notification.objects.create(user=user, title='Otra', message='m',
+                                    notification_type='grade', object_id=grades[0].id)
+        return delivery_mode(student)
+
+    monkeypatch.setattr(tasks, 'delivery_mode', concurrent_delivery)
+    with django_capture_on_commit_callbacks(execute=True):
+        deliver_grade_notifications([grade.id for grade in grades])
+
+    assert Notification.objects.filter(user=user).count() == 3
+    # El contador solo suma las dos filas insertadas por esta entrega
+    assert unread_count(user.id) == 2
+    # y el correo solo lleva esas dos: la otra entrega avisa de la suya
+    assert [message.subject for message in mail.outbox] == ['2 nuevas calificaciones']
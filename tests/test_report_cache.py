@@ -0,0 +1,194 @@
+import os
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory
+from rest_framework.test import APIClient
+
+from apps.academics.models import Grade
+from apps.courses.models import Course, Subject
+from apps.reports import services, tasks
+from utils.report_cache import ReportCache, report_fingerprint
+from utils.reports import ExcelReportGenerator, PDFReportGenerator
+
+User = get_user_model()
+
+
+@pytest.fixture
+def cached_reports(settings, tmp_path, monkeypatch):
+    settings.REPORTS_ROOT = str(tmp_path / 'reports')
+    settings.REPORT_CACHE_DIR = str(tmp_path / 'cache')
+    settings.REPORT_CACHE_MAX_BYTES = 10 * 1024 * 1024
+    monkeypatch.setattr(tasks.generate_report, 'delay',
+                        lambda job_id: tasks.generate_report.apply(args=(job_id,)))
+
+    teacher = User.objects.create_user(username='rc_t', password='p', role=User.UserRole.TEACHER)
+    student = User.objects.create_user(username='rc_s', password='p', role=User.UserRole.STUDENT,
+                                       first_name='Ana', last_name='Ruiz')
+    course = Course.objects.create(name='Curso RC', code='RC1', academic_year=2025, semester=1, teacher=teacher)
+    subject = Subject.objects.create(name='Fisica', code='RC1-F', credits=3, course=course, teacher=teacher)
+    grade = Grade.objects.create(student=student, subject=subject, value='4.0', grade_type='EXAM',
+                                 weight='100.00', graded_by=teacher)
+    return {'teacher': teacher, 'student': student, 'course': course, 'grade': grade,
+            'cache_dir': tmp_path / 'cache'}
+
+
+@pytest.fixture
+def render_calls(monkeypatch):
+    calls = []
+    write_grade_report = PDFReportGenerator.write_grade_report
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return write_grade_report(*args, **kwargs)
+
+    monkeypatch.setattr(PDFReportGenerator, 'write_grade_report', staticmethod(counting))
+    return calls
+
+
+def _body(response):
+    try:
+        return b''.join(response.streaming_content)
+    finally:
+        response.close()
+
+
+def _grade_report(data, request=None):
+    grades = Grade.objects.filter(student=data['student']).select_related('subject')
+    return PDFReportGenerator.generate_grade_report(data['student'], grades, request=request)
+
+
+@pytest.mark.django_db
+def test_unchanged_report_is_served_from_cache(cached_reports, render_calls):
+    first = _body(_grade_report(cached_reports))
+    second = _body(_grade_report(cached_reports))
+    assert first.startswith(b'%PDF') and first == second
+    assert len(render_calls) == 1
+    assert len(os.listdir(cached_reports['cache_dir'])) == 1
+
+
+@pytest.mark.django_db
+def test_data_change_renders_a_new_version(cached_reports, render_calls):
+    response = _grade_report(cached_reports)
+    etag = response['ETag']
+    _body(response)
+
+    grade = cached_reports['grade']
+    grade.value = '2.5'
+    grade.save()
+    response = _grade_report(cached_reports)
+    assert response['ETag'] != etag
+    _body(response)
+    assert len(render_calls) == 2
+
+    # Borrar una fila anterior no cambia el último updated_at, pero sí el conteo
+    older = Grade.objects.create(student=grade.student, subject=grade.subject, value='3.0',
+                                 grade_type='QUIZ', weight='10.00', graded_by=None)
+    Grade.objects.filter(pk=older.pk).update(updated_at=grade.updated_at.replace(year=2020))
+    before = report_fingerprint('grades', Grade.objects.all())
+    older.delete()
+    assert report_fingerprint('grades', Grade.objects.all()) != before
+
+
+@pytest.mark.django_db
+def test_renaming_printed_relations_renders_a_new_version(cached_reports):
+    def etag():
+        response = _grade_report(cached_reports)
+        response.close()
+        return response['ETag']
+
+    etags = [etag()]
+    renames = [
+        (cached_reports['grade'].subject, 'name', 'Física'),
+        (cached_reports['course'], 'name', 'Curso RC renombrado'),
+        (cached_reports['teacher'], 'first_name', 'Doc'),
+        (cached_reports['student'], 'last_name', 'Ruiz Díaz'),
+    ]
+    for instance, field, value in renames:
+        setattr(instance, field, value)
+        instance.save()
+        etags.append(etag())
+    assert len(set(etags)) == len(etags)
+
+
+@pytest.mark.django_db
+def test_empty_selection_still_renders(cached_reports):
+    # `.none()` y `__in=[]` no tienen SQL: str(queryset.query) lanza EmptyResultSet
+    for grades in (Grade.objects.none(), Grade.objects.filter(id__in=[])):
+        assert len(report_fingerprint('grades_excel', grades)) == 64
+        body = _body(ExcelReportGenerator.generate_grades_excel(grades))
+        assert body.startswith(b'PK')
+
+
+@pytest.mark.django_db
+def test_matching_etag_gets_304_without_rendering(cached_reports, render_calls):
+    response = _grade_report(cached_reports)
+    etag = response['ETag']
+    _body(response)
+    assert response['Cache-Control'] == 'private, no-cache'
+
+    request = RequestFactory().get('/', HTTP_IF_NONE_MATCH=etag)
+    not_modified = _grade_report(cached_reports, request=request)
+    assert not_modified.status_code == 304
+    assert not_modified['ETag'] == etag
+    assert len(render_calls) == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ReportCache(tmp_path, max_bytes=250)
+    for age, key in enumerate(['a', 'b', 'c']):
+        cache.store(key, lambda output: output.write(b'x' * 100))
+        os.utime(cache.path_for(key), (1000 + age, 1000 + age))
+    # El tope se superó al escribir 'c': se borró 'a', la menos usada
+    assert sorted(os.listdir(tmp_path)) == ['b', 'c']
+
+    with cache.open('b'):  # un acierto renueva 'b'
+        pass
+    cache.store('d', lambda output: output.write(b'x' * 100))
+    assert sorted(os.listdir(tmp_path)) == ['b', 'd']
+
+
+def test_failed_render_leaves_no_entry(tmp_path):
+    cache = ReportCache(tmp_path, max_bytes=1000)
+
+    def broken(output):
+        output.write(b'partial')
+        raise RuntimeError('boom')
+
+    with pytest.raises(RuntimeError):
+        cache.open_or_render('k', broken)
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.django_db
+def test_report_jobs_reuse_cache_and_support_etag(cached_reports, monkeypatch, django_capture_on_commit_callbacks):
+    renders = []
+    render_report = services.render_report
+    monkeypatch.setattr(tasks, 'render_report', lambda job, output: (renders.append(job.pk),
+                                                                     render_report(job, output)))
+    client = APIClient()
+    client.force_authenticate(user=cached_reports['student'])
+
+    job_ids = []
+    for _ in range(2):
+        with django_capture_on_commit_callbacks(execute=True):
+            response = client.post('/api/report-jobs/', {
+                'report_type': 'GRADES_PDF', 'student': cached_reports['student'].pk}, format='json')
+        job_ids.append(response.data['id'])
+    # El segundo trabajo tiene la misma huella: se copia de la caché
+    assert len(renders) == 1
+
+    response = client.get(f'/api/report-jobs/{job_ids[1]}/download/')
+    etag = response['ETag']
+    assert _body(response).startswith(b'%PDF')
+    response = client.get(f'/api/report-jobs/{job_ids[1]}/download/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db
+def test_zero_size_disables_the_cache(cached_reports, render_calls, settings):
+    settings.REPORT_CACHE_MAX_BYTES = 0
+    _body(_grade_report(cached_reports))
+    _body(_grade_report(cached_reports))
+    assert len(render_calls) == 2
+    assert not cached_reports['cache_dir'].exists()
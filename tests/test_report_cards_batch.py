@@ -0,0 +1,97 @@
+import re
+import zipfile
+from io import BytesIO, StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from apps.academics.models import Grade
+from apps.courses.models import Course, CourseEnrollment, Subject
+from apps.reports.batch import (iter_report_cards, report_card_students,
+                                write_report_cards)
+
+User = get_user_model()
+PAGE = re.compile(rb'/Type /Page\b(?!s)')
+
+
+@pytest.fixture
+def term(db):
+    teacher = User.objects.create_user(username='rc_t', password='p', role=User.UserRole.TEACHER)
+    course = Course.objects.create(name='Curso RC', code='RC1', academic_year=2025, semester=2, teacher=teacher)
+    other = Course.objects.create(name='Curso RC2', code='RC2', academic_year=2025, semester=2, teacher=teacher)
+    algebra = Subject.objects.create(name='Algebra', code='RC1-A', credits=3, course=course, teacher=teacher)
+    physics = Subject.objects.create(name='Física', code='RC2-F', credits=3, course=other, teacher=teacher)
+    students = [
+        User.objects.create_user(username=f'rc_s{i}', password='p', role=User.UserRole.STUDENT,
+                                 first_name='Est', last_name=str(i))
+        for i in range(4)
+    ]
+    for student in students[:3]:
+        CourseEnrollment.objects.create(student=student, course=course)
+    CourseEnrollment.objects.create(student=students[0], course=other)
+    CourseEnrollment.objects.create(student=students[3], course=course, is_active=False)
+    for i, student in enumerate(students):
+        for value in ('2.0', '4.0'):
+            Grade.objects.create(student=student, subject=algebra, value=value, grade_type='QUIZ',
+                                 weight='50.00', graded_by=teacher)
+    Grade.objects.create(student=students[0], subject=physics, value='5.0', grade_type='EXAM',
+                         graded_by=teacher)
+    return {'course': course, 'other': other, 'students': students}
+
+
+def _pages(content):
+    return len(PAGE.findall(content))
+
+
+@pytest.mark.django_db
+def test_cards_are_built_from_two_queries(term, django_assert_num_queries):
+    courses = Course.objects.filter(academic_year=2025, semester=2)
+    with django_assert_num_queries(2):
+        cards = list(iter_report_cards(
+            report_card_students(courses), Grade.objects.filter(subject__course__in=courses)))
+
+    # El estudiante con inscripción inactiva no recibe boletín
+    assert [card['student']['username'] for card in cards] == ['rc_s0', 'rc_s1', 'rc_s2']
+    first = cards[0]
+    assert first['student']['full_name'] == 'Est 0'
+    assert [row[0] for row in first['rows']] == ['Algebra', 'Algebra', 'Física']
+    assert first['rows'][0][1:] == ['Quiz', '2.0', '50.00', 'Reprobado']
+    assert float(first['average']) == pytest.approx(11 / 3)
+    assert len(cards[1]['rows']) == 2
+
+
+@pytest.mark.django_db
+def test_student_without_name_uses_username(term):
+    User.objects.filter(username='rc_s1').update(first_name='', last_name='')
+    cards = list(iter_report_cards(report_card_students([term['course']]), Grade.objects.all()))
+    assert [card['student']['full_name'] for card in cards] == ['Est 0', 'rc_s1', 'Est 2']
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('workers', [1, 2])
+def test_zip_contains_one_pdf_per_student(term, workers):
+    output = BytesIO()
+    count = write_report_cards(Course.objects.filter(pk=term['course'].pk), output, 'zip', workers=workers)
+    assert count == 3
+    with zipfile.ZipFile(output) as archive:
+        names = archive.namelist()
+        assert all(name.startswith('boletin_rc_s') for name in names)
+        for name in names:
+            content = archive.read(name)
+            assert content.startswith(b'%PDF')
+            assert _pages(content) == 1
+
+
+@pytest.mark.django_db
+def test_merged_pdf_and_command(term, tmp_path):
+    output = BytesIO()
+    assert write_report_cards(Course.objects.filter(pk=term['course'].pk), output, 'pdf') == 3
+    assert _pages(output.getvalue()) == 3
+
+    target = tmp_path / 'boletines.zip'
+    out = StringIO()
+    call_command('render_report_cards', year=2025, semester=2, output=str(target), workers=1, stdout=out)
+    assert '3 boletines' in out.getvalue()
+    with zipfile.ZipFile(target) as archive:
+        assert len(archive.namelist()) == 3
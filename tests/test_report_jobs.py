@@ -0,0 +1,152 @@
+from datetime import date
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from apps.academics.models import Attendance, Grade
+from apps.courses.models import Course, CourseEnrollment, Subject
+from apps.reports import tasks
+from apps.reports.models import ReportJob
+
+User = get_user_model()
+
+
+@pytest.fixture
+def report_setup(settings, tmp_path, monkeypatch):
+    settings.REPORTS_ROOT = str(tmp_path)
+    # Ejecutar la tarea en el proceso al confirmar la transacción
+    monkeypatch.setattr(tasks.generate_report, 'delay',
+                        lambda job_id: tasks.generate_report.apply(args=(job_id,)))
+
+    teacher = User.objects.create_user(username='rep_t', password='p', role=User.UserRole.TEACHER)
+    other_teacher = User.objects.create_user(username='rep_t2', password='p', role=User.UserRole.TEACHER)
+    student = User.objects.create_user(username='rep_s', password='p', role=User.UserRole.STUDENT,
+                                       first_name='Ana', last_name='Ruiz')
+    other_student = User.objects.create_user(username='rep_s2', password='p', role=User.UserRole.STUDENT)
+    course = Course.objects.create(name='Curso Rep', code='REP1', academic_year=2025, semester=1, teacher=teacher)
+    other_course = Course.objects.create(name='Curso Ajeno', code='REP2', academic_year=2025, semester=1,
+                                         teacher=other_teacher)
+    subject = Subject.objects.create(name='Álgebra', code='REP1-S1', credits=3, course=course, teacher=teacher)
+    CourseEnrollment.objects.create(student=student, course=course)
+    for value in ('4.5', '2.0', '3.5'):
+        Grade.objects.create(student=student, subject=subject, value=value, grade_type='EXAM',
+                             weight='100.00', graded_by=teacher)
+    Attendance.objects.create(student=student, course=course, date=date(2025, 3, 3),
+                              status='PRESENT', recorded_by=teacher)
+    return {
+        'teacher': teacher, 'student': student, 'other_student': other_student,
+        'course': course, 'other_course': other_course, 'subject': subject,
+    }
+
+
+def _client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def _download(client, job_id):
+    response = client.get(f'/api/report-jobs/{job_id}/download/')
+    try:
+        content = b''.join(response.streaming_content) if response.streaming else response.content
+    finally:
+        response.close()
+    return response, content
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('role,payload,signature', [
+    ('teacher', {'report_type': 'GRADES_EXCEL', 'course': 'course'}, b'PK'),
+    ('teacher', {'report_type': 'ATTENDANCE_PDF', 'student': 'student', 'course': 'course'}, b'%PDF'),
+    ('student', {'report_type': 'GRADES_PDF'}, b'%PDF'),
+    ('teacher', {'report_type': 'REPORT_CARDS_ZIP', 'course': 'course'}, b'PK'),
+    ('teacher', {'report_type': 'COURSE_ATTENDANCE_PDF', 'course': 'course'}, b'%PDF'),
+])
+def test_enqueue_poll_and_download(report_setup, django_capture_on_commit_callbacks,
+                                   role, payload, signature):
+    client = _client(report_setup[role])
+    data = {key: report_setup[value].pk if value in report_setup else value
+            for key, value in payload.items()}
+
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        response = client.post('/api/report-jobs/', data, format='json')
+    # La petición responde sin generar el reporte
+    assert response.status_code == 202, response.content
+    assert response.json()['status'] == 'PENDING'
+    assert response['Location'].endswith(f'/api/report-jobs/{response.json()["id"]}/')
+    job_id = response.json()['id']
+    assert _download(client, job_id)[0].status_code == 409
+
+    for callback in callbacks:
+        callback()
+
+    job = client.get(f'/api/report-jobs/{job_id}/').json()
+    assert job['status'] == 'SUCCESS', job
+    assert job['download_url'].endswith(f'/api/report-jobs/{job_id}/download/')
+    assert job['size'] > 0
+    assert ReportJob.objects.get(pk=job_id).task_id
+
+    response, content = _download(client, job_id)
+    assert response.status_code == 200
+    assert 'attachment' in response['Content-Disposition']
+    assert content.startswith(signature)
+    assert len(content) == job['size']
+
+
+@pytest.mark.django_db
+def test_enqueue_validates_parameters_and_scope(report_setup):
+    teacher = _client(report_setup['teacher'])
+    student = _client(report_setup['student'])
+
+    response = teacher.post('/api/report-jobs/', {
+        'report_type': 'ATTENDANCE_PDF', 'student': report_setup['student'].pk}, format='json')
+    assert response.status_code == 400
+    assert 'course' in response.json()
+
+    response = teacher.post('/api/report-jobs/', {
+        'report_type': 'GRADES_EXCEL', 'course': report_setup['other_course'].pk}, format='json')
+    assert response.status_code == 400
+
+    response = student.post('/api/report-jobs/', {
+        'report_type': 'GRADES_PDF', 'student': report_setup['other_student'].pk}, format='json')
+    assert response.status_code == 400
+
+    response = student.post('/api/report-jobs/', {
+        'report_type': 'REPORT_CARDS_PDF', 'course': report_setup['course'].pk}, format='json')
+    assert response.status_code == 400
+    assert not ReportJob.objects.exists()
+
+
+@pytest.mark.django_db
+def test_jobs_are_private_to_requester(report_setup, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        response = _client(report_setup['student']).post(
+            '/api/report-jobs/', {'report_type': 'GRADES_PDF'}, format='json')
+    job_id = response.json()['id']
+
+    other = _client(report_setup['teacher'])
+    assert other.get(f'/api/report-jobs/{job_id}/').status_code == 404
+    assert _download(other, job_id)[0].status_code == 404
+    assert other.get('/api/report-jobs/').json()['results'] == []
+
+
+@pytest.mark.django_db
+def test_task_is_idempotent_and_records_failures(report_setup, monkeypatch):
+    job = ReportJob.objects.create(
+        requested_by=report_setup['teacher'], report_type='GRADES_EXCEL',
+        course=report_setup['course'])
+    assert tasks.generate_report(job.pk) is True
+    assert tasks.generate_report(job.pk) is False
+
+    def broken(job, output):
+        raise RuntimeError('sin datos')
+
+    monkeypatch.setattr(tasks, 'render_report', broken)
+    failed = ReportJob.objects.create(
+        requested_by=report_setup['teacher'], report_type='GRADES_EXCEL')
+    assert tasks.generate_report(failed.pk) is False
+    failed.refresh_from_db()
+    assert failed.status == ReportJob.Status.FAILED
+    assert failed.error == 'sin datos'
+    assert failed.finished_at is not None
@@ -0,0 +1,81 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.academics.models import Attendance, AttendanceMonthlySummary, Grade
+from apps.core.management.commands.scale_helpers import ATTENDANCE_END, seed_scale_dataset
+from apps.courses.models import Course, CourseEnrollment, Subject
+from apps.users.models import Profile
+
+
+def _seed(students, **kwargs):
+    kwargs.setdefault('grades_per_subject', 2)
+    kwargs.setdefault('attendance_days', 3)
+    return seed_scale_dataset(students, **kwargs)
+
+
+def _delete_scale_data():
+    Course.objects.filter(code__startswith='SC').delete()
+    get_user_model().objects.filter(username__startswith='scale_').delete()
+
+
+@pytest.mark.django_db
+def test_scale_seed_builds_consistent_dataset():
+    counts = _seed(30)
+    User = get_user_model()
+
+    students = User.objects.filter(username__startswith='scale_s')
+    assert students.count() == 30
+    # Un único hash de contraseña para todos los usuarios generados
+    assert User.objects.filter(username__startswith='scale_').values('password').distinct().count() == 1
+    assert Profile.objects.filter(user__username__startswith='scale_').count() == counts['users']
+    # Docentes sin is_staff: los benchmarks miden el filtrado por ámbito del docente
+    assert not User.objects.filter(username__startswith='scale_t', is_staff=True).exists()
+
+    assert counts['courses'] == Course.objects.filter(code__startswith='SC').count() == 4
+    assert CourseEnrollment.objects.count() == 30 * 4
+    assert Subject.objects.count() == 4 * 2
+    assert Grade.objects.count() == 30 * 4 * 2 * 2
+    assert Attendance.objects.count() == 30 * 4 * 3
+    assert all(course.enrolled_count <= course.max_students for course in Course.objects.all())
+
+    # Los resúmenes mensuales cuadran con la tabla de asistencia
+    summary_total = sum(s.total_count for s in AttendanceMonthlySummary.objects.all())
+    assert summary_total == Attendance.objects.count()
+    assert counts['attendance_summaries'] == AttendanceMonthlySummary.objects.count()
+
+
+@pytest.mark.django_db
+def test_scale_seed_is_deterministic_and_uses_chunked_queries():
+    _seed(20, seed=7)
+    first = list(Grade.objects.order_by('id').values_list('value', 'grade_type'))
+    first_days = sorted(set(Attendance.objects.values_list('date', flat=True)))
+    _delete_scale_data()
+
+    with CaptureQueriesContext(connection) as small:
+        _seed(20, seed=7)
+    assert list(Grade.objects.order_by('id').values_list('value', 'grade_type')) == first
+    # Las fechas no dependen del día en que se ejecuta la semilla
+    assert sorted(set(Attendance.objects.values_list('date', flat=True))) == first_days
+    assert first_days[-1] == ATTENDANCE_END
+    _delete_scale_data()
+
+    with CaptureQueriesContext(connection) as large:
+        _seed(80, seed=7)
+    # Más filas no implican más consultas por fila: solo crecen los bloques
+    assert len(large.captured_queries) < len(small.captured_queries) + 30
+
+
+@pytest.mark.django_db
+def test_seed_command_scale_mode():
+    out = StringIO()
+    call_command('seed_initial_data', scale=10, grades_per_subject=1, attendance_days=1, stdout=out)
+    assert 'Scale seed completed' in out.getvalue()
+    assert Grade.objects.count() == 10 * 2 * 2
+
+    with pytest.raises(CommandError):
+        call_command('seed_initial_data', scale=10, stdout=StringIO())
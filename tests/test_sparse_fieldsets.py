@@ -0,0 +1,118 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.academics.models import Grade
+from apps.api.sparse import resolve_dependencies
+from apps.courses.models import Course, CourseEnrollment, Subject
+
+
+@pytest.fixture
+def graded_setup():
+    User = get_user_model()
+    teacher = User.objects.create_user(
+        username='sp_t', password='p', role=User.UserRole.TEACHER, first_name='Ana', last_name='Ruiz')
+    course = Course.objects.create(name='Curso SP', code='SP1', academic_year=2025, semester=1, teacher=teacher)
+    subject = Subject.objects.create(name='Física', code='SP-F', course=course, teacher=teacher)
+    students = []
+    for i in range(3):
+        student = User.objects.create_user(username=f'sp_s{i}', password='p', role=User.UserRole.STUDENT)
+        CourseEnrollment.objects.create(student=student, course=course)
+        Grade.objects.create(student=student, subject=subject, value=Decimal('4.0'), graded_by=teacher)
+        students.append(student)
+    client = APIClient()
+    client.force_authenticate(user=teacher)
+    return client, course
+
+
+def _results(resp):
+    data = resp.json()
+    return data.get('results', data)
+
+
+def test_resolve_dependencies_classifies_paths():
+    columns, relations, prefetches = resolve_dependencies(
+        Grade, ['value', 'student', 'subject__name', 'graded_by__get_full_name'])
+    assert columns == {'value', 'student', 'subject__name', 'graded_by'}
+    assert relations == {'subject', 'graded_by'}
+    assert prefetches == set()
+
+    columns, _, prefetches = resolve_dependencies(Course, ['name', 'sessions__timeslot'])
+    assert columns == {'name'}
+    assert prefetches == {'sessions__timeslot'}
+
+    columns, _, _ = resolve_dependencies(Grade, ['is_passing'])
+    assert columns is None
+
+
+@pytest.mark.django_db
+def test_grade_fields_trims_payload_and_projection(graded_setup):
+    client, _ = graded_setup
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get('/api/grades/', {'fields': 'id,value,subject_name'})
+    assert resp.status_code == 200
+    rows = _results(resp)
+    assert len(rows) == 3
+    assert set(rows[0]) == {'id', 'value', 'subject_name'}
+    assert rows[0]['subject_name'] == 'Física'
+
+    select = next(q['sql'] for q in ctx.captured_queries if 'academics_grade' in q['sql']
+                  and 'COUNT' not in q['sql'])
+    assert 'users_user' not in select
+    assert '"academics_grade"."comments"' not in select
+    assert '"courses_subject"."name"' in select
+    assert '"courses_subject"."description"' not in select
+
+
+@pytest.mark.django_db
+def test_grade_full_listing_uses_constant_queries(graded_setup):
+    client, _ = graded_setup
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get('/api/grades/')
+    assert resp.status_code == 200
+    row = _results(resp)[0]
+    assert row['graded_by_name'] == 'Ana Ruiz'
+    assert row['is_passing'] is True
+    # Usuario autenticado + COUNT + listado con joins: sin consultas por fila
+    assert len(ctx.captured_queries) <= 3
+
+
+@pytest.mark.django_db
+def test_omit_and_unknown_fields(graded_setup):
+    client, course = graded_setup
+
+    resp = client.get('/api/courses/', {'omit': 'sessions,description'})
+    assert resp.status_code == 200
+    row = _results(resp)[0]
+    assert 'sessions' not in row and 'description' not in row
+    assert row['enrolled_count'] == 3
+
+    resp = client.get(f'/api/courses/{course.id}/', {'fields': 'id,name'})
+    assert resp.json() == {'id': course.id, 'name': 'Curso SP'}
+
+    resp = client.get('/api/grades/', {'fields': 'id,password'})
+    assert resp.status_code == 400
+    assert 'password' in resp.json()['fields'][0]
+
+
+@pytest.mark.django_db
+def test_fields_param_does_not_trim_writes(graded_setup):
+    client, course = graded_setup
+    grade = Grade.objects.filter(subject__course=course).first()
+    payload = {'student': grade.student_id, 'subject': grade.subject_id, 'value': '3.5',
+               'weight': '1.00', 'comments': 'Parcial'}
+
+    resp = client.post('/api/grades/?fields=id', payload, format='json')
+    assert resp.status_code == 201
+    assert resp.json()['comments'] == 'Parcial'
+
+    resp = client.put(f'/api/grades/{grade.id}/?fields=id', {**payload, 'value': '2.5'}, format='json')
+    assert resp.status_code == 200
+    grade.refresh_from_db()
+    assert (grade.value, grade.comments) == (Decimal('2.5'), 'Parcial')
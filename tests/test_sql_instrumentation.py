@@ -0,0 +1,132 @@
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+from rest_framework.test import APIClient
+
+from apps.core.instrumentation import (QueryBudgetExceeded,
+                                       QueryInstrumentationMiddleware,
+                                       fingerprint, query_budget)
+
+
+def _view_with_lookups(lookups, budget=None):
+    User = get_user_model()
+
+    def view(request):
+        for pk in range(lookups):
+            User.objects.filter(pk=pk).exists()
+        return HttpResponse('ok')
+
+    return query_budget(budget)(view) if budget is not None else view
+
+
+def test_fingerprint_collapses_in_lists():
+    assert fingerprint('SELECT 1\n  FROM t WHERE id IN (%s, %s, %s)') == \
+        'SELECT 1 FROM t WHERE id IN (...)'
+
+
+@pytest.mark.django_db
+def test_middleware_reports_server_timing_and_duplicates(caplog):
+    view = _view_with_lookups(3)
+    middleware = QueryInstrumentationMiddleware(view)
+
+    with caplog.at_level(logging.INFO, logger='estudify.sql'):
+        response = middleware(RequestFactory().get('/x/'))
+
+    assert response['Server-Timing'].startswith('db;dur=')
+    assert 'desc="3 queries"' in response['Server-Timing']
+    stats = caplog.records[-1].sql_stats
+    assert stats['queries'] == 3
+    assert stats['duplicates'][0]['count'] == 3
+    assert 'users_user' in stats['slowest_sql']
+
+
+@pytest.mark.django_db
+def test_budget_fails_in_strict_mode_and_warns_otherwise(settings, caplog):
+    middleware = QueryInstrumentationMiddleware(_view_with_lookups(3, budget=2))
+    with pytest.raises(QueryBudgetExceeded, match='3 consultas'):
+        middleware(RequestFactory().get('/x/'))
+
+    settings.QUERY_BUDGET_STRICT = False
+    with caplog.at_level(logging.WARNING, logger='estudify.sql'):
+        response = middleware(RequestFactory().get('/x/'))
+    assert response.status_code == 200
+    assert 'sql budget exceeded' in caplog.records[-1].getMessage()
+
+    assert QueryInstrumentationMiddleware(_view_with_lookups(2, budget=2))(
+        RequestFactory().get('/x/')).status_code == 200
+
+
+@pytest.mark.django_db
+def test_viewset_budget_is_applied(caplog):
+    User = get_user_model()
+    admin = User.objects.create_user(username='sql_a', password='p', role=User.UserRole.ADMIN)
+    client = APIClient()
+    client.force_authenticate(user=admin)
+
+    with caplog.at_level(logging.INFO, logger='estudify.sql'):
+        response = client.get('/api/users/')
+    assert response.status_code == 200
+    assert 'Server-Timing' in response
+    stats = next(r.sql_stats for r in caplog.records if hasattr(r, 'sql_stats'))
+    assert stats['view'] == 'api:user-list'
+    assert stats['budget'] == 5
+
+
+@pytest.mark.django_db
+def test_streaming_body_queries_are_measured(settings, caplog):
+    User = get_user_model()
+
+    @query_budget(2)
+    def view(request):
+        def rows():
+            for pk in range(3):
+                yield str(User.objects.filter(pk=pk).exists())
+        return StreamingHttpResponse(rows())
+
+    middleware = QueryInstrumentationMiddleware(view)
+    response = middleware(RequestFactory().get('/x/'))
+    # Las cabeceras salen antes que el cuerpo: sin Server-Timing
+    assert 'Server-Timing' not in response
+    with pytest.raises(QueryBudgetExceeded, match='3 consultas'):
+        b''.join(response.streaming_content)
+
+    settings.QUERY_BUDGET_STRICT = False
+    with caplog.at_level(logging.INFO, logger='estudify.sql'):
+        response = middleware(RequestFactory().get('/x/'))
+        assert caplog.records == []
+        assert b''.join(response.streaming_content) == b'FalseFalseFalse'
+    assert caplog.records[0].sql_stats['queries'] == 3
+
+
+@pytest.mark.django_db
+def test_async_middleware_measures_async_views_and_streams(caplog):
+    User = get_user_model()
+
+    async def view(request):
+        await User.objects.filter(pk=1).aexists()
+        if request.path == '/stream/':
+            async def events():
+                for pk in range(2):
+                    yield str(await User.objects.filter(pk=pk).aexists())
+            return StreamingHttpResponse(events())
+        return HttpResponse('ok')
+
+    middleware = QueryInstrumentationMiddleware(view)
+
+    async def scenario():
+        response = await middleware(RequestFactory().get('/x/'))
+        stream = await middleware(RequestFactory().get('/stream/'))
+        body = [chunk async for chunk in stream.streaming_content]
+        return response, stream, body
+
+    with caplog.at_level(logging.INFO, logger='estudify.sql'):
+        response, stream, body = async_to_sync(scenario)()
+
+    assert 'desc="1 queries"' in response['Server-Timing']
+    assert 'Server-Timing' not in stream
+    assert body == [b'False', b'False']
+    assert [record.sql_stats['queries'] for record in caplog.records] == [1, 3]
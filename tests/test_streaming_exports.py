@@ -0,0 +1,79 @@
+import csv
+import io
+import json
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from apps.academics.models import Attendance, Grade
+from apps.courses.models import Course, CourseEnrollment, Subject
+
+
+@pytest.fixture
+def export_setup():
+    User = get_user_model()
+    teacher = User.objects.create_user(username='exp_t', password='p', role=User.UserRole.TEACHER)
+    other_teacher = User.objects.create_user(username='exp_t2', password='p', role=User.UserRole.TEACHER)
+    students = [
+        User.objects.create_user(username=f'exp_s{i}', password='p', role=User.UserRole.STUDENT)
+        for i in range(2)
+    ]
+    course = Course.objects.create(name='Curso Exp', code='EXP1', academic_year=2025, semester=1, teacher=teacher)
+    other_course = Course.objects.create(name='Otro', code='EXP2', academic_year=2025, semester=1, teacher=other_teacher)
+    subject = Subject.objects.create(name='Mat', code='EXP-M', course=course, teacher=teacher)
+    other_subject = Subject.objects.create(name='Bio', code='EXP-B', course=other_course, teacher=other_teacher)
+    for student in students:
+        CourseEnrollment.objects.create(student=student, course=course)
+        CourseEnrollment.objects.create(student=student, course=other_course)
+        for value in ('4.5', '2.0'):
+            Grade.objects.create(student=student, subject=subject, value=Decimal(value), graded_by=teacher)
+        Grade.objects.create(student=student, subject=other_subject, value=Decimal('3.0'), graded_by=other_teacher)
+        Attendance.objects.create(student=student, course=course, date='2025-04-01', status='LATE')
+    return teacher, students, course
+
+
+def _body(response):
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+def test_grade_export_ndjson_respects_role_scope_and_filters(export_setup):
+    teacher, students, course = export_setup
+    client = APIClient()
+    client.force_authenticate(user=teacher)
+
+    resp = client.get('/api/grades/export/')
+    assert resp.status_code == 200
+    assert resp['Content-Type'] == 'application/x-ndjson'
+    rows = [json.loads(line) for line in _body(resp).splitlines()]
+    assert len(rows) == 4
+    assert {row['subject__course_id'] for row in rows} == {course.id}
+
+    resp = client.get('/api/grades/export/', {'student': students[0].id})
+    rows = [json.loads(line) for line in _body(resp).splitlines()]
+    assert {row['student_id'] for row in rows} == {students[0].id}
+    assert sorted(row['value'] for row in rows) == ['2.0', '4.5']
+
+    client.force_authenticate(user=students[1])
+    rows = [json.loads(line) for line in _body(client.get('/api/grades/export/')).splitlines()]
+    assert len(rows) == 3
+    assert {row['student_id'] for row in rows} == {students[1].id}
+
+
+@pytest.mark.django_db
+def test_attendance_export_csv(export_setup):
+    teacher, students, course = export_setup
+    client = APIClient()
+    client.force_authenticate(user=teacher)
+
+    resp = client.get('/api/attendance/export/', {'export_format': 'csv'})
+    assert resp.status_code == 200
+    assert 'attachment; filename="asistencias_' in resp['Content-Disposition']
+    reader = list(csv.DictReader(io.StringIO(_body(resp))))
+    assert len(reader) == 2
+    assert reader[0]['status'] == 'LATE'
+    assert reader[0]['course__name'] == 'Curso Exp'
+
+    assert client.get('/api/attendance/export/', {'export_format': 'xml'}).status_code == 400
@@ -41,10 +41,10 @@ def test_send_grade_notification_email_creates_notification_and_sends_mail():
 
     grade = Grade.objects.create(student=student, subject=subject, value='4.0', graded_by=teacher)
 
-    with mock.patch('apps.notifications.tasks.send_mail') as mock_send:
+    with mock.patch('apps.notifications.tasks.get_connection') as mock_connection:
         result = send_grade_notification_email(grade.id)
         assert result is True
-        mock_send.assert_called_once()
+        mock_connection.return_value.send_messages.assert_called_once()
 
     # Check a notification was created for the student referencing the grade
     assert Notification.objects.filter(user=student, object_id=grade.id, notification_type='grade').exists()
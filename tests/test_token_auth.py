@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.users.models import ApiToken
+from apps.users.tokens import hash_token_key, issue_token
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def teacher():
+    User = get_user_model()
+    return User.objects.create_user(username='tok_t', password='p', role=User.UserRole.TEACHER)
+
+
+def _token_client(key):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+    return client
+
+
+@pytest.mark.django_db
+def test_issue_list_and_revoke_token(teacher):
+    client = APIClient()
+    client.force_authenticate(user=teacher)
+
+    resp = client.post('/api/tokens/', {'name': 'integración'}, format='json')
+    assert resp.status_code == 201
+    key = resp.json()['key']
+    token = ApiToken.objects.get(pk=resp.json()['id'])
+    assert token.key_hash == hash_token_key(key)
+    assert token.key_prefix == key[:8]
+    assert key not in token.key_hash
+
+    listed = client.get('/api/tokens/').json()
+    assert [row['id'] for row in listed] == [token.id]
+    assert 'key' not in listed[0]
+
+    token_client = _token_client(key)
+    assert token_client.get('/api/users/me/').json()['username'] == 'tok_t'
+
+    assert token_client.delete(f'/api/tokens/{token.id}/').status_code == 204
+    assert token_client.get('/api/users/me/').status_code == 403
+
+
+@pytest.mark.django_db
+def test_cached_lookup_skips_database(teacher):
+    _, key = issue_token(teacher)
+    client = _token_client(key)
+    assert client.get('/api/users/me/').status_code == 200
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert client.get('/api/users/me/').status_code == 200
+    assert not any('users_apitoken' in q['sql'] for q in ctx.captured_queries)
+
+
+@pytest.mark.django_db
+def test_rejects_unknown_expired_and_deactivated(teacher):
+    assert _token_client('no-existe').get('/api/users/me/').status_code == 403
+
+    _, expired = issue_token(teacher, expires_at=timezone.now() - timedelta(minutes=1))
+    assert _token_client(expired).get('/api/users/me/').status_code == 403
+
+    _, key = issue_token(teacher)
+    client = _token_client(key)
+    assert client.get('/api/users/me/').status_code == 200
+    teacher.is_active = False
+    teacher.save()
+    assert client.get('/api/users/me/').status_code == 403
+
+
+@pytest.mark.django_db
+def test_cached_token_sees_user_changes_and_deletion(teacher):
+    _, key = issue_token(teacher)
+    client = _token_client(key)
+    assert client.get('/api/users/me/').json()['role'] == teacher.UserRole.TEACHER
+
+    teacher.role = teacher.UserRole.STUDENT
+    teacher.save()
+    assert client.get('/api/users/me/').json()['role'] == teacher.UserRole.STUDENT
+
+    teacher.delete()
+    assert client.get('/api/users/me/').status_code == 403
+    assert not cache.get(f'api_token:{hash_token_key(key)}')
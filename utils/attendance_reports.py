@@ -0,0 +1,102 @@
+"""
+Reportes de asistencia en PDF a partir de datos planos.
+
+Los totales (presentes, ausencias, tardanzas) se cuentan mientras se arman las
+filas, así que cada reporte se construye recorriendo una sola vez los
+registros. El reporte de un curso es una secuencia de estos reportes, uno por
+página.
+"""
+from datetime import datetime
+from functools import lru_cache
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import (PageBreak, Paragraph, SimpleDocTemplate,
+                                Spacer, Table, TableStyle)
+
+COLUMN_WIDTHS = [2 * inch, 2 * inch, 3 * inch]
+
+
+@lru_cache(maxsize=1)
+def attendance_report_styles():
+    """Estilos del reporte, construidos una vez por proceso."""
+    styles = getSampleStyleSheet()
+    return styles['Heading1'], styles['Normal']
+
+
+def build_attendance_report(full_name, course_name, records):
+    """Armar un reporte a partir de (fecha, estado, texto del estado, notas).
+
+    Recorre `records` una sola vez: filas y totales salen del mismo bucle.
+    """
+    rows = []
+    tally = {'PRESENT': 0, 'ABSENT': 0, 'LATE': 0}
+    for day, status, status_display, notes in records:
+        rows.append([day.strftime('%d/%m/%Y'), str(status_display), notes or '-'])
+        if status in tally:
+            tally[status] += 1
+    return {
+        'student_name': full_name,
+        'course_name': course_name,
+        'rows': rows,
+        'total': len(rows),
+        'present': tally['PRESENT'],
+        'absent': tally['ABSENT'],
+        'late': tally['LATE'],
+    }
+
+
+def attendance_report_elements(report):
+    """Flowables de un reporte de asistencia."""
+    title_style, info_style = attendance_report_styles()
+    elements = [
+        Paragraph("REPORTE DE ASISTENCIA", title_style),
+        Spacer(1, 0.2 * inch),
+    ]
+
+    # Info
+    info = [
+        f"<b>Estudiante:</b> {report['student_name']}",
+        f"<b>Curso: </b> {report['course_name']}",
+        f"<b>Fecha: </b> {datetime.now().strftime('%d/%m/%Y')}",
+    ]
+    elements.extend(Paragraph(line, info_style) for line in info)
+    elements.append(Spacer(1, 0.3 * inch))
+
+    # Tabla de asistencias
+    total, present = report['total'], report['present']
+    absent, late = report['absent'], report['late']
+    attendance_rate = ((present + late) / total * 100) if total > 0 else 0
+
+    data = [['Fecha', 'Estado', 'Notas']] + report['rows']
+    data.append(['', '', ''])
+    data.append(['ESTADÍSTICAS', '', ''])
+    data.append(['Total registros:', str(total), ''])
+    data.append(['Asistencias:', str(present), ''])
+    data.append(['Ausencias:', str(absent), ''])
+    data.append(['Tardanzas:', str(late), ''])
+    data.append(['Tasa de asistencia:', f'{attendance_rate: .1f}%', ''])
+
+    table = Table(data, colWidths=COLUMN_WIDTHS)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#FF0000')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('GRID', (0, 0), (-1, total), 1, colors.black),
+        ('BACKGROUND', (0, 1), (-1, total), colors.beige),
+    ]))
+    elements.append(table)
+    return elements
+
+
+def write_attendance_reports(reports, output):
+    """Escribir uno o varios reportes en un PDF, cada uno en su propia página."""
+    elements = []
+    for report in reports:
+        if elements:
+            elements.append(PageBreak())
+        elements.extend(attendance_report_elements(report))
+    SimpleDocTemplate(output, pagesize=letter).build(elements)
@@ -0,0 +1,61 @@
+"""
+Escritura de hojas Excel en memoria constante.
+
+Usa el modo write-only de openpyxl: cada fila se serializa a disco al
+añadirla y no se guarda ninguna celda en memoria. Como en ese modo el ancho
+de las columnas debe fijarse antes de escribir, se calcula con una muestra
+acotada de las primeras filas en lugar de recorrer toda la hoja.
+"""
+from itertools import chain, islice
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+# Filas usadas para calcular el ancho de las columnas
+WIDTH_SAMPLE_ROWS = 1000
+MAX_COLUMN_WIDTH = 50
+
+HEADER_FILL = PatternFill(start_color='FF0000', end_color='FF0000', fill_type='solid')
+HEADER_FONT = Font(color='FFFFFF', bold=True)
+HEADER_ALIGNMENT = Alignment(horizontal='center')
+
+
+def column_widths(headers, sample):
+    """Ancho de cada columna según el encabezado y las filas de muestra."""
+    widths = [len(str(header)) for header in headers]
+    for row in sample:
+        for index, value in enumerate(row):
+            widths[index] = max(widths[index], len(str(value)))
+    return [min(width + 2, MAX_COLUMN_WIDTH) for width in widths]
+
+
+def write_sheet(output, sheet_name, headers, rows, sample_size=WIDTH_SAMPLE_ROWS):
+    """Escribir `headers` y las filas del iterable `rows` en un libro nuevo.
+
+    Devuelve el número de filas de datos escritas.
+    """
+    rows = iter(rows)
+    sample = list(islice(rows, sample_size))
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+    for index, width in enumerate(column_widths(headers, sample), start=1):
+        worksheet.column_dimensions[get_column_letter(index)].width = width
+
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(worksheet, value=header)
+        cell.fill = HEADER_FILL
+        cell.font = HEADER_FONT
+        cell.alignment = HEADER_ALIGNMENT
+        header_cells.append(cell)
+    worksheet.append(header_cells)
+
+    count = 0
+    for row in chain(sample, rows):
+        worksheet.append(row)
+        count += 1
+    workbook.save(output)
+    return count
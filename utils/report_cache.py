@@ -0,0 +1,188 @@
+"""
+Caché de reportes generados, direccionada por contenido.
+
+La clave de un reporte es una huella de los datos de los que sale: la
+consulta (SQL con sus parámetros), el `updated_at` más reciente de las filas y
+de las relaciones cuyos datos se imprimen (nombres de estudiante, materia,
+curso...), el número de filas y la fecha del día (los documentos la imprimen). Si nada cambió, la
+huella coincide y el archivo se sirve de la caché sin volver a renderizarlo;
+la misma huella sirve como ETag para que el navegador revalide con un 304.
+
+Los archivos se guardan en disco (`REPORT_CACHE_DIR`) con un tope de tamaño
+(`REPORT_CACHE_MAX_BYTES`) y desalojo LRU: cada acierto actualiza la fecha de
+modificación del archivo y al escribir se borran los más antiguos.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from datetime import date
+
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet
+from django.db.models import Count, Max
+from django.http import FileResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+# Cambiar al modificar el diseño de los reportes invalida toda la caché
+REPORT_CACHE_VERSION = 1
+# Texto de consulta de los querysets que no pueden devolver filas
+EMPTY_QUERY = 'EMPTY'
+
+
+def query_text(queryset):
+    """SQL con parámetros de `queryset`; `.none()` o `__in=[]` no tienen SQL."""
+    try:
+        return str(queryset.query)
+    except EmptyResultSet:
+        return EMPTY_QUERY
+
+
+def report_fingerprint(kind, queryset, *extra, related=()):
+    """Huella de los datos de un reporte: una consulta de agregación.
+
+    `related` son las relaciones (a uno) cuyos campos imprime el reporte; su
+    `updated_at` más reciente entra en la huella para que renombrar, p. ej.,
+    una materia genere un archivo nuevo.
+    """
+    aggregates = {f'last_{index}': Max(f'{path}__updated_at') for index, path in enumerate(related)}
+    stats = queryset.order_by().aggregate(last=Max('updated_at'), count=Count('pk'), **aggregates)
+    raw = json.dumps([
+        REPORT_CACHE_VERSION,
+        kind,
+        query_text(queryset),
+        *[value.isoformat() if value else None
+          for value in [stats['last']] + [stats[name] for name in aggregates]],
+        stats['count'],
+        date.today().isoformat(),
+        *[str(value) for value in extra],
+    ])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ReportCache:
+    """Archivos de reportes en disco con tope de tamaño y desalojo LRU."""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = str(directory)
+        self.max_bytes = max_bytes
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def path_for(self, key):
+        return os.path.join(self.directory, key)
+
+    def open(self, key):
+        """Abrir el archivo de `key` si está en caché (y marcarlo como usado)."""
+        path = self.path_for(key)
+        try:
+            handle = open(path, 'rb')
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:  # desalojado entre medias; el descriptor sigue siendo válido
+            pass
+        return handle
+
+    def store(self, key, render):
+        """Renderizar con `render(output)` y guardar el resultado bajo `key`."""
+        os.makedirs(self.directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=self.directory, prefix='.tmp-', delete=False) as output:
+            try:
+                render(output)
+            except BaseException:
+                output.close()
+                os.unlink(output.name)
+                raise
+        # Reemplazo atómico: un lector nunca ve un archivo a medio escribir
+        os.replace(output.name, self.path_for(key))
+        self.evict(keep=key)
+
+    def open_or_render(self, key, render):
+        """Devolver un archivo abierto con el reporte, renderizándolo si falta."""
+        if not self.enabled:
+            output = tempfile.TemporaryFile()
+            render(output)
+            output.seek(0)
+            return output
+        handle = self.open(key)
+        if handle is None:
+            self.store(key, render)
+            handle = self.open(key)
+        return handle
+
+    def entries(self):
+        """(última vez usado, tamaño, ruta) de cada archivo en caché."""
+        try:
+            scan = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return []
+        entries = []
+        for entry in scan:
+            if entry.name.startswith('.tmp-') or not entry.is_file():
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self, keep=None):
+        """Borrar los archivos menos usados hasta quedar bajo el tope."""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        keep_path = self.path_for(keep) if keep else None
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep_path:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        return total
+
+
+def report_cache():
+    directory = getattr(settings, 'REPORT_CACHE_DIR', '') or os.path.join(
+        str(settings.REPORTS_ROOT), 'cache')
+    return ReportCache(directory, getattr(settings, 'REPORT_CACHE_MAX_BYTES', 0))
+
+
+def cached_report_response(request, key, filename, content_type, render):
+    """Respuesta de descarga servida desde la caché, con ETag.
+
+    Si el navegador envía `If-None-Match` con la misma huella, responde 304
+    sin abrir ni renderizar nada.
+    """
+    etag = quote_etag(key)
+    if request is not None:
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            return not_modified
+
+    response = FileResponse(
+        report_cache().open_or_render(key, render),
+        as_attachment=True, filename=filename, content_type=content_type,
+    )
+    response['ETag'] = etag
+    # Revalidar siempre: el contenido cambia en cuanto cambian los datos
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+__all__ = [
+    'REPORT_CACHE_VERSION',
+    'ReportCache',
+    'cached_report_response',
+    'report_cache',
+    'report_fingerprint',
+]
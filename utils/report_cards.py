@@ -0,0 +1,138 @@
+"""
+Boletines de calificaciones a partir de datos planos.
+
+Un boletín (`card`) es un dict serializable con los datos del estudiante, las
+filas de la tabla y el promedio. Así el renderizado no toca la base de datos
+y puede repartirse entre procesos (`apps.reports.batch`). Este módulo solo
+depende de ReportLab para que los procesos del pool arranquen rápido.
+"""
+from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import (PageBreak, Paragraph, SimpleDocTemplate,
+                                Spacer, Table, TableStyle)
+
+TABLE_HEADER = ['Materia', 'Tipo', 'Calificación', 'Peso %', 'Estado']
+COLUMN_WIDTHS = [2.5 * inch, 1.5 * inch, 1 * inch, 1 * inch, 1 * inch]
+TABLE_STYLE = TableStyle([
+    # Encabezado
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#FF0000')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+
+    # Cuerpo
+    ('BACKGROUND', (0, 1), (-1, -2), colors.beige),
+    ('GRID', (0, 0), (-1, -2), 1, colors.black),
+
+    # Fila de promedio
+    ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#333333')),
+    ('TEXTCOLOR', (0, -1), (-1, -1), colors.whitesmoke),
+    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+])
+
+
+@lru_cache(maxsize=1)
+def report_card_styles():
+    """Estilos del boletín, construidos una vez por proceso."""
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#FF0000'),
+        spaceAfter=30,
+        alignment=1  # Centrado
+    )
+    return title_style, styles['Normal']
+
+
+def display_name(first_name, last_name, username):
+    """Nombre completo o, si no tiene, el usuario (como `User.get_full_name`)."""
+    return f'{first_name} {last_name}'.strip() or username
+
+
+def grade_row(subject_name, grade_type_display, value, weight):
+    return [
+        subject_name,
+        str(grade_type_display),
+        str(value),
+        str(weight),
+        'Aprobado' if value >= 3 else 'Reprobado',
+    ]
+
+
+def build_report_card(full_name, username, email, rows, values):
+    """Armar un boletín; `values` son las calificaciones para el promedio."""
+    return {
+        'student': {'full_name': full_name, 'username': username, 'email': email},
+        'rows': rows,
+        'average': sum(values) / len(values) if values else None,
+    }
+
+
+def report_card_filename(card, date=None):
+    date = date or datetime.now()
+    return f'boletin_{card["student"]["username"]}_{date.strftime("%Y%m%d")}.pdf'
+
+
+def report_card_elements(card):
+    """Flowables de un boletín."""
+    title_style, info_style = report_card_styles()
+    student = card['student']
+    elements = [
+        Paragraph("BOLETÍN DE CALIFICACIONES", title_style),
+        Spacer(1, 0.2 * inch),
+    ]
+
+    # Información del estudiante
+    student_info = [
+        f"<b>Estudiante:</b> {student['full_name']}",
+        f"<b>Código: </b> {student['username']}",
+        f"<b>Email: </b> {student['email']}",
+        f"<b>Fecha: </b> {datetime.now().strftime('%d/%m/%Y')}",
+    ]
+    elements.extend(Paragraph(info, info_style) for info in student_info)
+    elements.append(Spacer(1, 0.3 * inch))
+
+    # Tabla de calificaciones
+    data = [TABLE_HEADER] + list(card['rows'])
+    if card['average'] is not None:
+        data.append(['', '', '', 'PROMEDIO:', f"{card['average']: .2f}"])
+
+    table = Table(data, colWidths=COLUMN_WIDTHS)
+    table.setStyle(TABLE_STYLE)
+    elements.append(table)
+    return elements
+
+
+def write_report_card(card, output):
+    """Escribir un boletín como PDF en `output`."""
+    SimpleDocTemplate(output, pagesize=letter).build(report_card_elements(card))
+
+
+def render_report_card(card):
+    """Renderizar un boletín y devolver (nombre de archivo, bytes del PDF).
+
+    Es la función que ejecutan los procesos del pool.
+    """
+    buffer = BytesIO()
+    write_report_card(card, buffer)
+    return report_card_filename(card), buffer.getvalue()
+
+
+def write_merged_report_cards(cards, output):
+    """Escribir todos los boletines en un único PDF, uno por página."""
+    elements = []
+    for card in cards:
+        if elements:
+            elements.append(PageBreak())
+        elements.extend(report_card_elements(card))
+    SimpleDocTemplate(output, pagesize=letter).build(elements)
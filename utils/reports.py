@@ -1,16 +1,97 @@
 from datetime import datetime
-from io import BytesIO
+from itertools import chain, groupby
+from operator import itemgetter
+
+from apps.academics.models import (PASSING_GRADE, Attendance, Grade,
+                                   letter_grade_for)
+from utils.attendance_reports import (build_attendance_report,
+                                      write_attendance_reports)
+from utils.excel import write_sheet
+from utils.report_cache import cached_report_response, report_fingerprint
+from utils.report_cards import (build_report_card, display_name, grade_row,
+                                write_report_card)
+
+PDF_CONTENT_TYPE = 'application/pdf'
+EXCEL_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+# Filas leídas por consulta al exportar a Excel
+EXPORT_CHUNK_SIZE = 2000
+
+GRADE_COLUMNS = [
+    'Estudiante', 'Código', 'Materia', 'Curso', 'Tipo', 'Calificación',
+    'Peso (%)', 'Calificado por', 'Fecha', 'Estado', 'Letra',
+]
+ATTENDANCE_COLUMNS = [
+    'Estudiante', 'Código', 'Curso', 'Fecha', 'Estado', 'Notas', 'Registrado por',
+]
+# Relaciones cuyos datos imprimen los reportes (huella de la caché)
+GRADE_RELATED = ('student', 'subject', 'subject__course', 'graded_by')
+ATTENDANCE_RELATED = ('student', 'course', 'recorded_by')
+
+
+def grade_rows(grades, chunk_size=EXPORT_CHUNK_SIZE):
+    """Filas del Excel de calificaciones a partir de un QuerySet de Grade."""
+    types = {key: str(label) for key, label in Grade._meta.get_field('grade_type').choices}
+    values = grades.values_list(
+        'student__first_name', 'student__last_name', 'student__username',
+        'subject__name', 'subject__course__name', 'grade_type', 'value', 'weight',
+        'graded_by_id', 'graded_by__first_name', 'graded_by__last_name', 'graded_by__username',
+        'graded_date',
+    ).iterator(chunk_size=chunk_size)
+    for (first_name, last_name, username, subject_name, course_name, grade_type, value,
+         weight, graded_by_id, grader_first, grader_last, grader_username, graded_date) in values:
+        yield (
+            display_name(first_name, last_name, username),
+            username,
+            subject_name,
+            course_name,
+            types.get(grade_type, grade_type),
+            float(value),
+            float(weight),
+            display_name(grader_first, grader_last, grader_username) if graded_by_id else '-',
+            graded_date.strftime('%Y-%m-%d'),
+            'Aprobado' if value >= PASSING_GRADE else 'Reprobado',
+            letter_grade_for(value),
+        )
+
+
+def course_attendance_reports(course, attendances, chunk_size=EXPORT_CHUNK_SIZE):
+    """Un reporte de asistencia por estudiante, desde una consulta ordenada."""
+    statuses = dict(Attendance.AttendanceStatus.choices)
+    values = attendances.filter(course=course).order_by(
+        'student__last_name', 'student__first_name', 'student_id', 'date', 'id',
+    ).values_list(
+        'student_id', 'student__first_name', 'student__last_name', 'student__username',
+        'date', 'status', 'notes',
+    ).iterator(chunk_size=chunk_size)
+    for _, records in groupby(values, key=itemgetter(0)):
+        first = next(records)
+        student_records = chain([first], records)
+        yield build_attendance_report(
+            display_name(first[1], first[2], first[3]), course.name,
+            ((day, status, statuses.get(status, status), notes)
+             for _, _, _, _, day, status, notes in student_records),
+        )
+
 
-import pandas as pd
-from django.db.models import Avg
-from django.http import HttpResponse
-from openpyxl.styles import Alignment, Font, PatternFill
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-from reportlab.lib.units import inch
-from reportlab.platypus import (Paragraph, SimpleDocTemplate, Spacer, Table,
-                                TableStyle)
+def attendance_rows(attendances, chunk_size=EXPORT_CHUNK_SIZE):
+    """Filas del Excel de asistencias a partir de un QuerySet de Attendance."""
+    statuses = dict(Attendance.AttendanceStatus.choices)
+    values = attendances.values_list(
+        'student__first_name', 'student__last_name', 'student__username',
+        'course__name', 'date', 'status', 'notes',
+        'recorded_by_id', 'recorded_by__first_name', 'recorded_by__last_name', 'recorded_by__username',
+    ).iterator(chunk_size=chunk_size)
+    for (first_name, last_name, username, course_name, day, status, notes,
+         recorded_by_id, recorder_first, recorder_last, recorder_username) in values:
+        yield (
+            display_name(first_name, last_name, username),
+            username,
+            course_name,
+            day.strftime('%Y-%m-%d'),
+            str(statuses.get(status, status)),
+            notes or '-',
+            display_name(recorder_first, recorder_last, recorder_username) if recorded_by_id else '-',
+        )
 
 
 class PDFReportGenerator:
@@ -19,7 +100,7 @@ class PDFReportGenerator:
     """
 
     @staticmethod
-    def generate_grade_report(student, grades, course=None):
+    def generate_grade_report(student, grades, course=None, request=None):
         """
         Generar boletín de calificaciones para un estudiante.
 
@@ -27,319 +108,129 @@ class PDFReportGenerator:
             student: Usuario estudiante
             grades: QuerySet de calificaciones
             course: Curso específico (opcional)
+            request: Petición HTTP (opcional), para responder 304 con `If-None-Match`
 
         Returns:
-            HttpResponse con el PDF generado
+            FileResponse con el PDF, servido desde la caché si los datos no cambiaron
         """
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
-        elements = []
-        styles = getSampleStyleSheet()
-
-        # Título
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#FF0000'),
-            spaceAfter=30,
-            alignment=1  # Centrado
+        key = report_fingerprint('grade_report', grades, student.username,
+                                 student.get_full_name(), student.email, related=GRADE_RELATED)
+        filename = f'boletin_{student.username}_{datetime.now().strftime("%Y%m%d")}.pdf'
+        return cached_report_response(
+            request, key, filename, PDF_CONTENT_TYPE,
+            lambda output: PDFReportGenerator.write_grade_report(student, grades, output, course=course),
         )
 
-        title = Paragraph("BOLETÍN DE CALIFICACIONES", title_style)
-        elements.append(title)
-        elements.append(Spacer(1, 0.2 * inch))
-
-        # Información del estudiante
-        info_style = styles['Normal']
-        student_info = [
-            f"<b>Estudiante:</b> {student.get_full_name()}",
-            f"<b>Código: </b> {student.username}",
-            f"<b>Email: </b> {student.email}",
-            f"<b>Fecha: </b> {datetime.now().strftime('%d/%m/%Y')}",
-        ]
-
-        for info in student_info:
-            elements.append(Paragraph(info, info_style))
-
-        elements.append(Spacer(1, 0.3 * inch))
-
-        # Tabla de calificaciones
-        data = [['Materia', 'Tipo', 'Calificación', 'Peso %', 'Estado']]
-
+    @staticmethod
+    def write_grade_report(student, grades, output, course=None):
+        """
+        Escribir el boletín de calificaciones en `output` (archivo binario).
+        """
+        rows, values = [], []
         for grade in grades:
-            data.append([
-                grade.subject.name,
-                grade.get_grade_type_display(),
-                str(grade.value),
-                str(grade.weight),
-                'Aprobado' if grade.is_passing else 'Reprobado'
-            ])
-
-        # Calcular promedios
-        if grades:
-            average = grades.aggregate(Avg('value'))['value__avg']
-            data.append(['', '', '', 'PROMEDIO:', f"{average: .2f}"])
-
-        table = Table(
-            data,
-            colWidths=[
-                2.5 * inch,
-                1.5 * inch,
-                1 * inch,
-                1 * inch,
-                1 * inch,
-            ],
-        )
-        table.setStyle(TableStyle([
-            # Encabezado
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#FF0000')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-
-            # Cuerpo
-            ('BACKGROUND', (0, 1), (-1, -2), colors.beige),
-            ('GRID', (0, 0), (-1, -2), 1, colors.black),
-
-            # Fila de promedio
-            ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#333333')),
-            ('TEXTCOLOR', (0, -1), (-1, -1), colors.whitesmoke),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-        ]))
-
-        elements.append(table)
-
-        # Construir PDF
-        doc.build(elements)
-        buffer.seek(0)
-
-        # Crear respuesta HTTP
-        response = HttpResponse(buffer, content_type='application/pdf')
-        filename = f'boletin_{student.username}_{datetime.now().strftime("%Y%m%d")}.pdf'
-        response['Content-Disposition'] = 'attachment' + '\x3B' + f' filename="{filename}"'
-
-        return response
+            rows.append(grade_row(grade.subject.name, grade.get_grade_type_display(), grade.value, grade.weight))
+            values.append(grade.value)
+        card = build_report_card(student.get_full_name(), student.username, student.email, rows, values)
+        write_report_card(card, output)
 
     @staticmethod
-    def generate_attendance_report(student, attendances, course):
+    def generate_attendance_report(student, attendances, course, request=None):
         """
         Generar reporte de asistencia para un estudiante.
         """
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
-        elements = []
-        styles = getSampleStyleSheet()
-
-        # Título
-        title = Paragraph("REPORTE DE ASISTENCIA", styles['Heading1'])
-        elements.append(title)
-        elements.append(Spacer(1, 0.2 * inch))
-
-        # Info
-        info = [
-            f"<b>Estudiante:</b> {student.get_full_name()}",
-            f"<b>Curso: </b> {course.name}",
-            f"<b>Fecha: </b> {datetime.now().strftime('%d/%m/%Y')}",
-        ]
-
-        for i in info:
-            elements.append(Paragraph(i, styles['Normal']))
-
-        elements.append(Spacer(1, 0.3 * inch))
-
-        # Tabla de asistencias
-        data = [['Fecha', 'Estado', 'Notas']]
-
-        for att in attendances:
-            data.append([
-                att.date.strftime('%d/%m/%Y'),
-                att.get_status_display(),
-                att.notes or '-'
-            ])
-
-        # Estadísticas
-        total = attendances.count()
-        present = attendances.filter(status='PRESENT').count()
-        absent = attendances.filter(status='ABSENT').count()
-        late = attendances.filter(status='LATE').count()
-
-        attendance_rate = ((present + late) / total * 100) if total > 0 else 0
-
-        data.append(['', '', ''])
-        data.append(['ESTADÍSTICAS', '', ''])
-        data.append(['Total registros:', str(total), ''])
-        data.append(['Asistencias:', str(present), ''])
-        data.append(['Ausencias:', str(absent), ''])
-        data.append(['Tardanzas:', str(late), ''])
-        data.append(['Tasa de asistencia:', f'{attendance_rate: .1f}%', ''])
+        key = report_fingerprint('attendance_report', attendances, student.get_full_name(), course.name,
+                                 related=ATTENDANCE_RELATED)
+        filename = f'asistencia_{student.username}_{datetime.now().strftime("%Y%m%d")}.pdf'
+        return cached_report_response(
+            request, key, filename, PDF_CONTENT_TYPE,
+            lambda output: PDFReportGenerator.write_attendance_report(student, attendances, course, output),
+        )
 
-        table = Table(data, colWidths=[2 * inch, 2 * inch, 3 * inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#FF0000')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, total), 1, colors.black),
-            ('BACKGROUND', (0, 1), (-1, total), colors.beige),
-        ]))
+    @staticmethod
+    def write_attendance_report(student, attendances, course, output):
+        """
+        Escribir el reporte de asistencia en `output` (archivo binario).
+        Los totales se cuentan al recorrer los registros: una sola consulta.
+        """
+        records = ((att.date, att.status, att.get_status_display(), att.notes) for att in attendances)
+        report = build_attendance_report(student.get_full_name(), course.name, records)
+        write_attendance_reports([report], output)
 
-        elements.append(table)
-        doc.build(elements)
-        buffer.seek(0)
+    @staticmethod
+    def generate_course_attendance_report(course, attendances, request=None):
+        """
+        Generar el reporte de asistencia de todo un curso (una página por estudiante).
+        """
+        key = report_fingerprint('course_attendance_report', attendances.filter(course=course), course.name,
+                                 related=ATTENDANCE_RELATED)
+        filename = f'asistencia_{course.code}_{datetime.now().strftime("%Y%m%d")}.pdf'
+        return cached_report_response(
+            request, key, filename, PDF_CONTENT_TYPE,
+            lambda output: PDFReportGenerator.write_course_attendance_report(course, attendances, output),
+        )
 
-        response = HttpResponse(buffer, content_type='application/pdf')
-        filename = f'asistencia_{student.username}_{datetime.now().strftime("%Y%m%d")}.pdf'
-        response['Content-Disposition'] = 'attachment' + '\x3B' + f' filename="{filename}"'
+    @staticmethod
+    def write_course_attendance_report(course, attendances, output):
+        """
+        Escribir en `output` el reporte de asistencia de cada estudiante de `course`.
 
-        return response
+        `attendances` se lee con una única consulta ordenada por estudiante y
+        fecha, sin importar cuántos estudiantes haya.
+        """
+        write_attendance_reports(course_attendance_reports(course, attendances), output)
 
 
 class ExcelReportGenerator:
     """
-    Generador de reportes en Excel usando pandas y openpyxl.
+    Generador de reportes en Excel usando openpyxl en modo de solo escritura.
     """
 
     @staticmethod
-    def generate_grades_excel(grades, filename='calificaciones'):
+    def generate_grades_excel(grades, filename='calificaciones', request=None):
         """
         Generar reporte de calificaciones en Excel.
 
         Args:
             grades: QuerySet de calificaciones
             filename: Nombre del archivo sin extensión
+            request: Petición HTTP (opcional), para responder 304 con `If-None-Match`
 
         Returns:
-            HttpResponse con el archivo Excel
+            FileResponse con el archivo Excel, servido desde la caché si los datos no cambiaron
         """
-        # Preparar datos
-        data = []
-        for grade in grades:
-            data.append({
-                'Estudiante': grade.student.get_full_name(),
-                'Código': grade.student.username,
-                'Materia': grade.subject.name,
-                'Curso': grade.subject.course.name,
-                'Tipo': grade.get_grade_type_display(),
-                'Calificación': float(grade.value),
-                'Peso (%)': float(grade.weight),
-                'Calificado por': grade.graded_by.get_full_name() if grade.graded_by else '-',
-                'Fecha': grade.graded_date.strftime('%Y-%m-%d'),
-                'Estado': 'Aprobado' if grade.is_passing else 'Reprobado',
-                'Letra': grade.letter_grade
-            })
-
-        # Crear DataFrame
-        df = pd.DataFrame(data)
-
-        # Crear archivo Excel en memoria
-        output = BytesIO()
-
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Calificaciones')
-
-            # Obtener el workbook y worksheet para dar formato
-            writer.book
-            worksheet = writer.sheets['Calificaciones']
-
-            # Formato del encabezado
-            header_fill = PatternFill(
-                start_color='FF0000',
-                end_color='FF0000',
-                fill_type='solid',
-            )
-            header_font = Font(color='FFFFFF', bold=True)
-
-            for cell in worksheet[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal='center')
-
-            # Ajustar ancho de columnas
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(cell.value)
-                    except BaseException:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-
-        output.seek(0)
-
-        # Crear respuesta HTTP
-        response = HttpResponse(
-            output,
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
         date_str = datetime.now().strftime("%Y%m%d")
-        response['Content-Disposition'] = 'attachment' + '\x3B' + f' filename="{filename}_{date_str}.xlsx"'
+        return cached_report_response(
+            request, report_fingerprint('grades_excel', grades, related=GRADE_RELATED),
+            f'{filename}_{date_str}.xlsx',
+            EXCEL_CONTENT_TYPE, lambda output: ExcelReportGenerator.write_grades_excel(grades, output),
+        )
+
+    @staticmethod
+    def write_grades_excel(grades, output):
+        """
+        Escribir el reporte de calificaciones en `output` (archivo binario).
 
-        return response
+        Lee el QuerySet con `values_list` (una consulta con los JOIN
+        necesarios, por bloques) y escribe fila a fila: la memoria no crece
+        con el número de calificaciones.
+        """
+        return write_sheet(output, 'Calificaciones', GRADE_COLUMNS, grade_rows(grades))
 
     @staticmethod
-    def generate_attendance_excel(attendances, filename='asistencias'):
+    def generate_attendance_excel(attendances, filename='asistencias', request=None):
         """
         Generar reporte de asistencias en Excel.
         """
-        data = []
-        for att in attendances:
-            data.append({
-                'Estudiante': att.student.get_full_name(),
-                'Código': att.student.username,
-                'Curso': att.course.name,
-                'Fecha': att.date.strftime('%Y-%m-%d'),
-                'Estado': att.get_status_display(),
-                'Notas': att.notes or '-',
-                'Registrado por': att.recorded_by.get_full_name() if att.recorded_by else '-'
-            })
-
-        df = pd.DataFrame(data)
-        output = BytesIO()
-
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Asistencias')
-
-            writer.book
-            worksheet = writer.sheets['Asistencias']
-
-            # Formato
-            header_fill = PatternFill(
-                start_color='FF0000',
-                end_color='FF0000',
-                fill_type='solid',
-            )
-            header_font = Font(color='FFFFFF', bold=True)
-
-            for cell in worksheet[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal='center')
-
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(cell.value)
-                    except BaseException:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-
-        output.seek(0)
-
-        response = HttpResponse(
-            output,
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
         date_str = datetime.now().strftime("%Y%m%d")
-        response['Content-Disposition'] = 'attachment' + '\x3B' + f' filename="{filename}_{date_str}.xlsx"'
+        return cached_report_response(
+            request, report_fingerprint('attendance_excel', attendances, related=ATTENDANCE_RELATED),
+            f'{filename}_{date_str}.xlsx',
+            EXCEL_CONTENT_TYPE, lambda output: ExcelReportGenerator.write_attendance_excel(attendances, output),
+        )
 
-        return response
+    @staticmethod
+    def write_attendance_excel(attendances, output):
+        """
+        Escribir el reporte de asistencias en `output` (archivo binario).
+        """
+        return write_sheet(output, 'Asistencias', ATTENDANCE_COLUMNS, attendance_rows(attendances))